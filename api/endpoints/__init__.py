@@ -1,6 +1,6 @@
 """Endpoint modules for JyotishAI.
 
 Each file in this package defines an analysis function and a FastAPI
-router for a specific diagnostic module.  They are imported in
-`api/__init__.py` for inclusion into the main application.
+router for a specific diagnostic module.  They are declared in
+`api/registry.py` and imported from there on first use.
 """
\ No newline at end of file
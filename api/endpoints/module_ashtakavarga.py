@@ -1,33 +1,53 @@
 """Ashtakavarga analysis module for JyotishAI.
 
-Ashtakavarga is an advanced Vedic system that assigns strength points to
-planets across the houses.  This simplified module explains the
-concept and provides a general interpretation without calculating
-individual points.
+Ashtakavarga is an advanced Vedic system that assigns strength points
+(bindus) to planets across the signs.  This module computes each
+planet's Bhinnashtakavarga and the combined Sarvashtakavarga, and
+interprets the house totals.
 """
 
 from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
+from services.ashtakavarga import PLANETS
 from services.chart_engine import VedicAstrologyEngine
 
 router = APIRouter()
 
+# Sarvashtakavarga house totals at or above this are traditionally favourable.
+STRONG_HOUSE_BINDUS = 28
+
 
 def analyze_ashtakavarga(chart):
+    sav = chart.sarvashtakavarga.tolist()
+    bav = chart.ashtakavarga
+    strong = [h + 1 for h, score in enumerate(sav) if score >= STRONG_HOUSE_BINDUS]
+    best = max(range(12), key=lambda h: sav[h])
+    worst = min(range(12), key=lambda h: sav[h])
+    own = ", ".join(
+        f"{planet.title()} {int(bav[i, chart.snapshot.sign_index(planet)])}"
+        for i, planet in enumerate(PLANETS)
+    )
     analysis = (
-        "Ashtakavarga divides the zodiac into eightfold point systems for each planet, "
-        "evaluating the strength of houses and predicting periods of fortune or challenge.  "
-        "In this module, a detailed point calculation is beyond scope; however, the concept emphasises "
-        "that planetary strength varies depending on house placement and benefic or malefic influences.  "
-        "Practitioners should consult a specialised Ashtakavarga table for precise values and ensure that "
-        "remedial measures comply with ethical and legal considerations."
+        "Sarvashtakavarga bindus by house (1 to 12): " + ", ".join(str(v) for v in sav) + ".  "
+        f"House {best + 1} is the strongest with {sav[best]} bindus and house {worst + 1} the weakest "
+        f"with {sav[worst]}.  "
+        + (
+            f"Houses with {STRONG_HOUSE_BINDUS} or more bindus ({', '.join(str(h) for h in strong)}) "
+            "support growth in their significations, "
+            if strong
+            else f"No house reaches {STRONG_HOUSE_BINDUS} bindus, "
+        )
+        + "while weaker houses call for patience and careful planning.  "
+        f"Bindus each planet holds in its own natal sign: {own}; four or more indicate a well supported placement.  "
+        "Transits through signs with high bindus tend to be productive, and any remedial measures "
+        "should comply with ethical and legal considerations."
     )
     return analysis
 
 
 @router.post("", response_model=ModuleResult)
-def ashtakavarga_endpoint(request: ChartRequest) -> ModuleResult:
-    _chart = VedicAstrologyEngine.from_request(request)
+async def ashtakavarga_endpoint(request: ChartRequest) -> ModuleResult:
+    _chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_ashtakavarga(_chart)
-    return ModuleResult(module=ModuleName.ASHTAKAVARGA, analysis=analysis)
\ No newline at end of file
+    return ModuleResult(module=ModuleName.ASHTAKAVARGA, analysis=analysis)
@@ -9,6 +9,7 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
 
 router = APIRouter()
 
@@ -28,6 +29,7 @@ BODY_DESCRIPTIONS = {
 }
 
 
+@reads("asc_sign")
 def analyze_body_type(chart):
     asc = chart.asc_sign
     desc = BODY_DESCRIPTIONS.get(asc, "The Ascendant influences physical appearance and constitution.")
@@ -39,7 +41,7 @@ def analyze_body_type(chart):
 
 
 @router.post("", response_model=ModuleResult)
-def body_type_endpoint(request: ChartRequest) -> ModuleResult:
-    chart = VedicAstrologyEngine.from_request(request)
+async def body_type_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_body_type(chart)
     return ModuleResult(module=ModuleName.BODY_TYPE, analysis=analysis)
\ No newline at end of file
@@ -8,6 +8,7 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
 
 router = APIRouter()
 
@@ -76,12 +77,16 @@ CAREER_DESCRIPTIONS = {
 }
 
 
+@reads("mc_sign", "asc_sign", "D10.ASC", "D10.SATURN")
 def analyze_career(chart):
     """Return a career analysis based on the Midheaven and Saturn."""
     mc = chart.mc_sign or chart.asc_sign  # fallback to Asc if MC unavailable
     desc = CAREER_DESCRIPTIONS.get(mc, "The Midheaven sign provides insights into one's career direction and public standing.")
+    dasamsa = chart.varga("D10")
     analysis = (
-        f"The Midheaven (tenth house cusp) is in {mc}.  " + desc + 
+        f"The Midheaven (tenth house cusp) is in {mc}.  " + desc +
+        f"  In the Dasamsa (D10), the chart of profession, the ascendant is {dasamsa['ASC']} "
+        f"and Saturn occupies {dasamsa['SATURN']}." +
         "  Saturn's position further indicates the need for patience and compliance with statutes; "
         "undertaking thorough due diligence in any career endeavour is essential."
     )
@@ -89,8 +94,8 @@ def analyze_career(chart):
 
 
 @router.post("", response_model=ModuleResult)
-def career_endpoint(request: ChartRequest) -> ModuleResult:
+async def career_endpoint(request: ChartRequest) -> ModuleResult:
     """FastAPI endpoint to compute career analysis."""
-    chart = VedicAstrologyEngine.from_request(request)
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_career(chart)
     return ModuleResult(module=ModuleName.CAREER, analysis=analysis)
\ No newline at end of file
@@ -10,6 +10,8 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
+from services.ephemeris import GRAHAS
 
 router = APIRouter()
 
@@ -29,19 +31,37 @@ CHRONIC_DESCRIPTIONS = {
 }
 
 
-def analyze_chronic_disease(chart):
+# Whether Saturn aspects the 6th house (the house of disease) and its lord.
+SIXTH_HOUSE_ASPECTS = {
+    (True, True): "  Saturn aspects both the 6th house and its lord, a marked predisposition towards chronic conditions requiring prolonged management.",
+    (True, False): "  Saturn aspects the 6th house, a predisposition towards chronic conditions requiring prolonged management.",
+    (False, True): "  Saturn aspects the lord of the 6th house, which can prolong ailments once they arise.",
+    (False, False): "  Saturn aspects neither the 6th house nor its lord, easing its influence on long‑term health.",
+}
+DISCLAIMER = "\n\nThis content is for informational purposes only and does not constitute medical advice."
+
+_SATURN = GRAHAS.index("SATURN")
+_SIXTH = 5
+
+
+@reads("saturn_sign")
+def _saturn_reading(chart):
     saturn = chart.saturn_sign
     desc = CHRONIC_DESCRIPTIONS.get(saturn, "Saturn's placement offers clues about long‑term health karma.")
-    analysis = (
-        f"Saturn in {saturn} indicates: " + desc +
-        "  When Saturn aspects the 6th house or its lord, there may be a predisposition towards chronic conditions requiring prolonged management."
-        "\n\nThis content is for informational purposes only and does not constitute medical advice."
-    )
-    return analysis
+    return f"Saturn in {saturn} indicates: " + desc
+
+
+def analyze_chronic_disease(chart):
+    aspects = chart.aspects[_SATURN]
+    sixth_lord = int(chart.house_lords[_SIXTH])
+    on_house = bool(aspects[_SIXTH])
+    # Saturn lording the 6th itself does not count as aspecting its lord.
+    on_lord = sixth_lord != _SATURN and bool(aspects[chart.lord_houses[_SIXTH]])
+    return _saturn_reading(chart) + SIXTH_HOUSE_ASPECTS[on_house, on_lord] + DISCLAIMER
 
 
 @router.post("", response_model=ModuleResult)
-def chronic_disease_endpoint(request: ChartRequest) -> ModuleResult:
-    chart = VedicAstrologyEngine.from_request(request)
+async def chronic_disease_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_chronic_disease(chart)
     return ModuleResult(module=ModuleName.CHRONIC, analysis=analysis)
\ No newline at end of file
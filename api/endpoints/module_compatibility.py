@@ -1,20 +1,31 @@
 """Compatibility analysis module for JyotishAI.
 
 This module compares two natal charts to evaluate relationship dynamics.
-It assesses elemental harmony, Moon and Venus compatibility, and karmic
-connections (Rahu–Ketu axis).  Actionable guidance is provided for
+It computes the traditional 36-point Ashtakoota (guna milan) score from
+the Moon nakshatras and signs, and assesses elemental harmony, Moon and
+Venus compatibility, and karmic connections (Rahu–Ketu axis).  Actionable guidance is provided for
 navigating strengths and challenges.  A disclaimer reminds users that
 astrological compatibility is a guide and not a determinant of
 relationship outcomes.
+
+``/search`` scores one profile against the whole matchmaking index
+(see :mod:`services.matchmaking`) instead of one pair at a time.
 """
 
-from fastapi import APIRouter, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query
 
-from models.schemas import ChartRequest, ModuleResult, ModuleName
+from models.schemas import ChartRequest, MatchCandidate, MatchSearchResponse, ModuleResult, ModuleName
+from services.ashtakoota import KOOTAS, MAX_POINTS, TOTAL_POINTS, score_pair
 from services.chart_engine import VedicAstrologyEngine
+from services.matchmaking import get_match_index, manglik_dosha
 
 router = APIRouter()
 
+# Traditional minimum Ashtakoota total for a recommended match.
+MIN_ACCEPTABLE_GUNAS = 18
+
 ELEMENTS = {
     "ARIES": "Fire",
     "LEO": "Fire",
@@ -42,7 +53,18 @@ def element_compat(e1: str, e2: str) -> str:
     return "low"
 
 
-def analyze_compatibility(chart1, chart2):
+def compatibility_scores(chart1, chart2):
+    """Ashtakoota points per koota plus ``total``; ``chart1`` is taken as the groom."""
+    moon1, moon2 = chart1.snapshot, chart2.snapshot
+    return score_pair(
+        moon1.nakshatra_index("MOON"),
+        moon1.sign_index("MOON"),
+        moon2.nakshatra_index("MOON"),
+        moon2.sign_index("MOON"),
+    )
+
+
+def analyze_compatibility(chart1, chart2, scores=None):
     # Basic elemental compatibility
     elem1 = ELEMENTS.get(chart1.asc_sign, "")
     elem2 = ELEMENTS.get(chart2.asc_sign, "")
@@ -59,8 +81,26 @@ def analyze_compatibility(chart1, chart2):
     karmic_tie = False
     if chart1.rahu_sign == chart2.ketu_sign or chart2.rahu_sign == chart1.ketu_sign:
         karmic_tie = True
+    # Ashtakoota (guna milan)
+    if scores is None:
+        scores = compatibility_scores(chart1, chart2)
+    total = scores["total"]
+    if total >= 24:
+        verdict = "a very good match"
+    elif total >= MIN_ACCEPTABLE_GUNAS:
+        verdict = "an acceptable match"
+    else:
+        verdict = "below the traditional threshold of 18 points"
+    breakdown = ", ".join(f"{k.replace('_', ' ')} {scores[k]:g}/{MAX_POINTS[k]:g}" for k in KOOTAS)
     # Compose analysis
     analysis_parts = []
+    analysis_parts.append(
+        f"Ashtakoota score: {total:g} of {TOTAL_POINTS:g} ({breakdown}), {verdict}."
+    )
+    if scores["nadi"] == 0:
+        analysis_parts.append("Both Moons share the same nadi (nadi dosha), traditionally weighed with care.")
+    if scores["bhakoot"] == 0:
+        analysis_parts.append("The Moon signs form a bhakoot dosha, suggesting friction in shared finances or goals.")
     analysis_parts.append(
         f"Elemental compatibility between Ascendants: {elem_text}."
     )
@@ -88,17 +128,16 @@ def analyze_compatibility(chart1, chart2):
 
 
 @router.post("", response_model=ModuleResult)
-def compatibility_endpoint(request: ChartRequest) -> ModuleResult:
+async def compatibility_endpoint(request: ChartRequest) -> ModuleResult:
     # Validate that second person fields are provided
     if not all([
         request.second_name,
         request.second_birth_date,
         request.second_birth_time,
         request.second_location,
-        request.second_utc_offset is not None,
     ]):
         raise HTTPException(status_code=400, detail="Second person details are required for compatibility analysis.")
-    chart1 = VedicAstrologyEngine.from_request(request)
+    chart1 = await VedicAstrologyEngine.from_request_async(request)
     # Build ChartRequest for second person using same modules (not used)
     second_req = ChartRequest(
         name=request.second_name,
@@ -106,8 +145,39 @@ def compatibility_endpoint(request: ChartRequest) -> ModuleResult:
         birth_time=request.second_birth_time,
         location=request.second_location,
         utc_offset=request.second_utc_offset,
+        node=request.node,
         modules=[]
     )
-    chart2 = VedicAstrologyEngine.from_request(second_req)
-    analysis = analyze_compatibility(chart1, chart2)
-    return ModuleResult(module=ModuleName.COMPATIBILITY, analysis=analysis)
\ No newline at end of file
+    chart2 = await VedicAstrologyEngine.from_request_async(second_req)
+    scores = compatibility_scores(chart1, chart2)
+    analysis = analyze_compatibility(chart1, chart2, scores)
+    return ModuleResult(module=ModuleName.COMPATIBILITY, analysis=analysis, scores=scores)
+
+
+@router.post("/search", response_model=MatchSearchResponse)
+async def compatibility_search_endpoint(
+    request: ChartRequest,
+    role: Literal["groom", "bride"] = Query("groom", description="Role of the queried profile"),
+    k: int = Query(10, ge=1, le=1000, description="Number of matches to return"),
+    min_score: float = Query(0.0, ge=0.0, le=TOTAL_POINTS, description="Minimum Ashtakoota total"),
+    exclude_manglik: bool = Query(False, description="Skip candidates with manglik dosha"),
+) -> MatchSearchResponse:
+    index = get_match_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="No matchmaking index is configured.")
+    chart = await VedicAstrologyEngine.from_request_async(request)
+    snapshot = chart.snapshot
+    matches = index.search(
+        snapshot.nakshatra_index("MOON"),
+        snapshot.sign_index("MOON"),
+        as_groom=role == "groom",
+        k=k,
+        min_score=min_score,
+        exclude_manglik=exclude_manglik,
+    )
+    return MatchSearchResponse(
+        name=request.name,
+        manglik=bool(manglik_dosha(snapshot.house("MARS"))),
+        pool_size=index.pool_size(as_groom=role == "groom"),
+        matches=[MatchCandidate(id=m.id, total=m.total, scores=m.scores, manglik=m.manglik) for m in matches],
+    )
@@ -1,32 +1,152 @@
 """Dasha and Transit analysis module for JyotishAI.
 
-This module discusses planetary periods (dashas) and current transits.  It
-does not compute exact timelines but provides a general framework for
-understanding how these cycles affect legal and professional matters.
+This module reports the Vimshottari periods (dashas) running now and the
+next major change, computed from the Moon's birth nakshatra, together
+with the slow planets' transits over the natal chart.  A timeline
+endpoint returns every period overlapping a date range and a transit
+endpoint streams transit events as NDJSON.
 """
 
-from fastapi import APIRouter
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
 
-from models.schemas import ChartRequest, ModuleResult, ModuleName
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from models.schemas import (
+    ChartRequest,
+    DashaPeriodModel,
+    DashaTimelineResponse,
+    ModuleName,
+    ModuleResult,
+)
 from services.chart_engine import VedicAstrologyEngine
+from services.dasha import LEVEL_NAMES
+from services.ephemeris import GRAHAS, datetime_from_jd, julian_days
+from services.transits import TRANSIT_BODIES, transit_events
 
 router = APIRouter()
 
+# Longest date range /transits streams in one request, in years.
+TRANSIT_MAX_YEARS = int(os.getenv("JYOTISHAI_TRANSIT_MAX_YEARS", "10"))
+
+
+def _date_text(moment: datetime) -> str:
+    return moment.strftime("%d %b %Y")
+
+
+def _jd(day: date) -> float:
+    return float(julian_days([datetime(day.year, day.month, day.day, tzinfo=timezone.utc)])[0])
+
+
+def _transit_summary(chart, now_jd: float) -> List[str]:
+    """Describe where Jupiter and Saturn transit now and their next events this year."""
+    parts = []
+    upcoming = {}
+    for event in transit_events(chart.snapshot, now_jd, now_jd + 365.25, bodies=("JUPITER", "SATURN")):
+        upcoming.setdefault(event.body, event)
+    for body in ("JUPITER", "SATURN"):
+        event = upcoming.get(body)
+        if event is None:
+            continue
+        what = {
+            "HOUSE_INGRESS": f"enters house {event.house} from the natal ascendant",
+            "CONJUNCTION": f"conjoins natal {(event.target or '').title()}",
+            "STATION_RETROGRADE": "stations retrograde",
+            "STATION_DIRECT": "stations direct",
+        }[event.kind]
+        parts.append(f"Transiting {body.title()} next {what} on {_date_text(datetime_from_jd(event.jd))}.")
+    return parts
 
-def analyze_dasha_transit(chart):
-    analysis = (
-        "Vimshottari Dasha sequences allocate planetary rulers to periods in one's life, "
-        "each bringing unique opportunities and challenges.  Major periods (mahādashas) span several years "
-        "and should be evaluated alongside current planetary transits.  Although this module does not compute "
-        "specific dates, it reminds practitioners that timing matters when drafting contracts, initiating litigation "
-        "or planning strategic moves.  Consultation with an experienced astrologer is recommended for precise cycles, "
-        "and any actions must adhere to legal statutes and professional ethics."
+
+def analyze_dasha_transit(chart, now: Optional[datetime] = None):
+    timeline = chart.dasha
+    now_jd = float(julian_days([now or datetime.now(timezone.utc)])[0])
+    running = timeline.running(now_jd)
+    parts = []
+    if running:
+        for name, period in zip(LEVEL_NAMES, running):
+            parts.append(
+                f"{name}: {period.lord.title()} ({_date_text(period.start)} to {_date_text(period.end)})."
+            )
+        upcoming = timeline.next_change(now_jd)
+        if upcoming is not None:
+            parts.append(
+                f"The next mahadasha, {upcoming.lord.title()}, begins on {_date_text(upcoming.start)}."
+            )
+    else:
+        parts.append("The 120-year Vimshottari cycle computed for this chart does not cover the current date.")
+    parts.extend(_transit_summary(chart, now_jd))
+    parts.append(
+        "Each period colours events with the significations of its lord, and sub-periods refine the timing.  "
+        "These cycles should be weighed alongside current planetary transits when planning contracts, "
+        "litigation or strategic moves, and any actions must adhere to legal statutes and professional ethics."
     )
-    return analysis
+    return "  ".join(parts)
 
 
 @router.post("", response_model=ModuleResult)
-def dasha_transit_endpoint(request: ChartRequest) -> ModuleResult:
-    _chart = VedicAstrologyEngine.from_request(request)
-    analysis = analyze_dasha_transit(_chart)
-    return ModuleResult(module=ModuleName.DASHA_TRANSIT, analysis=analysis)
\ No newline at end of file
+async def dasha_transit_endpoint(request: ChartRequest) -> ModuleResult:
+    _chart = await VedicAstrologyEngine.from_request_async(request)
+    # The transit summary searches a year of ephemeris; keep it off the event loop.
+    analysis = await run_in_threadpool(analyze_dasha_transit, _chart)
+    return ModuleResult(module=ModuleName.DASHA_TRANSIT, analysis=analysis)
+
+
+@router.post("/timeline", response_model=DashaTimelineResponse)
+async def dasha_timeline_endpoint(
+    request: ChartRequest,
+    start: Optional[date] = Query(None, description="First date of the range (default: birth)"),
+    end: Optional[date] = Query(None, description="Last date of the range (default: end of the 120-year cycle)"),
+    level: int = Query(2, ge=1, le=3, description="1 = mahadasha, 2 = antardasha, 3 = pratyantardasha"),
+) -> DashaTimelineResponse:
+    chart = await VedicAstrologyEngine.from_request_async(request)
+    timeline = chart.dasha
+    start_jd = timeline.birth_jd
+    end_jd = timeline.end_jd
+    if start is not None:
+        start_jd = _jd(start)
+    if end is not None:
+        # The end date is inclusive.
+        end_jd = _jd(end) + 1.0
+    if end_jd <= start_jd:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    periods = timeline.overlapping(start_jd, end_jd, level)
+    return DashaTimelineResponse(
+        name=request.name,
+        start=datetime_from_jd(start_jd),
+        end=datetime_from_jd(end_jd),
+        periods=[
+            DashaPeriodModel(level=p.level, lords=[lord.title() for lord in p.lords], start=p.start, end=p.end)
+            for p in periods
+        ],
+    )
+
+
+@router.post("/transits")
+async def transit_stream_endpoint(
+    request: ChartRequest,
+    start: Optional[date] = Query(None, description="First date of the range (default: today)"),
+    end: Optional[date] = Query(None, description="Last date of the range (default: one year after start)"),
+    bodies: List[str] = Query(list(TRANSIT_BODIES), description="Transiting grahas to follow"),
+) -> StreamingResponse:
+    """Stream house ingresses, natal conjunctions and stations as NDJSON, one event per line."""
+    bodies = [b.upper() for b in bodies]
+    unknown = [b for b in bodies if b not in GRAHAS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown bodies: {', '.join(unknown)}")
+    start = start or datetime.now(timezone.utc).date()
+    end = end or start + timedelta(days=365)
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days > TRANSIT_MAX_YEARS * 366:
+        raise HTTPException(status_code=400, detail=f"range longer than {TRANSIT_MAX_YEARS} years")
+    chart = await VedicAstrologyEngine.from_request_async(request)
+    events = transit_events(chart.snapshot, _jd(start), _jd(end) + 1.0, bodies=bodies)
+    return StreamingResponse(
+        (json.dumps(event.to_dict()) + "\n" for event in events),
+        media_type="application/x-ndjson",
+    )
@@ -9,6 +9,7 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
 
 router = APIRouter()
 
@@ -28,6 +29,7 @@ EDUCATION_DESCRIPTIONS = {
 }
 
 
+@reads("mercury_sign")
 def analyze_education(chart):
     mercury = chart.mercury_sign
     desc = EDUCATION_DESCRIPTIONS.get(mercury, "Mercury's placement sheds light on how one processes information and communicates.")
@@ -39,7 +41,7 @@ def analyze_education(chart):
 
 
 @router.post("", response_model=ModuleResult)
-def education_endpoint(request: ChartRequest) -> ModuleResult:
-    chart = VedicAstrologyEngine.from_request(request)
+async def education_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_education(chart)
     return ModuleResult(module=ModuleName.EDUCATION, analysis=analysis)
\ No newline at end of file
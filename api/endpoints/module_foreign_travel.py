@@ -8,6 +8,7 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
 
 router = APIRouter()
 
@@ -27,6 +28,7 @@ TRAVEL_DESCRIPTIONS = {
 }
 
 
+@reads("jupiter_sign")
 def analyze_foreign_travel(chart):
     jupiter = chart.jupiter_sign
     desc = TRAVEL_DESCRIPTIONS.get(jupiter, "Jupiter represents expansion and long‑distance travel.")
@@ -38,7 +40,7 @@ def analyze_foreign_travel(chart):
 
 
 @router.post("", response_model=ModuleResult)
-def foreign_travel_endpoint(request: ChartRequest) -> ModuleResult:
-    chart = VedicAstrologyEngine.from_request(request)
+async def foreign_travel_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_foreign_travel(chart)
     return ModuleResult(module=ModuleName.FOREIGN_TRAVEL, analysis=analysis)
\ No newline at end of file
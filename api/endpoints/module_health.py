@@ -10,6 +10,7 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
 
 router = APIRouter()
 
@@ -29,6 +30,7 @@ HEALTH_DESCRIPTIONS = {
 }
 
 
+@reads("asc_sign")
 def analyze_health(chart):
     asc = chart.asc_sign
     desc = HEALTH_DESCRIPTIONS.get(asc, "The Ascendant influences general vitality and constitutional tendencies.")
@@ -41,7 +43,7 @@ def analyze_health(chart):
 
 
 @router.post("", response_model=ModuleResult)
-def health_endpoint(request: ChartRequest) -> ModuleResult:
-    chart = VedicAstrologyEngine.from_request(request)
+async def health_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_health(chart)
     return ModuleResult(module=ModuleName.HEALTH, analysis=analysis)
\ No newline at end of file
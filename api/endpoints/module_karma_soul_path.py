@@ -9,6 +9,7 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
 
 router = APIRouter()
 
@@ -28,6 +29,7 @@ KARMA_DESCRIPTIONS = {
 }
 
 
+@reads("rahu_sign")
 def analyze_karma(chart):
     rahu = chart.rahu_sign
     desc = KARMA_DESCRIPTIONS.get(rahu, "The North Node signifies the direction of growth and karmic lessons.")
@@ -39,7 +41,7 @@ def analyze_karma(chart):
 
 
 @router.post("", response_model=ModuleResult)
-def karma_endpoint(request: ChartRequest) -> ModuleResult:
-    chart = VedicAstrologyEngine.from_request(request)
+async def karma_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_karma(chart)
     return ModuleResult(module=ModuleName.KARMA_SOUL_PATH, analysis=analysis)
\ No newline at end of file
@@ -10,6 +10,7 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
 from jyotish_utils.vedic_math import compute_dk, compute_ul
 
 router = APIRouter()
@@ -30,13 +31,17 @@ MARRIAGE_DESCRIPTIONS = {
 }
 
 
+# compute_dk and compute_ul are still placeholders that do not read the chart.
+@reads("venus_sign", "D9.VENUS")
 def analyze_marriage(chart):
     venus = chart.venus_sign
     desc = MARRIAGE_DESCRIPTIONS.get(venus, "Venus indicates approach to love and partnership.")
     dk = compute_dk(chart)
     ul = compute_ul(chart)
+    navamsa_venus = chart.varga("D9")["VENUS"]
     analysis = (
         f"Venus resides in {venus}.  " + desc +
+        f"  In the Navamsa (D9), the chart of marriage, Venus falls in {navamsa_venus}." +
         "  " + dk + "  " + ul +
         "  When entering into marital contracts, careful drafting and clear articulation of expectations are essential "
         "to uphold the rights and responsibilities of both parties."
@@ -45,7 +50,7 @@ def analyze_marriage(chart):
 
 
 @router.post("", response_model=ModuleResult)
-def marriage_endpoint(request: ChartRequest) -> ModuleResult:
-    chart = VedicAstrologyEngine.from_request(request)
+async def marriage_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_marriage(chart)
     return ModuleResult(module=ModuleName.MARRIAGE, analysis=analysis)
\ No newline at end of file
@@ -10,6 +10,7 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
 
 router = APIRouter()
 
@@ -89,6 +90,7 @@ PERSONALITY_DESCRIPTIONS = {
 }
 
 
+@reads("asc_sign")
 def analyze_personality(chart):
     """Return a personality analysis based on the rising sign."""
     asc = chart.asc_sign
@@ -103,8 +105,8 @@ def analyze_personality(chart):
 
 
 @router.post("", response_model=ModuleResult)
-def personality_endpoint(request: ChartRequest) -> ModuleResult:
+async def personality_endpoint(request: ChartRequest) -> ModuleResult:
     """FastAPI endpoint to compute personality analysis."""
-    chart = VedicAstrologyEngine.from_request(request)
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_personality(chart)
     return ModuleResult(module=ModuleName.PERSONALITY, analysis=analysis)
\ No newline at end of file
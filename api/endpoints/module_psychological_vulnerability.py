@@ -9,6 +9,7 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
 
 router = APIRouter()
 
@@ -28,6 +29,7 @@ MOON_DESCRIPTIONS = {
 }
 
 
+@reads("moon_sign")
 def analyze_psychological(chart):
     moon = chart.moon_sign
     desc = MOON_DESCRIPTIONS.get(moon, "The Moon reflects emotional needs and patterns.")
@@ -39,7 +41,7 @@ def analyze_psychological(chart):
 
 
 @router.post("", response_model=ModuleResult)
-def psychological_endpoint(request: ChartRequest) -> ModuleResult:
-    chart = VedicAstrologyEngine.from_request(request)
+async def psychological_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_psychological(chart)
     return ModuleResult(module=ModuleName.PSYCHOLOGICAL, analysis=analysis)
\ No newline at end of file
@@ -9,6 +9,7 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
 
 router = APIRouter()
 
@@ -28,6 +29,7 @@ SEXUALITY_DESCRIPTIONS = {
 }
 
 
+@reads("mars_sign")
 def analyze_sexuality(chart):
     mars = chart.mars_sign
     desc = SEXUALITY_DESCRIPTIONS.get(mars, "Mars describes drive and passion.")
@@ -39,7 +41,7 @@ def analyze_sexuality(chart):
 
 
 @router.post("", response_model=ModuleResult)
-def sexuality_endpoint(request: ChartRequest) -> ModuleResult:
-    chart = VedicAstrologyEngine.from_request(request)
+async def sexuality_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_sexuality(chart)
     return ModuleResult(module=ModuleName.SEXUALITY, analysis=analysis)
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""Planetary strength module for JyotishAI.
+
+This module interprets Shadbala, the six-fold strength of the seven
+planets, and Bhava Bala, the strength of the twelve houses.  Planets that
+exceed their required strength deliver their significations readily,
+while weaker ones need more effort; the strongest and weakest houses
+show which areas of life are best and least supported.
+"""
+
+from fastapi import APIRouter
+
+from models.schemas import ChartRequest, ModuleResult, ModuleName
+from services.chart_engine import VedicAstrologyEngine
+from services.shadbala import PLANETS, REQUIRED_RUPAS, VIRUPAS_PER_RUPA
+
+router = APIRouter()
+
+PLANET_SIGNIFICATIONS = {
+    "SUN": "vitality, authority and self-confidence",
+    "MOON": "emotional stability, public dealings and the mind",
+    "MARS": "courage, energy and technical ability",
+    "MERCURY": "intellect, communication and trade",
+    "JUPITER": "wisdom, wealth, children and guidance",
+    "VENUS": "relationships, comfort and the arts",
+    "SATURN": "endurance, discipline and longevity",
+}
+
+HOUSE_SIGNIFICATIONS = (
+    "self and health",
+    "wealth and family",
+    "initiative and siblings",
+    "home and inner peace",
+    "intelligence and children",
+    "service and overcoming obstacles",
+    "partnerships and marriage",
+    "longevity and transformation",
+    "fortune and higher learning",
+    "career and status",
+    "gains and networks",
+    "expenditure and liberation",
+)
+
+
+def planet_ratios(chart):
+    """Return ``{planet: Shadbala / required Shadbala}``."""
+    totals = chart.shadbala.sum(axis=0) / VIRUPAS_PER_RUPA
+    return {planet: float(total) / REQUIRED_RUPAS[planet] for planet, total in zip(PLANETS, totals.tolist())}
+
+
+def analyze_shadbala(chart):
+    ratios = planet_ratios(chart)
+    ranked = sorted(PLANETS, key=ratios.get, reverse=True)
+    strong = [p for p in ranked if ratios[p] >= 1.0]
+    weak = [p for p in ranked if ratios[p] < 1.0]
+    houses = chart.bhava_bala.sum(axis=0).tolist()
+    by_house = sorted(range(12), key=lambda h: houses[h], reverse=True)
+
+    parts = [
+        "Shadbala as a share of the required strength: "
+        + ", ".join(f"{p.title()} {ratios[p]:.0%}" for p in ranked)
+        + "."
+    ]
+    best = ranked[0]
+    parts.append(
+        f"{best.title()} is the strongest planet, so matters of {PLANET_SIGNIFICATIONS[best]} "
+        "come most naturally and its periods tend to be productive."
+    )
+    if strong[1:]:
+        parts.append("Also above the required strength: " + ", ".join(p.title() for p in strong[1:]) + ".")
+    if weak:
+        worst = weak[-1]
+        parts.append(
+            f"{worst.title()} is the weakest planet; matters of {PLANET_SIGNIFICATIONS[worst]} "
+            "need conscious effort and patience."
+        )
+    parts.append(
+        "Bhava Bala ranks house "
+        + " and ".join(f"{h + 1} ({HOUSE_SIGNIFICATIONS[h]})" for h in by_house[:2])
+        + " as the best supported, and house "
+        + f"{by_house[-1] + 1} ({HOUSE_SIGNIFICATIONS[by_house[-1]]}) as the least supported."
+    )
+    parts.append("Strength shows capacity, not destiny; decisions should rest on practical judgement.")
+    return "  ".join(parts)
+
+
+@router.post("", response_model=ModuleResult)
+async def shadbala_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
+    analysis = analyze_shadbala(chart)
+    return ModuleResult(module=ModuleName.SHADBALA, analysis=analysis)
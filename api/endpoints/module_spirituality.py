@@ -9,6 +9,7 @@ from fastapi import APIRouter
 
 from models.schemas import ChartRequest, ModuleResult, ModuleName
 from services.chart_engine import VedicAstrologyEngine
+from services.chart_features import reads
 
 router = APIRouter()
 
@@ -28,6 +29,7 @@ SPIRIT_DESCRIPTIONS = {
 }
 
 
+@reads("ketu_sign")
 def analyze_spirituality(chart):
     ketu = chart.ketu_sign
     desc = SPIRIT_DESCRIPTIONS.get(ketu, "Ketu signifies spiritual detachment and past life mastery.")
@@ -39,7 +41,7 @@ def analyze_spirituality(chart):
 
 
 @router.post("", response_model=ModuleResult)
-def spirituality_endpoint(request: ChartRequest) -> ModuleResult:
-    chart = VedicAstrologyEngine.from_request(request)
+async def spirituality_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
     analysis = analyze_spirituality(chart)
     return ModuleResult(module=ModuleName.SPIRITUALITY, analysis=analysis)
\ No newline at end of file
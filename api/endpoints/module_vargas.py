@@ -0,0 +1,54 @@
+"""Divisional chart (varga) module for JyotishAI.
+
+This module reports sign placements in the sixteen Parashari vargas and
+highlights vargottama planets, which occupy the same sign in the Rasi
+(D1) and Navamsa (D9) charts and are traditionally considered strong.
+"""
+
+from fastapi import APIRouter
+
+from models.schemas import ChartRequest, ModuleName, VargaResult
+from services.chart_engine import VedicAstrologyEngine
+from services.ephemeris import GRAHAS
+from services.vargas import VARGA_NAMES, VARGAS
+
+router = APIRouter()
+
+
+def varga_table(chart):
+    """Return ``{varga: {body: sign}}`` for all sixteen vargas."""
+    return {name: chart.varga(name) for name in VARGAS}
+
+
+def analyze_vargas(chart):
+    rasi = chart.varga("D1")
+    navamsa = chart.varga("D9")
+    dasamsa = chart.varga("D10")
+    vargottama = [body.title() for body in GRAHAS if rasi[body] == navamsa[body]]
+    parts = [
+        f"The Navamsa (D9) ascendant is {navamsa['ASC']} and the Dasamsa (D10) ascendant is {dasamsa['ASC']}.",
+    ]
+    if vargottama:
+        parts.append(
+            "Vargottama planets, holding the same sign in Rasi and Navamsa: "
+            + ", ".join(vargottama)
+            + ".  These placements deliver their results with added consistency."
+        )
+    else:
+        parts.append("No planet is vargottama; Rasi promises are modified by their Navamsa placements.")
+    parts.append(
+        "Divisional charts computed: "
+        + ", ".join(f"{name} ({VARGA_NAMES[name]})" for name in VARGAS)
+        + "."
+    )
+    return "  ".join(parts)
+
+
+@router.post("", response_model=VargaResult)
+async def vargas_endpoint(request: ChartRequest) -> VargaResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
+    return VargaResult(
+        module=ModuleName.VARGAS,
+        analysis=analyze_vargas(chart),
+        vargas=varga_table(chart),
+    )
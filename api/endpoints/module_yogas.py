@@ -0,0 +1,64 @@
+"""Yoga analysis module for JyotishAI.
+
+This module reports the classical yogas (planetary combinations) found in
+the natal chart – Gajakesari, the Pancha Mahapurusha yogas, lunar and
+solar yogas, raja, dhana and viparita raja yogas, Kemadruma and manglik
+dosha – as detected by the rule engine in :mod:`services.yogas`.
+"""
+
+from fastapi import APIRouter
+
+from models.schemas import ChartRequest, ModuleResult, ModuleName
+from services.chart_engine import VedicAstrologyEngine
+
+router = APIRouter()
+
+YOGA_DESCRIPTIONS = {
+    "GAJAKESARI": "Gajakesari yoga (Jupiter in a kendra from the Moon) lends wisdom, reputation and lasting influence.",
+    "RUCHAKA": "Ruchaka yoga, a Pancha Mahapurusha yoga of Mars, gives courage, command and success in contests.",
+    "BHADRA": "Bhadra yoga, a Pancha Mahapurusha yoga of Mercury, gives eloquence, learning and commercial skill.",
+    "HAMSA": "Hamsa yoga, a Pancha Mahapurusha yoga of Jupiter, gives righteousness, counsel and respect.",
+    "MALAVYA": "Malavya yoga, a Pancha Mahapurusha yoga of Venus, gives refinement, comfort and artistic taste.",
+    "SASA": "Sasa yoga, a Pancha Mahapurusha yoga of Saturn, gives authority over organisations and endurance.",
+    "SUNAPHA": "Sunapha yoga (a planet in the second from the Moon) supports self-earned wealth.",
+    "ANAPHA": "Anapha yoga (a planet in the twelfth from the Moon) supports good conduct and a composed bearing.",
+    "DURUDHARA": "Durudhara yoga (planets on both sides of the Moon) supports resources and generosity.",
+    "KEMADRUMA": "Kemadruma yoga (the Moon without planetary support) calls for deliberate effort to build security.",
+    "VESI": "Vesi yoga (a planet in the second from the Sun) supports steadiness and truthfulness.",
+    "VASI": "Vasi yoga (a planet in the twelfth from the Sun) supports diligence and charity.",
+    "UBHAYACHARI": "Ubhayachari yoga (planets on both sides of the Sun) supports standing and eloquence.",
+    "ADHI": "Adhi yoga (benefics in the sixth, seventh or eighth from the Moon) supports leadership and a secure position.",
+    "AMALA": "Amala yoga (a benefic in the tenth) supports an unblemished professional reputation.",
+    "BUDHADITYA": "Budhaditya yoga (Sun with Mercury) sharpens intellect and skill in argument.",
+    "CHANDRA_MANGALA": "Chandra-Mangala yoga (Moon with Mars) gives enterprise in financial matters.",
+    "GURU_CHANDALA": "Guru-Chandala yoga (Jupiter with Rahu) asks for care with advisers and unconventional beliefs.",
+    "SHAKATA": "Shakata yoga (Jupiter in the sixth, eighth or twelfth from the Moon) brings fluctuating fortunes.",
+    "DHARMA_KARMADHIPATI": "Dharma-Karmadhipati yoga (lords of the ninth and tenth together) is a strong raja yoga for career.",
+    "RAJA": "A raja yoga joins the lords of a kendra and a trikona, promising rise in status.",
+    "DHANA": "A dhana yoga joins the lord of the eleventh with a lord of wealth, supporting accumulation of assets.",
+    "HARSHA": "Harsha yoga, a viparita raja yoga, lets the native prevail over adversaries and litigation.",
+    "SARALA": "Sarala yoga, a viparita raja yoga, gives resilience and longevity through difficulties.",
+    "VIMALA": "Vimala yoga, a viparita raja yoga, gives frugality and independence.",
+    "NEECHA_SUN": "The Sun is debilitated, which can weaken confidence and standing with authorities.",
+    "NEECHA_MOON": "The Moon is debilitated, which can unsettle emotional composure.",
+    "MANGLIK": "Mars in the first, second, fourth, seventh, eighth or twelfth house forms manglik dosha.",
+}
+
+
+def analyze_yogas(chart):
+    yogas = chart.yogas
+    if not yogas:
+        return "None of the classical yogas examined is present in this chart."
+    parts = [YOGA_DESCRIPTIONS.get(name, f"{name.replace('_', ' ').title()} yoga is present.") for name in yogas]
+    parts.append(
+        "Yogas indicate potential that is realised in the dashas of the planets forming them; "
+        "decisions should still rest on due diligence and applicable law."
+    )
+    return "  ".join(parts)
+
+
+@router.post("", response_model=ModuleResult)
+async def yogas_endpoint(request: ChartRequest) -> ModuleResult:
+    chart = await VedicAstrologyEngine.from_request_async(request)
+    analysis = analyze_yogas(chart)
+    return ModuleResult(module=ModuleName.YOGAS, analysis=analysis)
@@ -0,0 +1,106 @@
+# 📁 File: api/muhurta.py
+
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, List, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from services.ephemeris import datetime_from_jd, julian_days
+from services.geocoder import resolve_location
+from services.muhurta import MuhurtaRules, MuhurtaWindow, best_windows, search_muhurta
+from services.panchang import TITHIS
+from services.timezones import zone_table
+
+router = APIRouter()
+
+MAX_RANGE_DAYS = 366 * 5
+
+
+class MuhurtaRequest(BaseModel):
+    location: str  # e.g., "Delhi, India"
+    start_date: date
+    end_date: date  # inclusive, local dates at the location
+    tithis: Optional[List[int]] = Field(None, description="Allowed tithis, 1 (Shukla Pratipada) to 30 (Amavasya)")
+    nakshatras: Optional[List[str]] = Field(None, description="Allowed Moon nakshatras, e.g. ROHINI")
+    varas: Optional[List[str]] = Field(None, description="Allowed weekdays, e.g. THURSDAY")
+    lagnas: Optional[List[str]] = Field(None, description="Allowed rising signs, e.g. TAURUS")
+    avoid_rahu_kaal: bool = True
+    min_minutes: float = Field(30.0, gt=0, le=1440)
+    top: int = Field(10, ge=1, le=100, description="Size of the ranked list sent last")
+
+
+def _upper(values: Optional[List[str]]):
+    return tuple(v.upper() for v in values) if values else None
+
+
+def _window_dict(window: MuhurtaWindow, zone: str) -> dict:
+    table = zone_table(zone)
+
+    def local(jd: float) -> str:
+        moment = datetime_from_jd(jd)
+        offset = table.offset_at_utc(int(moment.timestamp()))
+        return moment.astimezone(timezone(timedelta(seconds=offset))).isoformat(timespec="seconds")
+
+    return {
+        "start": local(window.start),
+        "end": local(window.end),
+        "minutes": round(window.minutes, 1),
+        "score": window.score,
+        "tithi": window.tithi,
+        "tithi_name": TITHIS[window.tithi - 1],
+        "nakshatra": window.nakshatra,
+        "vara": window.vara,
+        "lagna": window.lagna,
+    }
+
+
+@router.post("/muhurta")
+def muhurta_search(request: MuhurtaRequest):
+    """Stream auspicious windows as NDJSON while the search runs.
+
+    Each line is one window; the last line is ``{"ranked": [...]}`` with
+    the ``top`` best windows of the whole range.
+    """
+    if request.end_date < request.start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (request.end_date - request.start_date).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {MAX_RANGE_DAYS} days")
+    rules = MuhurtaRules(
+        tithis=tuple(request.tithis) if request.tithis else None,
+        nakshatras=_upper(request.nakshatras),
+        varas=_upper(request.varas),
+        lagnas=_upper(request.lagnas),
+        avoid_rahu_kaal=request.avoid_rahu_kaal,
+        min_minutes=request.min_minutes,
+    )
+    try:
+        rules.validate()
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    place = resolve_location(request.location)
+    if place is None:
+        raise HTTPException(status_code=404, detail=f"Could not resolve location {request.location!r}")
+    zone, lat, lon = place.timezone, place.latitude, place.longitude
+    table = zone_table(zone)
+
+    def jd_at_local_midnight(day: date) -> float:
+        midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        offset = table.offset_at_local(int(midnight.timestamp()))
+        return float(julian_days([midnight - timedelta(seconds=offset)])[0])
+
+    start_jd = jd_at_local_midnight(request.start_date)
+    end_jd = jd_at_local_midnight(request.end_date + timedelta(days=1))
+
+    def lines() -> Iterator[str]:
+        ranked: List[MuhurtaWindow] = []
+        for windows in search_muhurta(start_jd, end_jd, lat, lon, rules):
+            for window in windows:
+                yield json.dumps(_window_dict(window, zone)) + "\n"
+            ranked = best_windows([ranked, windows], request.top)
+        yield json.dumps({"ranked": [_window_dict(w, zone) for w in ranked]}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
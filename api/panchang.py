@@ -0,0 +1,77 @@
+# 📁 File: api/panchang.py
+
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from services.ephemeris import datetime_from_jd
+from services.geocoder import resolve_location
+from services.panchang import ELEMENTS, panchang_year
+from services.timezones import zone_table
+
+router = APIRouter()
+
+
+class PanchangDay(BaseModel):
+    date: date
+    vara: str
+    sunrise: datetime
+    sunset: datetime
+    rahu_kaal_start: datetime
+    rahu_kaal_end: datetime
+    tithi: str
+    tithi_end: datetime
+    nakshatra: str
+    nakshatra_end: datetime
+    yoga: str
+    yoga_end: datetime
+    karana: str
+    karana_end: datetime
+
+
+class PanchangResponse(BaseModel):
+    location: str
+    timezone: str
+    year: int
+    days: List[PanchangDay]
+
+
+@router.get("/panchang", response_model=PanchangResponse)
+def get_panchang(
+    location: str = Query(..., description='e.g., "Delhi, India"'),
+    year: int = Query(..., ge=1801, le=2199),
+    month: Optional[int] = Query(None, ge=1, le=12, description="Only this month (default: whole year)"),
+):
+    place = resolve_location(location)
+    if place is None:
+        raise HTTPException(status_code=404, detail=f"Could not resolve location {location!r}")
+    calendar = panchang_year(year, place.latitude, place.longitude)
+    table = zone_table(place.timezone)
+
+    def local(jd: float) -> datetime:
+        moment = datetime_from_jd(jd)
+        offset = table.offset_at_utc(int(moment.timestamp()))
+        return moment.astimezone(timezone(timedelta(seconds=offset)))
+
+    days = []
+    for i in range(len(calendar)):
+        row = calendar.day(i)
+        if month is not None and row["date"].month != month:
+            continue
+        rahu_start, rahu_end = row["rahu_kaal"]
+        fields = {name: row[name] for name in ELEMENTS}
+        fields.update({f"{name}_end": local(row[f"{name}_end"]) for name in ELEMENTS})
+        days.append(
+            PanchangDay(
+                date=row["date"],
+                vara=row["vara"],
+                sunrise=local(row["sunrise"]),
+                sunset=local(row["sunset"]),
+                rahu_kaal_start=local(rahu_start),
+                rahu_kaal_end=local(rahu_end),
+                **fields,
+            )
+        )
+    return PanchangResponse(location=location, timezone=place.timezone, year=year, days=days)
@@ -0,0 +1,173 @@
+"""Analysis module registry for JyotishAI.
+
+Every diagnostic module is declared once in :data:`MODULES`: the file in
+``api.endpoints`` that implements it, its analysis function, the URL
+prefix of its router and, for pairwise modules, the function that scores
+two charts.  :class:`ModuleRegistry` imports a module – its code and
+interpretation tables – the first time its analyzer or router is asked
+for, and records how long that import took.  The timing covers imports
+the module triggered for the first time, so shared services are charged
+to whichever module loaded them first.
+
+:class:`LazyModuleRoutes` serves the per-module routers under their
+prefixes without importing any of them at startup: a module is loaded
+through the registry on the first request for its prefix.  Its routes
+still appear in the OpenAPI schema: :meth:`LazyModuleRoutes.schema_routes`
+imports every served module when the schema is first generated.
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.routing import BaseRoute
+from starlette.types import Receive, Scope, Send
+
+from models.schemas import ModuleName
+
+
+@dataclass(frozen=True)
+class ModuleSpec:
+    """Declaration of one analysis module."""
+
+    name: ModuleName
+    module: str
+    analyzer: str
+    prefix: str
+    scorer: Optional[str] = None
+
+
+MODULES = (
+    ModuleSpec(ModuleName.PERSONALITY, "module_personality", "analyze_personality", "/personality"),
+    ModuleSpec(ModuleName.CAREER, "module_career", "analyze_career", "/career"),
+    ModuleSpec(ModuleName.EDUCATION, "module_education", "analyze_education", "/education"),
+    ModuleSpec(ModuleName.MARRIAGE, "module_marriage", "analyze_marriage", "/marriage"),
+    ModuleSpec(ModuleName.SEXUALITY, "module_sexuality", "analyze_sexuality", "/sexuality"),
+    ModuleSpec(ModuleName.BODY_TYPE, "module_body_type", "analyze_body_type", "/body_type"),
+    ModuleSpec(ModuleName.KARMA_SOUL_PATH, "module_karma_soul_path", "analyze_karma", "/karma"),
+    ModuleSpec(ModuleName.FOREIGN_TRAVEL, "module_foreign_travel", "analyze_foreign_travel", "/foreign_travel"),
+    ModuleSpec(ModuleName.SPIRITUALITY, "module_spirituality", "analyze_spirituality", "/spirituality"),
+    ModuleSpec(ModuleName.ASHTAKAVARGA, "module_ashtakavarga", "analyze_ashtakavarga", "/ashtakavarga"),
+    ModuleSpec(ModuleName.DASHA_TRANSIT, "module_dasha_transit", "analyze_dasha_transit", "/dasha_transit"),
+    ModuleSpec(ModuleName.PSYCHOLOGICAL, "module_psychological_vulnerability", "analyze_psychological", "/psychological"),
+    ModuleSpec(ModuleName.HEALTH, "module_health", "analyze_health", "/health"),
+    ModuleSpec(ModuleName.CHRONIC, "module_chronic_disease", "analyze_chronic_disease", "/chronic"),
+    ModuleSpec(
+        ModuleName.COMPATIBILITY,
+        "module_compatibility",
+        "analyze_compatibility",
+        "/compatibility",
+        scorer="compatibility_scores",
+    ),
+    ModuleSpec(ModuleName.VARGAS, "module_vargas", "analyze_vargas", "/vargas"),
+    ModuleSpec(ModuleName.YOGAS, "module_yogas", "analyze_yogas", "/yogas"),
+    ModuleSpec(ModuleName.SHADBALA, "module_shadbala", "analyze_shadbala", "/shadbala"),
+)
+
+
+class ModuleRegistry:
+    """Lazily imported analysis modules, looked up by :class:`ModuleName`."""
+
+    def __init__(self, specs: Iterable[ModuleSpec], package: str = "api.endpoints"):
+        self.specs: Dict[ModuleName, ModuleSpec] = {spec.name: spec for spec in specs}
+        missing = [name.value for name in ModuleName if name not in self.specs]
+        if missing:
+            raise RuntimeError(f"No module declared for: {', '.join(missing)}")
+        self.package = package
+        self._modules: Dict[ModuleName, ModuleType] = {}
+        self._import_ms: Dict[ModuleName, float] = {}
+        self._lock = threading.Lock()
+
+    def load(self, name: ModuleName) -> ModuleType:
+        """Import the module implementing ``name`` if it is not loaded yet."""
+        module = self._modules.get(name)
+        if module is not None:
+            return module
+        with self._lock:
+            module = self._modules.get(name)
+            if module is None:
+                started = time.perf_counter()
+                module = importlib.import_module(f"{self.package}.{self.specs[name].module}")
+                self._import_ms[name] = round((time.perf_counter() - started) * 1000.0, 2)
+                self._modules[name] = module
+        return module
+
+    def analyzer(self, name: ModuleName) -> Callable:
+        return getattr(self.load(name), self.specs[name].analyzer)
+
+    def scorer(self, name: ModuleName) -> Optional[Callable]:
+        spec = self.specs[name]
+        return getattr(self.load(name), spec.scorer) if spec.scorer else None
+
+    def router(self, name: ModuleName) -> APIRouter:
+        return self.load(name).router
+
+    def stats(self) -> Dict[str, Any]:
+        """Return which modules are loaded, what importing each cost and memo counters."""
+        stats = {}
+        for name in self.specs:
+            memo = getattr(self.analyzer(name), "memo", None) if name in self._modules else None
+            stats[name.value] = {
+                "loaded": name in self._modules,
+                "import_ms": self._import_ms.get(name),
+                "memo": memo.stats() if memo is not None else None,
+            }
+        return stats
+
+
+module_registry = ModuleRegistry(MODULES)
+
+
+class LazyModuleRoutes:
+    """ASGI app serving module routers, importing each on its first request.
+
+    Mounted under ``/modules``, a request for ``/modules/career`` loads
+    ``module_career`` through :class:`ModuleRegistry` (in the threadpool,
+    so the import does not stall the event loop) and is then dispatched to
+    its router like an eagerly mounted one.  FastAPI does not look into
+    mounted apps when it builds the OpenAPI schema, so the application
+    adds :meth:`schema_routes` to it.
+    """
+
+    def __init__(self, registry: ModuleRegistry, specs: Iterable[ModuleSpec]):
+        self.registry = registry
+        self._names: Dict[str, ModuleName] = {spec.prefix: spec.name for spec in specs}
+        self._routers: Dict[str, APIRouter] = {}
+
+    async def _router(self, prefix: str) -> APIRouter:
+        router = self._routers.get(prefix)
+        if router is None:
+            module_router = await run_in_threadpool(self.registry.router, self._names[prefix])
+            router = APIRouter()
+            router.include_router(module_router, prefix=prefix, tags=["modules"])
+            self._routers[prefix] = router
+        return router
+
+    def schema_routes(self, mount_path: str) -> List[BaseRoute]:
+        """Return every served route under ``mount_path``, importing the modules.
+
+        Only meant for building the OpenAPI schema, which happens once.
+        """
+        router = APIRouter()
+        for prefix, name in self._names.items():
+            router.include_router(self.registry.router(name), prefix=mount_path + prefix, tags=["modules"])
+        return router.routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path, root_path = scope["path"], scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        prefix = "/" + path.lstrip("/").split("/", 1)[0]
+        if scope["type"] != "http" or prefix not in self._names:
+            await JSONResponse({"detail": "Not Found"}, status_code=404)(scope, receive, send)
+            return
+        router = await self._router(prefix)
+        await router(scope, receive, send)
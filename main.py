@@ -2,13 +2,25 @@ from __future__ import annotations
 
 """FastAPI application for JyotishAI."""
 
+import asyncio
+import hashlib
+import json
+import logging
 import os
+import tempfile
+import time
 import uvicorn
 import importlib
-from typing import Callable, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import IO, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from models.schemas import (
     AnalysisResponse,
@@ -16,30 +28,59 @@ from models.schemas import (
     ModuleName,
     ModuleResult,
 )
-from services.chart_engine import VedicAstrologyEngine
-from services import report_generator
-from api import api_router
+from services.chart_engine import VedicAstrologyEngine, prepare_charts, prepare_strengths, service_import_stats
+from services.chart_cache import chart_cache, strength_cache
+from services.chart_executor import ChartExecutorBusy, chart_executor
+from services import muhurta, timezones
+from services.geocoder import GazetteerUnavailable, UnknownLocation, get_geocoder
+from services.singleflight import analysis_flights, chart_flights
+from api import api_router, module_routes
+from api.registry import module_registry
 from api.chat import router as chat_router
 from api.seduction import router as seduction_router
+from api.muhurta import router as muhurta_router
+from api.panchang import router as panchang_router
 
-# Module analyzers
-from api.endpoints.module_personality import analyze_personality
-from api.endpoints.module_career import analyze_career
-from api.endpoints.module_education import analyze_education
-from api.endpoints.module_marriage import analyze_marriage
-from api.endpoints.module_sexuality import analyze_sexuality
-from api.endpoints.module_body_type import analyze_body_type
-from api.endpoints.module_karma_soul_path import analyze_karma
-from api.endpoints.module_foreign_travel import analyze_foreign_travel
-from api.endpoints.module_spirituality import analyze_spirituality
-from api.endpoints.module_ashtakavarga import analyze_ashtakavarga
-from api.endpoints.module_dasha_transit import analyze_dasha_transit
-from api.endpoints.module_psychological_vulnerability import analyze_psychological
-from api.endpoints.module_health import analyze_health
-from api.endpoints.module_chronic_disease import analyze_chronic_disease
-from api.endpoints.module_compatibility import analyze_compatibility
-
-app = FastAPI(title="JyotishAI", description="Vedic astrology diagnostic API")
+logger = logging.getLogger(__name__)
+
+# Time budget per module in /analyze; a module that overruns is reported
+# with an error marker instead of failing the request.
+MODULE_TIMEOUT = float(os.getenv("JYOTISHAI_MODULE_TIMEOUT", "5"))
+# Analyzers run on their own bounded thread pool.  A timeout abandons an
+# analyzer, it does not cancel it: the thread runs on until the analyzer
+# returns, but it only ever holds one of these threads, never a token of
+# the threadpool the rest of the application shares.
+MODULE_THREADS = int(os.getenv("JYOTISHAI_MODULE_THREADS", "8"))
+_module_pool = ThreadPoolExecutor(max_workers=MODULE_THREADS, thread_name_prefix="analyzer")
+# /analyze/batch reads and analyses this many NDJSON lines at a time.
+BATCH_SIZE = int(os.getenv("JYOTISHAI_BATCH_SIZE", "256"))
+MAX_LINE_BYTES = 64 * 1024
+SPOOL_BYTES = 1024 * 1024
+# Largest /analyze/batch upload accepted, in bytes.
+MAX_UPLOAD_BYTES = int(os.getenv("JYOTISHAI_BATCH_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+def _warm_timezones() -> None:
+    try:
+        zones = get_geocoder().timezones()
+    except (OSError, ValueError) as exc:
+        logger.warning("Gazetteer unavailable: %s", exc)
+        return
+    timezones.warm(zones)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fork and warm the chart workers before the first request arrives.
+    await run_in_threadpool(chart_executor.start)
+    # UTC offset tables for every gazetteer zone, so no request pays for a scan.
+    await run_in_threadpool(_warm_timezones)
+    yield
+    muhurta.shutdown_executor()
+    chart_executor.shutdown()
+
+
+app = FastAPI(title="JyotishAI", description="Vedic astrology diagnostic API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -51,77 +92,335 @@ app.add_middleware(
 
 # Include routers
 app.include_router(api_router, prefix="/modules")
+if module_routes is not None:
+    app.mount("/modules", module_routes)
 app.include_router(chat_router, prefix="/api", tags=["chat"])
 app.include_router(seduction_router, prefix="/api", tags=["seduction"])
+app.include_router(muhurta_router, prefix="/api", tags=["muhurta"])
+app.include_router(panchang_router, prefix="/api", tags=["panchang"])
+
+
+def _openapi() -> Dict:
+    """OpenAPI schema including the lazily served module routes.
+
+    Building it imports every served module once, on the first request
+    for ``/openapi.json`` or ``/docs``.
+    """
+    if app.openapi_schema is None:
+        routes = list(app.routes)
+        if module_routes is not None:
+            routes += module_routes.schema_routes("/modules")
+        app.openapi_schema = get_openapi(
+            title=app.title, version=app.version, description=app.description, routes=routes
+        )
+    return app.openapi_schema
+
+
+app.openapi = _openapi
+
+
+@app.exception_handler(ChartExecutorBusy)
+async def chart_executor_busy_handler(request: Request, exc: ChartExecutorBusy) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+@app.exception_handler(UnknownLocation)
+async def unknown_location_handler(request: Request, exc: UnknownLocation) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
+@app.exception_handler(GazetteerUnavailable)
+async def gazetteer_unavailable_handler(request: Request, exc: GazetteerUnavailable) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "30"})
+
+
+def _module_call(module: ModuleName, chart, chart2) -> Callable[[], Tuple[str, Optional[Dict[str, float]]]]:
+    def call():
+        # Resolved here so a first import also runs in the threadpool.
+        analyze = module_registry.analyzer(module)
+        score = module_registry.scorer(module)
+        if score is not None:
+            # Pairwise modules score both charts before writing the analysis.
+            scores = score(chart, chart2)
+            return analyze(chart, chart2, scores), scores
+        return analyze(chart), None
+    return call
+
+
+async def _run_module(module: ModuleName, call, timeout: float) -> ModuleResult:
+    """Run one analyzer, turning timeouts and failures into error markers."""
+    started = time.perf_counter()
+    analysis, scores, error = "", None, None
+    try:
+        # Every analyzer runs in a thread: code running on the event loop
+        # could not be abandoned when it overruns its deadline.  Time spent
+        # waiting for a free thread counts against the deadline too.
+        future = asyncio.get_running_loop().run_in_executor(_module_pool, call)
+        analysis, scores = await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        error = f"timed out after {timeout:g} s"
+    except Exception as exc:
+        logger.exception("Module %s failed", module.value)
+        error = f"{type(exc).__name__}: {exc}"
+    elapsed_ms = round((time.perf_counter() - started) * 1000.0, 2)
+    return ModuleResult(module=module, analysis=analysis, scores=scores, error=error, elapsed_ms=elapsed_ms)
+
+
+def _requested_modules(request: ChartRequest) -> List[ModuleName]:
+    if request.modules:
+        return list(dict.fromkeys(request.modules))
+    return [m for m in ModuleName if m != ModuleName.COMPATIBILITY]
+
+
+def _second_request(request: ChartRequest, modules: List[ModuleName]) -> Optional[ChartRequest]:
+    """Chart request for the second person when Compatibility is requested."""
+    if ModuleName.COMPATIBILITY not in modules:
+        return None
+    if not all([
+        request.second_name,
+        request.second_birth_date,
+        request.second_birth_time,
+        request.second_location,
+    ]):
+        raise HTTPException(status_code=400, detail="Second person details are required for compatibility analysis.")
+    return ChartRequest(
+        name=request.second_name,
+        birth_date=request.second_birth_date,
+        birth_time=request.second_birth_time,
+        location=request.second_location,
+        utc_offset=request.second_utc_offset,
+        node=request.node,
+        modules=[],
+    )
+
+
+async def _run_modules(modules: List[ModuleName], chart, chart2, timeout: float) -> List[ModuleResult]:
+    return list(await asyncio.gather(*(_run_module(m, _module_call(m, chart, chart2), timeout) for m in modules)))
+
+
+def _analysis_key(chart, chart2, modules: List[ModuleName], timeout: float) -> str:
+    """Canonical hash of everything that determines an /analyze result."""
+    canonical = "|".join(
+        [chart.cache_key, chart2.cache_key if chart2 is not None else "", f"{timeout:g}"]
+        + [m.value for m in modules]
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
-ANALYSIS_FUNCTIONS: Dict[ModuleName, Callable] = {
-    ModuleName.PERSONALITY: analyze_personality,
-    ModuleName.CAREER: analyze_career,
-    ModuleName.EDUCATION: analyze_education,
-    ModuleName.MARRIAGE: analyze_marriage,
-    ModuleName.SEXUALITY: analyze_sexuality,
-    ModuleName.BODY_TYPE: analyze_body_type,
-    ModuleName.KARMA_SOUL_PATH: analyze_karma,
-    ModuleName.FOREIGN_TRAVEL: analyze_foreign_travel,
-    ModuleName.SPIRITUALITY: analyze_spirituality,
-    ModuleName.ASHTAKAVARGA: analyze_ashtakavarga,
-    ModuleName.DASHA_TRANSIT: analyze_dasha_transit,
-    ModuleName.PSYCHOLOGICAL: analyze_psychological,
-    ModuleName.HEALTH: analyze_health,
-    ModuleName.CHRONIC: analyze_chronic_disease,
-}
 
 @app.post("/analyze", response_model=AnalysisResponse)
-def analyze_chart(
+async def analyze_chart(
     request: ChartRequest,
     format: str = Query("json", description="Output format: json, docx or pdf", regex="^(json|docx|pdf)$"),
+    timeout: float = Query(MODULE_TIMEOUT, gt=0, le=60, description="Time budget per module in seconds"),
 ) -> AnalysisResponse:
+    started = time.perf_counter()
+    modules = _requested_modules(request)
+    second_req = _second_request(request, modules)
     chart = VedicAstrologyEngine.from_request(request)
+    chart2 = VedicAstrologyEngine.from_request(second_req) if second_req else None
 
-    if request.modules:
-        modules = request.modules
-    else:
-        modules = [m for m in ModuleName if m != ModuleName.COMPATIBILITY]
-
-    results: List[ModuleResult] = []
-    for module in modules:
-        if module == ModuleName.COMPATIBILITY:
-            if not all([
-                request.second_name,
-                request.second_birth_date,
-                request.second_birth_time,
-                request.second_location,
-                request.second_utc_offset is not None,
-            ]):
-                raise HTTPException(status_code=400, detail="Second person details are required for compatibility analysis.")
-            second_req = ChartRequest(
-                name=request.second_name,
-                birth_date=request.second_birth_date,
-                birth_time=request.second_birth_time,
-                location=request.second_location,
-                utc_offset=request.second_utc_offset,
-                modules=[],
-            )
-            chart2 = VedicAstrologyEngine.from_request(second_req)
-            analysis_text = analyze_compatibility(chart, chart2)
-            results.append(ModuleResult(module=module, analysis=analysis_text))
-            continue
-
-        func = ANALYSIS_FUNCTIONS.get(module)
-        if not func:
-            raise HTTPException(status_code=400, detail=f"Unknown module: {module}")
-        analysis_text = func(chart)
-        results.append(ModuleResult(module=module, analysis=analysis_text))
+    async def compute() -> Tuple[float, List[ModuleResult]]:
+        # Both charts are computed once, concurrently, before the fan-out.
+        await asyncio.gather(*(c.compute_chart_async() for c in (chart, chart2) if c is not None))
+        chart_ms = round((time.perf_counter() - started) * 1000.0, 2)
+        return chart_ms, await _run_modules(modules, chart, chart2, timeout)
 
-    response = AnalysisResponse(name=request.name, results=results)
+    # Identical concurrent requests share one chart and module fan-out.
+    chart_ms, results = await analysis_flights.do(_analysis_key(chart, chart2, modules, timeout), compute)
+    response = AnalysisResponse(name=request.name, results=results, chart_ms=chart_ms)
 
     if format in ("docx", "pdf"):
-        path = report_generator.generate_docx(chart, results) if format == "docx" else report_generator.generate_pdf(chart, results)
-        response.report_path = path
+        # The DOCX and PDF libraries are slow to import; load them on first use.
+        from services import report_generator
 
+        generate = report_generator.generate_docx if format == "docx" else report_generator.generate_pdf
+        completed = [r for r in results if r.error is None]
+        # A coalesced request's own chart is a cache hit by now.
+        await chart.compute_chart_async()
+        response.report_path = await run_in_threadpool(generate, chart, completed)
+
+    response.elapsed_ms = round((time.perf_counter() - started) * 1000.0, 2)
     return response
 
 
+def _ndjson_lines(body: IO[bytes]) -> Iterator[Tuple[int, Optional[bytes]]]:
+    """Yield ``(line number, line)`` from an NDJSON file; ``None`` marks an over-long line."""
+    number = 0
+    while True:
+        line = body.readline(MAX_LINE_BYTES + 1)
+        if not line:
+            return
+        if len(line) > MAX_LINE_BYTES and not line.endswith(b"\n"):
+            # Skip the rest of the line without holding it in memory.
+            while line and not line.endswith(b"\n"):
+                line = body.readline(MAX_LINE_BYTES)
+            yield number, None
+        elif line.strip():
+            yield number, line
+        number += 1
+
+
+def _error_line(index: int, error: str) -> str:
+    return json.dumps({"index": index, "error": error}) + "\n"
+
+
+async def _analyze_batch(batch: List[Tuple[int, Optional[bytes]]], timeout: float) -> AsyncIterator[str]:
+    """Analyse one batch of NDJSON lines, yielding output lines as each finishes."""
+    started = time.perf_counter()
+    jobs = []
+    for index, raw in batch:
+        if raw is None:
+            yield _error_line(index, f"line longer than {MAX_LINE_BYTES} bytes")
+            continue
+        try:
+            request = ChartRequest(**json.loads(raw))
+            modules = _requested_modules(request)
+            second_req = _second_request(request, modules)
+            chart = VedicAstrologyEngine.from_request(request)
+            chart2 = VedicAstrologyEngine.from_request(second_req) if second_req else None
+            # Parse the birth moments now so a malformed date fails only this line.
+            for engine in (chart, chart2):
+                if engine is not None:
+                    engine.birth_moment
+        except HTTPException as exc:
+            yield _error_line(index, exc.detail)
+            continue
+        except UnknownLocation as exc:
+            yield _error_line(index, str(exc))
+            continue
+        except (ValueError, TypeError) as exc:
+            yield _error_line(index, f"invalid request: {exc}")
+            continue
+        except Exception as exc:
+            logger.exception("Batch line %d failed", index)
+            yield _error_line(index, f"{type(exc).__name__}: {exc}")
+            continue
+        jobs.append((index, request, modules, chart, chart2))
+    if not jobs:
+        return
+
+    # Identical births across the batch share one chart; the rest are
+    # computed in a single batch ephemeris pass.
+    engines = [job[3] for job in jobs] + [job[4] for job in jobs if job[4] is not None]
+    try:
+        await prepare_charts(engines)
+    except ChartExecutorBusy as exc:
+        for index, *_ in jobs:
+            yield _error_line(index, str(exc))
+        return
+    except Exception as exc:
+        logger.exception("Chart computation failed for a batch of %d lines", len(jobs))
+        for index, *_ in jobs:
+            yield _error_line(index, f"{type(exc).__name__}: {exc}")
+        return
+    # Shadbala for the whole batch is one vectorised pass too.  Should it
+    # fail, each chart computes its own strengths when a module asks.
+    strong = [job[3] for job in jobs if ModuleName.SHADBALA in job[2]]
+    if strong:
+        try:
+            await run_in_threadpool(prepare_strengths, strong)
+        except Exception:
+            logger.exception("Batch Shadbala failed; falling back to per-chart strengths")
+    chart_ms = round((time.perf_counter() - started) * 1000.0, 2)
+
+    async def analyze(index, request, modules, chart, chart2) -> str:
+        job_started = time.perf_counter()
+        try:
+            results = await _run_modules(modules, chart, chart2, timeout)
+            response = AnalysisResponse(name=request.name, results=results, chart_ms=chart_ms, index=index)
+            response.elapsed_ms = round((time.perf_counter() - job_started) * 1000.0, 2)
+            return json.dumps(jsonable_encoder(response)) + "\n"
+        except Exception as exc:
+            logger.exception("Batch line %d failed", index)
+            return _error_line(index, f"{type(exc).__name__}: {exc}")
+
+    for finished in asyncio.as_completed([analyze(*job) for job in jobs]):
+        yield await finished
+
+
+@app.post("/analyze/batch")
+async def analyze_batch(
+    request: Request,
+    timeout: float = Query(MODULE_TIMEOUT, gt=0, le=60, description="Time budget per module in seconds"),
+) -> StreamingResponse:
+    """Analyse an NDJSON body of ``ChartRequest`` lines.
+
+    The upload is spooled to a temporary file (on disk once it outgrows
+    ``SPOOL_BYTES``) and analysed ``BATCH_SIZE`` lines at a time, the next
+    batch being read only once the current one is written, so memory
+    stays bounded however large the upload.  One ``AnalysisResponse`` is
+    written per line as soon as it finishes, so output order can differ
+    from input order; ``index`` is the 0-based input line.  Lines that
+    cannot be analysed produce ``{"index": ..., "error": ...}``.  Uploads
+    larger than ``MAX_UPLOAD_BYTES`` are rejected with 413.
+    """
+    too_large = HTTPException(status_code=413, detail=f"upload larger than {MAX_UPLOAD_BYTES} bytes")
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > MAX_UPLOAD_BYTES:
+        raise too_large
+    # The body is read up front: once streaming starts, the response
+    # itself listens on the connection for a disconnect.
+    body = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                raise too_large
+            body.write(chunk)
+    except BaseException:
+        body.close()
+        raise
+    body.seek(0)
+
+    async def output() -> AsyncIterator[str]:
+        try:
+            batch: List[Tuple[int, Optional[bytes]]] = []
+            for item in _ndjson_lines(body):
+                batch.append(item)
+                if len(batch) >= BATCH_SIZE:
+                    async for line in _analyze_batch(batch, timeout):
+                        yield line
+                    batch = []
+            if batch:
+                async for line in _analyze_batch(batch, timeout):
+                    yield line
+        finally:
+            body.close()
+
+    return StreamingResponse(output(), media_type="application/x-ndjson")
+
+
+@app.get("/metrics/chart_cache")
+def chart_cache_metrics() -> Dict[str, object]:
+    """Expose chart cache hit/miss/eviction counters for monitoring."""
+    return chart_cache.stats()
+
+
+@app.get("/metrics/strength_cache")
+def strength_cache_metrics() -> Dict[str, object]:
+    """Expose the Shadbala/Bhava Bala cache counters for monitoring."""
+    return strength_cache.stats()
+
+
+@app.get("/metrics/chart_executor")
+def chart_executor_metrics() -> Dict[str, object]:
+    """Expose chart worker pool load and back-pressure counters."""
+    return chart_executor.stats()
+
+
+@app.get("/metrics/modules")
+def module_metrics() -> Dict[str, object]:
+    """Expose which analysis modules and chart services are loaded, their import cost and memo hits."""
+    return {"modules": module_registry.stats(), "services": service_import_stats()}
+
+
+@app.get("/metrics/singleflight")
+def singleflight_metrics() -> Dict[str, object]:
+    """Expose how many chart and /analyze computations were coalesced."""
+    return {"chart": chart_flights.stats(), "analysis": analysis_flights.stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -24,6 +25,9 @@ class ModuleName(str, Enum):
     HEALTH = "Health"
     CHRONIC = "Chronic Disease Indicators"
     COMPATIBILITY = "Compatibility"
+    VARGAS = "Vargas"
+    YOGAS = "Yogas"
+    SHADBALA = "Shadbala"
 
 
 class ChartRequest(BaseModel):
@@ -39,8 +43,15 @@ class ChartRequest(BaseModel):
     location: str = Field(
         ..., description="Place of birth (city, country or coordinates)"
     )
-    utc_offset: float = Field(
-        ..., description="Time zone offset from UTC in hours, e.g. +5.0"
+    utc_offset: Optional[float] = Field(
+        None,
+        description=(
+            "Time zone offset from UTC in hours, e.g. +5.0.  When omitted it is "
+            "resolved from the location's historical time zone."
+        ),
+    )
+    node: Literal["MEAN", "TRUE"] = Field(
+        "MEAN", description="Lunar node used for Rahu and Ketu: MEAN or TRUE"
     )
     modules: List[ModuleName] = Field(
         default_factory=list,
@@ -61,7 +72,7 @@ class ChartRequest(BaseModel):
         None, description="Birth location of the second person"
     )
     second_utc_offset: Optional[float] = Field(
-        None, description="UTC offset of the second person"
+        None, description="UTC offset of the second person (resolved from location when omitted)"
     )
 
 
@@ -70,6 +81,57 @@ class ModuleResult(BaseModel):
 
     module: ModuleName
     analysis: str
+    scores: Optional[Dict[str, float]] = Field(
+        None, description="Numeric scores behind the analysis, when the module produces them"
+    )
+    error: Optional[str] = Field(
+        None, description="Why the module produced no analysis (timeout or failure), if it did not"
+    )
+    elapsed_ms: Optional[float] = Field(None, description="Time the module took, in milliseconds")
+
+
+class VargaResult(ModuleResult):
+    """Varga module result with sign placements per divisional chart."""
+
+    vargas: Dict[str, Dict[str, str]] = Field(
+        default_factory=dict, description="Sign of each body keyed by varga (D1–D60)"
+    )
+
+
+class DashaPeriodModel(BaseModel):
+    """One Vimshottari period."""
+
+    level: int = Field(..., description="1 = mahadasha, 2 = antardasha, 3 = pratyantardasha")
+    lords: List[str] = Field(..., description="Mahadasha lord first, then sub-period lords")
+    start: datetime
+    end: datetime
+
+
+class DashaTimelineResponse(BaseModel):
+    """Vimshottari periods overlapping a requested date range."""
+
+    name: str
+    start: datetime
+    end: datetime
+    periods: List[DashaPeriodModel]
+
+
+class MatchCandidate(BaseModel):
+    """One candidate from a matchmaking search."""
+
+    id: str
+    total: float = Field(..., description="Ashtakoota total out of 36")
+    scores: Dict[str, float] = Field(..., description="Points per koota")
+    manglik: bool
+
+
+class MatchSearchResponse(BaseModel):
+    """Best matches for one profile from the matchmaking index."""
+
+    name: str
+    manglik: bool = Field(..., description="Whether the queried profile has manglik dosha")
+    pool_size: int
+    matches: List[MatchCandidate]
 
 
 class AnalysisResponse(BaseModel):
@@ -77,4 +139,7 @@ class AnalysisResponse(BaseModel):
 
     name: str
     results: List[ModuleResult]
-    report_path: Optional[str] = None
\ No newline at end of file
+    report_path: Optional[str] = None
+    chart_ms: Optional[float] = Field(None, description="Time spent obtaining the chart(s), in milliseconds")
+    elapsed_ms: Optional[float] = Field(None, description="Total time for the request, in milliseconds")
+    index: Optional[int] = Field(None, description="0-based line of the request in a batch upload")
\ No newline at end of file
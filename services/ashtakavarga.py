@@ -0,0 +1,164 @@
+"""Ashtakavarga engine for JyotishAI.
+
+Each of the seven planets receives a bindu (benefic point) in a sign when
+one of eight contributors (the seven planets and the ascendant) stands in
+a prescribed house position from it.  The classical Parashari positions
+are encoded below as one 12-bit mask per planet and contributor (an 8×12
+bit table per planet).  Rotating every mask by the contributor's natal
+sign turns it into a mask over absolute signs; a planet's Bhinnashtakavarga
+score in a sign is then the popcount of that sign's bit across its eight
+rotated masks, and the Sarvashtakavarga is the sum over planets.
+
+Everything is NumPy on integer sign indices, so a batch of charts (or a
+natal chart against every day of a transit window) is a few array
+operations.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+from services.ephemeris import BODY_INDEX, ChartArrays
+
+PLANETS = ("SUN", "MOON", "MARS", "MERCURY", "JUPITER", "VENUS", "SATURN")
+CONTRIBUTORS = PLANETS + ("ASC",)
+
+# Houses (counted from each contributor) in which the planet gets a bindu.
+BINDU_HOUSES: Dict[str, Tuple[Tuple[int, ...], ...]] = {
+    "SUN": (
+        (1, 2, 4, 7, 8, 9, 10, 11),  # Sun
+        (3, 6, 10, 11),  # Moon
+        (1, 2, 4, 7, 8, 9, 10, 11),  # Mars
+        (3, 5, 6, 9, 10, 11, 12),  # Mercury
+        (5, 6, 9, 11),  # Jupiter
+        (6, 7, 12),  # Venus
+        (1, 2, 4, 7, 8, 9, 10, 11),  # Saturn
+        (3, 4, 6, 10, 11, 12),  # Ascendant
+    ),
+    "MOON": (
+        (3, 6, 7, 8, 10, 11),
+        (1, 3, 6, 7, 10, 11),
+        (2, 3, 5, 6, 9, 10, 11),
+        (1, 3, 4, 5, 7, 8, 10, 11),
+        (1, 4, 7, 8, 10, 11, 12),
+        (3, 4, 5, 7, 9, 10, 11),
+        (3, 5, 6, 11),
+        (3, 6, 10, 11),
+    ),
+    "MARS": (
+        (3, 5, 6, 10, 11),
+        (3, 6, 11),
+        (1, 2, 4, 7, 8, 10, 11),
+        (3, 5, 6, 11),
+        (6, 10, 11, 12),
+        (6, 8, 11, 12),
+        (1, 4, 7, 8, 9, 10, 11),
+        (1, 3, 6, 10, 11),
+    ),
+    "MERCURY": (
+        (5, 6, 9, 11, 12),
+        (2, 4, 6, 8, 10, 11),
+        (1, 2, 4, 7, 8, 9, 10, 11),
+        (1, 3, 5, 6, 9, 10, 11, 12),
+        (6, 8, 11, 12),
+        (1, 2, 3, 4, 5, 8, 9, 11),
+        (1, 2, 4, 7, 8, 9, 10, 11),
+        (1, 2, 4, 6, 8, 10, 11),
+    ),
+    "JUPITER": (
+        (1, 2, 3, 4, 7, 8, 9, 10, 11),
+        (2, 5, 7, 9, 11),
+        (1, 2, 4, 7, 8, 10, 11),
+        (1, 2, 4, 5, 6, 9, 10, 11),
+        (1, 2, 3, 4, 7, 8, 10, 11),
+        (2, 5, 6, 9, 10, 11),
+        (3, 5, 6, 12),
+        (1, 2, 4, 5, 6, 7, 9, 10, 11),
+    ),
+    "VENUS": (
+        (8, 11, 12),
+        (1, 2, 3, 4, 5, 8, 9, 11, 12),
+        (3, 5, 6, 9, 11, 12),
+        (3, 5, 6, 9, 11),
+        (5, 8, 9, 10, 11),
+        (1, 2, 3, 4, 5, 8, 9, 10, 11),
+        (3, 4, 5, 8, 9, 10, 11),
+        (1, 2, 3, 4, 5, 8, 9, 11),
+    ),
+    "SATURN": (
+        (1, 2, 4, 7, 8, 10, 11),
+        (3, 6, 11),
+        (3, 5, 6, 10, 11, 12),
+        (6, 8, 9, 10, 11, 12),
+        (5, 6, 11, 12),
+        (6, 11, 12),
+        (3, 5, 6, 11),
+        (1, 3, 4, 6, 10, 11),
+    ),
+}
+
+# BINDU_MASKS[p, c]: bit h-1 set when planet p gets a bindu in house h from contributor c.
+BINDU_MASKS = np.array(
+    [[sum(1 << (h - 1) for h in houses) for houses in BINDU_HOUSES[p]] for p in PLANETS],
+    dtype=np.uint16,
+)
+
+
+def _rotate(mask: int, shift: int) -> int:
+    return ((mask << shift) | (mask >> (12 - shift))) & 0xFFF
+
+
+# _ROTATED[p, c, s]: BINDU_MASKS[p, c] over absolute signs for a contributor in sign s.
+_ROTATED = np.array(
+    [[[_rotate(int(m), s) for s in range(12)] for m in row] for row in BINDU_MASKS],
+    dtype=np.uint16,
+)
+_SIGN_BITS = (1 << np.arange(12)).astype(np.uint16)
+_CONTRIBUTOR_COLUMNS = [BODY_INDEX[c] for c in CONTRIBUTORS]
+_PLANET_AXIS = np.arange(len(PLANETS))[:, None]
+_CONTRIBUTOR_AXIS = np.arange(len(CONTRIBUTORS))[None, :]
+
+
+def bhinnashtakavarga(signs: np.ndarray) -> np.ndarray:
+    """Return Bhinnashtakavarga bindus for contributor sign indices.
+
+    Args:
+        signs: Sign indices in :data:`CONTRIBUTORS` order, shape ``(..., 8)``.
+
+    Returns:
+        ``uint8`` array of shape ``(..., 7, 12)``: bindus per planet in
+        :data:`PLANETS` order and per sign (0 = Aries).
+    """
+    signs = np.asarray(signs, dtype=np.int64)
+    # rotated[..., p, c]: absolute-sign bindu mask contributed by c to planet p.
+    rotated = _ROTATED[_PLANET_AXIS, _CONTRIBUTOR_AXIS, signs[..., None, :]]
+    # Popcount of each sign's bit across the eight contributors.
+    return ((rotated[..., None] & _SIGN_BITS) != 0).sum(axis=-2, dtype=np.uint8)
+
+
+def sarvashtakavarga(bav: np.ndarray) -> np.ndarray:
+    """Sum Bhinnashtakavarga tables over planets; shape ``(..., 12)``."""
+    return bav.sum(axis=-2, dtype=np.uint16)
+
+
+def contributor_signs(arrays: ChartArrays) -> np.ndarray:
+    """Select the contributor sign columns from batch chart arrays, shape ``(n, 8)``."""
+    return arrays.signs[:, _CONTRIBUTOR_COLUMNS]
+
+
+def by_house(scores: np.ndarray, asc_sign) -> np.ndarray:
+    """Reorder sign-indexed scores so index 0 is the first house from the ascendant.
+
+    ``asc_sign`` must broadcast against ``scores.shape[:-1]``, e.g. shape
+    ``(n,)`` for Sarvashtakavarga rows or ``(n, 1)`` for ``(n, 7, 12)`` tables.
+    """
+    asc_sign = np.asarray(asc_sign, dtype=np.int64)
+    houses = (asc_sign[..., None] + np.arange(12)) % 12
+    return np.take_along_axis(scores, np.broadcast_to(houses, scores.shape), axis=-1)
+
+
+def transit_bindus(bav: np.ndarray, planet: str, transit_signs: np.ndarray) -> np.ndarray:
+    """Bindus of ``planet``'s natal table in each transit sign, e.g. one per day."""
+    return bav[PLANETS.index(planet)][np.asarray(transit_signs, dtype=np.int64)]
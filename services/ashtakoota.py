@@ -0,0 +1,184 @@
+"""Ashtakoota (guna milan) scoring for JyotishAI.
+
+The eight kootas award up to 36 points for a (groom, bride) pair from
+their Moon nakshatras and Moon signs.  Every koota is precomputed once
+as a lookup table: tara, yoni, gana and nadi depend only on the two
+nakshatras (27×27 tables), while varna, vashya, graha maitri and bhakoot
+depend only on the two Moon signs (12×12 tables).  Scoring a pair, or
+whole arrays of pairs, is then eight array indexings.
+"""
+
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+
+KOOTAS = ("varna", "vashya", "tara", "yoni", "graha_maitri", "gana", "bhakoot", "nadi")
+MAX_POINTS = {
+    "varna": 1.0,
+    "vashya": 2.0,
+    "tara": 3.0,
+    "yoni": 4.0,
+    "graha_maitri": 5.0,
+    "gana": 6.0,
+    "bhakoot": 7.0,
+    "nadi": 8.0,
+}
+TOTAL_POINTS = 36.0
+
+# ----------------------------------------------------------------------
+# Sign attributes
+# ----------------------------------------------------------------------
+# Varna rank by element (fire, earth, air, water): Kshatriya, Vaishya,
+# Shudra, Brahmin.
+_VARNA_RANK = np.array([3, 2, 1, 4] * 3)
+
+# Vashya group per sign; dual signs use the group of their first half.
+_CHATUSHPADA, _MANAVA, _JALACHARA, _VANACHARA, _KEETA = range(5)
+_VASHYA_GROUP = np.array([
+    _CHATUSHPADA, _CHATUSHPADA, _MANAVA, _JALACHARA, _VANACHARA, _MANAVA,
+    _MANAVA, _KEETA, _MANAVA, _CHATUSHPADA, _MANAVA, _JALACHARA,
+])
+# Rows: groom's group, columns: bride's group.
+_VASHYA_POINTS = np.array([
+    [2.0, 1.0, 1.0, 0.5, 1.0],
+    [1.0, 2.0, 0.5, 0.0, 1.0],
+    [1.0, 0.5, 2.0, 1.0, 1.0],
+    [0.0, 0.0, 0.0, 2.0, 0.0],
+    [1.0, 1.0, 1.0, 0.0, 2.0],
+])
+
+# Sign lords as indices into _RELATION: Sun, Moon, Mars, Mercury, Jupiter, Venus, Saturn.
+_SIGN_LORD = np.array([2, 5, 3, 1, 0, 3, 5, 2, 4, 6, 6, 4])
+_FRIEND, _NEUTRAL, _ENEMY = 0, 1, 2
+# Natural relationship of the row planet towards the column planet.
+_RELATION = np.array([
+    # Sun Moon Mars Merc Jup Ven Sat
+    [0, 0, 0, 1, 0, 2, 2],  # Sun
+    [0, 0, 1, 0, 1, 1, 1],  # Moon
+    [0, 0, 0, 2, 0, 1, 1],  # Mars
+    [0, 2, 1, 0, 1, 0, 1],  # Mercury
+    [0, 0, 0, 2, 0, 2, 1],  # Jupiter
+    [2, 2, 1, 0, 1, 0, 0],  # Venus
+    [2, 2, 2, 0, 1, 0, 0],  # Saturn
+])
+# Points by the two lords' attitudes towards each other (order-free).
+_MAITRI_POINTS = {
+    (_FRIEND, _FRIEND): 5.0,
+    (_FRIEND, _NEUTRAL): 4.0,
+    (_NEUTRAL, _NEUTRAL): 3.0,
+    (_FRIEND, _ENEMY): 1.0,
+    (_NEUTRAL, _ENEMY): 0.5,
+    (_ENEMY, _ENEMY): 0.0,
+}
+
+# ----------------------------------------------------------------------
+# Nakshatra attributes
+# ----------------------------------------------------------------------
+_HORSE, _ELEPHANT, _SHEEP, _SERPENT, _DOG, _CAT, _RAT = range(7)
+_COW, _BUFFALO, _TIGER, _DEER, _MONKEY, _MONGOOSE, _LION = range(7, 14)
+_YONI = np.array([
+    _HORSE, _ELEPHANT, _SHEEP, _SERPENT, _SERPENT, _DOG, _CAT, _SHEEP, _CAT,
+    _RAT, _RAT, _COW, _BUFFALO, _TIGER, _BUFFALO, _TIGER, _DEER, _DEER,
+    _DOG, _MONKEY, _MONGOOSE, _MONKEY, _LION, _HORSE, _LION, _COW, _ELEPHANT,
+])
+_YONI_POINTS = np.array([
+    [4, 2, 2, 3, 2, 2, 2, 1, 0, 1, 3, 3, 2, 1],
+    [2, 4, 3, 3, 2, 2, 2, 2, 3, 1, 2, 3, 2, 0],
+    [2, 3, 4, 2, 1, 2, 1, 3, 3, 1, 2, 0, 3, 1],
+    [3, 3, 2, 4, 2, 1, 1, 1, 1, 2, 2, 2, 0, 2],
+    [2, 2, 1, 2, 4, 2, 1, 2, 2, 1, 0, 2, 1, 1],
+    [2, 2, 2, 1, 2, 4, 0, 2, 2, 1, 3, 3, 2, 1],
+    [2, 2, 1, 1, 1, 0, 4, 2, 2, 2, 2, 2, 1, 2],
+    [1, 2, 3, 1, 2, 2, 2, 4, 3, 0, 3, 2, 2, 1],
+    [0, 3, 3, 1, 2, 2, 2, 3, 4, 1, 2, 2, 2, 1],
+    [1, 1, 1, 2, 1, 1, 2, 0, 1, 4, 1, 1, 2, 1],
+    [3, 2, 2, 2, 0, 3, 2, 3, 2, 1, 4, 2, 2, 1],
+    [3, 3, 0, 2, 2, 3, 2, 2, 2, 1, 2, 4, 3, 2],
+    [2, 2, 3, 0, 1, 2, 1, 2, 2, 2, 2, 3, 4, 2],
+    [1, 0, 1, 2, 1, 1, 2, 1, 1, 1, 1, 2, 2, 4],
+], dtype=np.float64)
+
+_DEVA, _MANUSHYA, _RAKSHASA = range(3)
+_GANA = np.array([
+    _DEVA, _MANUSHYA, _RAKSHASA, _MANUSHYA, _DEVA, _MANUSHYA, _DEVA, _DEVA, _RAKSHASA,
+    _RAKSHASA, _MANUSHYA, _MANUSHYA, _DEVA, _RAKSHASA, _DEVA, _RAKSHASA, _DEVA, _RAKSHASA,
+    _RAKSHASA, _MANUSHYA, _MANUSHYA, _DEVA, _RAKSHASA, _RAKSHASA, _MANUSHYA, _MANUSHYA, _DEVA,
+])
+# Rows: groom's gana, columns: bride's gana.
+_GANA_POINTS = np.array([
+    [6.0, 6.0, 0.0],
+    [5.0, 6.0, 0.0],
+    [1.0, 0.0, 6.0],
+])
+
+# Adi, Madhya, Antya repeat in a zigzag over the nakshatras.
+_NADI = np.array([0, 1, 2, 2, 1, 0] * 5)[:27]
+
+# Taras (1-9 counted from one nakshatra to another) considered inauspicious.
+_BAD_TARAS = (3, 5, 7)
+# Sign distances (counted inclusively) that break bhakoot.
+_BAD_BHAKOOT = (2, 12, 5, 9, 6, 8)
+
+
+def _build_sign_tables() -> np.ndarray:
+    groom = np.arange(12)[:, None]
+    bride = np.arange(12)[None, :]
+    varna = (_VARNA_RANK[groom] >= _VARNA_RANK[bride]).astype(np.float64)
+    vashya = _VASHYA_POINTS[_VASHYA_GROUP[groom], _VASHYA_GROUP[bride]]
+    maitri = np.empty((12, 12))
+    for g in range(12):
+        for b in range(12):
+            lord_g, lord_b = _SIGN_LORD[g], _SIGN_LORD[b]
+            if lord_g == lord_b:
+                maitri[g, b] = 5.0
+            else:
+                pair = tuple(sorted((_RELATION[lord_g, lord_b], _RELATION[lord_b, lord_g])))
+                maitri[g, b] = _MAITRI_POINTS[pair]
+    distance = (groom - bride) % 12 + 1
+    bhakoot = np.where(np.isin(distance, _BAD_BHAKOOT), 0.0, 7.0)
+    return np.stack([varna, vashya, maitri, bhakoot])
+
+
+def _build_nakshatra_tables() -> np.ndarray:
+    groom = np.arange(27)[:, None]
+    bride = np.arange(27)[None, :]
+
+    def good_tara(frm, to):
+        tara = (to - frm) % 27 % 9 + 1
+        return ~np.isin(tara, _BAD_TARAS)
+
+    tara = 1.5 * good_tara(bride, groom) + 1.5 * good_tara(groom, bride)
+    yoni = _YONI_POINTS[_YONI[groom], _YONI[bride]]
+    gana = _GANA_POINTS[_GANA[groom], _GANA[bride]]
+    nadi = np.where(_NADI[groom] == _NADI[bride], 0.0, 8.0)
+    return np.stack([tara, yoni, gana, nadi])
+
+
+# SIGN_TABLES[k, groom_sign, bride_sign] for varna, vashya, graha maitri, bhakoot.
+SIGN_TABLES = _build_sign_tables()
+# NAKSHATRA_TABLES[k, groom_nakshatra, bride_nakshatra] for tara, yoni, gana, nadi.
+NAKSHATRA_TABLES = _build_nakshatra_tables()
+_ORDER = [0, 1, 4, 5, 2, 6, 3, 7]  # stacked (sign, nakshatra) tables -> KOOTAS order
+
+
+def koota_scores(groom_nakshatra, groom_sign, bride_nakshatra, bride_sign) -> np.ndarray:
+    """Return points per koota in :data:`KOOTAS` order, shape ``(..., 8)``.
+
+    Arguments are Moon nakshatra (0–26) and Moon sign (0–11) indices and
+    may be arrays of any broadcastable shape.
+    """
+    sign = SIGN_TABLES[:, groom_sign, bride_sign]
+    nakshatra = NAKSHATRA_TABLES[:, groom_nakshatra, bride_nakshatra]
+    shape = (4,) + np.broadcast_shapes(sign.shape[1:], nakshatra.shape[1:])
+    stacked = np.concatenate([np.broadcast_to(sign, shape), np.broadcast_to(nakshatra, shape)], axis=0)
+    return np.moveaxis(stacked[_ORDER], 0, -1)
+
+
+def score_pair(groom_nakshatra: int, groom_sign: int, bride_nakshatra: int, bride_sign: int) -> Dict[str, float]:
+    """Return ``{koota: points}`` plus ``"total"`` for one couple."""
+    scores = koota_scores(groom_nakshatra, groom_sign, bride_nakshatra, bride_sign)
+    result = {koota: float(points) for koota, points in zip(KOOTAS, scores.tolist())}
+    result["total"] = float(scores.sum())
+    return result
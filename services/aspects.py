@@ -0,0 +1,87 @@
+"""Graha drishti and house lordship for JyotishAI.
+
+Every graha aspects the seventh house from itself; Mars also aspects the
+fourth and eighth, Jupiter the fifth and ninth and Saturn the third and
+tenth.  Rahu and Ketu are given Jupiter's fifth and ninth aspects as well
+as the seventh, the convention most software follows.  Aspects are cast
+on whole signs, so a chart's aspects reduce to integer arithmetic on sign
+indices: the aspect matrix is a lookup of each graha's relative house
+offsets in a 9×12 table, and the lord of each house is a lookup of the
+sign lord table.
+
+All functions take sign indices in :data:`~services.ephemeris.BODIES`
+order with any leading shape, so the same code serves one snapshot
+(shape ``(11,)``) and a whole batch (``ChartArrays.signs``, shape
+``(n, 11)``).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+from services.dignities import SIGN_LORDS
+from services.ephemeris import BODY_INDEX, GRAHAS
+
+# Houses counted from the graha (1 = its own house) that it aspects.
+ASPECT_HOUSES: Dict[str, Tuple[int, ...]] = {
+    "SUN": (7,),
+    "MOON": (7,),
+    "MARS": (4, 7, 8),
+    "MERCURY": (7,),
+    "JUPITER": (5, 7, 9),
+    "VENUS": (7,),
+    "SATURN": (3, 7, 10),
+    "RAHU": (5, 7, 9),
+    "KETU": (5, 7, 9),
+}
+
+# _RELATIVE[g, k]: 1 when graha g aspects the house k places after its own.
+_RELATIVE = np.zeros((len(GRAHAS), 12), dtype=np.uint8)
+for _g, _graha in enumerate(GRAHAS):
+    _RELATIVE[_g, [h - 1 for h in ASPECT_HOUSES[_graha]]] = 1
+_GRAHA_AXIS = np.arange(len(GRAHAS))[:, None]
+_HOUSE_AXIS = np.arange(12)
+_ASC = BODY_INDEX["ASC"]
+
+
+def body_houses(signs: np.ndarray) -> np.ndarray:
+    """Whole-sign house (0 = first) of every body; same shape as ``signs``."""
+    signs = np.asarray(signs, dtype=np.int64)
+    return (signs - signs[..., _ASC, None]) % 12
+
+
+def aspect_matrix(signs: np.ndarray) -> np.ndarray:
+    """Return ``uint8`` aspects of shape ``(..., 9, 12)``.
+
+    Element ``[g, h]`` is 1 when graha ``g`` (:data:`GRAHAS` order)
+    aspects house ``h`` (0 = first house).
+    """
+    houses = body_houses(signs)[..., : len(GRAHAS)]
+    return _RELATIVE[_GRAHA_AXIS, (_HOUSE_AXIS - houses[..., None]) % 12]
+
+
+def graha_aspects(signs: np.ndarray) -> np.ndarray:
+    """Return ``uint8`` aspects of shape ``(..., 9, 9)`` between grahas.
+
+    Element ``[a, b]`` is 1 when graha ``a`` aspects the house occupied by
+    graha ``b``.
+    """
+    houses = body_houses(signs)[..., : len(GRAHAS)]
+    return _RELATIVE[_GRAHA_AXIS, (houses[..., None, :] - houses[..., :, None]) % 12]
+
+
+def house_lords(signs: np.ndarray) -> np.ndarray:
+    """Body index of the lord of each house, shape ``(..., 12)``."""
+    signs = np.asarray(signs, dtype=np.int64)
+    return SIGN_LORDS[(signs[..., _ASC, None] + _HOUSE_AXIS) % 12]
+
+
+def lord_houses(signs: np.ndarray) -> np.ndarray:
+    """House (0 = first) occupied by the lord of each house, shape ``(..., 12)``.
+
+    Together with :func:`house_lords` this is the house-lord graph: an
+    edge from every house to the house its lord occupies.
+    """
+    return np.take_along_axis(body_houses(signs), house_lords(signs), axis=-1)
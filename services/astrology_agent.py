@@ -13,6 +13,7 @@ import json
 from dataclasses import dataclass
 
 from .gender_analysis import GenderAnalysisHelper, Gender, create_gender_aware_analysis
+from .geocoder import require_location, resolve_location
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +24,23 @@ class BirthData:
     date: str  # YYYY-MM-DD format
     time: str  # HH:MM format
     location: str
-    latitude: float
-    longitude: float
-    timezone: str
+    latitude: Optional[float] = None  # resolved from location when omitted
+    longitude: Optional[float] = None
+    timezone: Optional[str] = None
     gender: Optional[str] = None
 
+    def __post_init__(self):
+        if self.latitude is None or self.longitude is None:
+            # Without coordinates there is no chart, so an unknown location is an error.
+            place = require_location(self.location)
+            self.latitude, self.longitude = place.latitude, place.longitude
+            if not self.timezone:
+                self.timezone = place.timezone
+        elif not self.timezone:
+            place = resolve_location(self.location)
+            if place is not None:
+                self.timezone = place.timezone
+
 @dataclass
 class AnalysisRequest:
     """Request structure for astrological analysis."""
@@ -440,9 +453,9 @@ def create_astrology_analysis(
     birth_date: str,
     birth_time: str, 
     location: str,
-    latitude: float,
-    longitude: float,
-    timezone: str,
+    latitude: Optional[float],
+    longitude: Optional[float],
+    timezone: Optional[str],
     modules: List[str],
     gender: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -454,9 +467,9 @@ def create_astrology_analysis(
         birth_date: Birth date in YYYY-MM-DD format
         birth_time: Birth time in HH:MM format
         location: Birth location name
-        latitude: Birth location latitude
-        longitude: Birth location longitude
-        timezone: Timezone string
+        latitude: Birth location latitude (None to geocode ``location``)
+        longitude: Birth location longitude (None to geocode ``location``)
+        timezone: Timezone string (None to use the gazetteer's zone)
         modules: List of analysis modules to include
         gender: Optional gender for gender-aware analysis
         
@@ -0,0 +1,203 @@
+"""Content-addressed chart cache for JyotishAI.
+
+Charts depend only on the birth instant, the coordinates and the
+calculation settings, so identical requests can share one computation.
+This module provides a thread-safe in-process LRU cache with a size
+bound and a time-to-live, plus an optional on-disk tier so that a
+restarted worker starts warm.
+
+The cache is configured through environment variables:
+
+* ``JYOTISHAI_CHART_CACHE_SIZE`` – maximum number of in-memory entries
+  (default 4096, ``0`` disables the cache, disk tier included).
+* ``JYOTISHAI_CHART_CACHE_TTL`` – entry lifetime in seconds (default 86400).
+* ``JYOTISHAI_CHART_CACHE_DIR`` – directory for the on-disk tier (unset
+  disables it).
+* ``JYOTISHAI_STRENGTH_CACHE_SIZE`` – maximum number of in-memory
+  Shadbala/Bhava Bala entries, kept in :data:`strength_cache` so they
+  never evict chart snapshots (default 4096, ``0`` disables it).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def chart_key(
+    utc_instant: datetime,
+    latitude: float,
+    longitude: float,
+    ayanamsa: Optional[str],
+    house_system: str,
+    node: str = "MEAN",
+) -> str:
+    """Return the canonical hash identifying a chart computation.
+
+    The instant is normalised to UTC with second precision and the
+    coordinates are rounded to four decimals (about 11 m), so that
+    equivalent inputs spelled differently map to the same key.
+    """
+    instant = utc_instant.astimezone(timezone.utc).replace(microsecond=0)
+    canonical = "|".join(
+        [
+            instant.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            f"{latitude:.4f}",
+            f"{longitude:.4f}",
+            (ayanamsa or "TROPICAL").upper(),
+            house_system.upper(),
+            node.upper(),
+        ]
+    )
+    return hashlib.sha256(canonical.encode("ascii")).hexdigest()
+
+
+class ChartCache:
+    """LRU cache with TTL, an optional disk tier and hit/miss counters."""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 86400.0, directory: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # A disabled cache keeps no tier at all.
+        self.directory = directory if maxsize > 0 else None
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, Any]]:
+        if not self.directory:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_at, value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        if time.time() - stored_at > self.ttl:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return stored_at, value
+
+    def _disk_put(self, key: str, stored_at: float, value: Any) -> None:
+        if not self.directory:
+            return
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so concurrent workers never read
+        # a partially written entry.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((stored_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+        entry = self._disk_get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, entry[0], entry[1])
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key`` in memory and on disk."""
+        stored_at = time.time()
+        with self._lock:
+            self._store(key, stored_at, value)
+        self._disk_put(key, stored_at, value)
+
+    def _store(self, key: str, stored_at: float, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (the disk tier is left untouched)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters suitable for monitoring endpoints."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "disk_tier": bool(self.directory),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+chart_cache = ChartCache(
+    maxsize=int(os.getenv("JYOTISHAI_CHART_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("JYOTISHAI_CHART_CACHE_TTL", "86400")),
+    directory=os.getenv("JYOTISHAI_CHART_CACHE_DIR") or None,
+)
+
+strength_cache = ChartCache(
+    maxsize=int(os.getenv("JYOTISHAI_STRENGTH_CACHE_SIZE", "4096")),
+    ttl=chart_cache.ttl,
+    directory=os.getenv("JYOTISHAI_CHART_CACHE_DIR") or None,
+)
@@ -1,41 +1,390 @@
-from flatlib.chart import Chart
-from flatlib.datetime import Datetime
-from flatlib.geopos import GeoPos
-from flatlib.const import SUN, MOON, MERCURY, VENUS, MARS, JUPITER, SATURN, ASC
+import importlib
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from types import ModuleType
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+import numpy as np
+
 from models.schemas import ChartRequest
+from services.chart_cache import chart_cache, chart_key, strength_cache
+from services.chart_executor import chart_executor, compute_snapshot
+from services.ephemeris import (
+    BODIES,
+    DEFAULT_AYANAMSA,
+    DEFAULT_HOUSE_SYSTEM,
+    DEFAULT_NODE,
+    SIGNS,
+)
+from services.chart_snapshot import ChartSnapshot
+from services.singleflight import chart_flights
+
+if TYPE_CHECKING:
+    from services.dasha import DashaTimeline
+
+logger = logging.getLogger(__name__)
+
+# Services behind the chart properties are imported on first use; these
+# record what each import cost (see ``/metrics/modules``).
+_services: Dict[str, ModuleType] = {}
+_service_import_ms: Dict[str, float] = {}
+_services_lock = threading.Lock()
+
+
+def _service(name: str) -> ModuleType:
+    """Return ``services.<name>``, importing it on first use."""
+    module = _services.get(name)
+    if module is not None:
+        return module
+    with _services_lock:
+        module = _services.get(name)
+        if module is None:
+            started = time.perf_counter()
+            module = importlib.import_module(f"services.{name}")
+            _service_import_ms[name] = round((time.perf_counter() - started) * 1000.0, 2)
+            _services[name] = module
+    return module
+
+
+def service_import_stats() -> Dict[str, float]:
+    """Milliseconds spent importing each lazily loaded chart service so far."""
+    return dict(_service_import_ms)
+
+# Karachi, the default place of an engine constructed without coordinates
+DEFAULT_LATITUDE = 24.8607
+DEFAULT_LONGITUDE = 67.0011
+
+# ``chart.moon_sign``, ``chart.mc_sign`` ... -> body name in the snapshot
+SIGN_ATTRIBUTES = {f"{body.lower()}_sign": body for body in BODIES}
+
+
+def parse_birth_moment(birth_date: str, birth_time: str, utc_offset: float) -> datetime:
+    """Return the birth moment as an aware UTC datetime.
+
+    Accepts ISO (``YYYY-MM-DD``) or flatlib style (``YYYY/MM/DD``) dates
+    and ``HH:MM`` or ``HH:MM:SS`` times.
+    """
+    year, month, day = (int(v) for v in birth_date.replace('/', '-').split('-'))
+    parts = [int(v) for v in birth_time.split(':')]
+    hour, minute = parts[0], parts[1]
+    second = parts[2] if len(parts) > 2 else 0
+    local = datetime(year, month, day, hour, minute, second,
+                     tzinfo=timezone(timedelta(hours=float(utc_offset))))
+    return local.astimezone(timezone.utc)
 
-RAHU = 'RAHU'
-KETU = 'KETU'
 
 class VedicAstrologyEngine:
+    """Birth chart whose positions are computed on first use.
 
-    def __init__(self, name, birth_date, birth_time, location, utc_offset):
+    All bodies come from one shared ephemeris pass (cached by
+    :data:`chart_cache`), which only runs when a module first touches the
+    chart.  Per-body sign attributes such as ``moon_sign``, ``rahu_sign``
+    or ``mc_sign`` are resolved from the snapshot on access and memoised.
+    """
+
+    def __init__(self, name, birth_date, birth_time, location, utc_offset,
+                 latitude=DEFAULT_LATITUDE, longitude=DEFAULT_LONGITUDE,
+                 ayanamsa=DEFAULT_AYANAMSA, house_system=DEFAULT_HOUSE_SYSTEM,
+                 node=DEFAULT_NODE):
         self.name = name
         self.birth_date = birth_date
         self.birth_time = birth_time
         self.location = location
         self.utc_offset = utc_offset
-        self.asc_sign = None
-        self.placements = {}
-        self.chart = None
+        self.latitude = latitude
+        self.longitude = longitude
+        self.ayanamsa = ayanamsa
+        self.house_system = house_system
+        self.node = node
+        self._snapshot = None
+        self._vargas = None
+        self._dasha = None
+        self._ashtakavarga = None
+        self._aspects = None
+        self._house_lords = None
+        self._lord_houses = None
+        self._strengths = None
 
     @classmethod
     def from_request(cls, request: ChartRequest) -> "VedicAstrologyEngine":
+        """Build the engine for a request.
+
+        Raises:
+            UnknownLocation: ``request.location`` is not in the gazetteer;
+                guessing a place would silently produce a wrong chart.
+        """
+        place = _service("geocoder").require_location(request.location)
+        utc_offset = request.utc_offset
+        if utc_offset is None:
+            # An explicit offset overrides the historical time zone lookup.
+            utc_offset = _service("timezones").resolve_utc_offset(
+                place.timezone, request.birth_date, request.birth_time
+            )
         engine = cls(
             name=request.name,
             birth_date=request.birth_date,
             birth_time=request.birth_time,
             location=request.location,
-            utc_offset=request.utc_offset,
+            utc_offset=utc_offset,
+            latitude=place.latitude,
+            longitude=place.longitude,
+            node=request.node,
         )
-        engine.compute_chart()  # 🧠 auto compute chart here
         return engine
 
+    @classmethod
+    async def from_request_async(cls, request: ChartRequest) -> "VedicAstrologyEngine":
+        """Like :meth:`from_request`, with the chart computed by :data:`chart_executor`."""
+        engine = cls.from_request(request)
+        await engine.compute_chart_async()
+        return engine
+
+    def __getattr__(self, name):
+        # Only reached for attributes not set on the instance.
+        body = SIGN_ATTRIBUTES.get(name)
+        if body is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        sign = self.snapshot.sign(body)
+        setattr(self, name, sign)
+        return sign
+
+    @property
+    def birth_moment(self) -> datetime:
+        """Birth instant in UTC."""
+        return parse_birth_moment(self.birth_date, self.birth_time, self.utc_offset)
+
+    @property
+    def birth_datetime(self) -> datetime:
+        """Birth date and time in the local offset it was given in."""
+        return self.birth_moment.astimezone(timezone(timedelta(hours=float(self.utc_offset))))
+
+    @property
+    def cache_key(self) -> str:
+        """Canonical hash of the inputs that determine this chart."""
+        return chart_key(
+            self.birth_moment,
+            self.latitude,
+            self.longitude,
+            self.ayanamsa,
+            self.house_system,
+            self.node,
+        )
+
+    @property
+    def snapshot(self) -> ChartSnapshot:
+        if self._snapshot is None:
+            self.compute_chart()
+        return self._snapshot
+
+    @property
+    def placements(self):
+        return self.snapshot.placements()
+
+    @property
+    def vargas(self):
+        """Sign index per body (rows, :data:`BODIES` order) and varga (columns)."""
+        if self._vargas is None:
+            self._vargas = _service("vargas").varga_signs(self.snapshot.longitudes)
+        return self._vargas
+
+    def varga(self, name: str):
+        """Return ``{body: sign name}`` in divisional chart ``name`` (e.g. ``"D9"``)."""
+        column = self.vargas[:, _service("vargas").VARGA_INDEX[name.upper()]]
+        return {body: SIGNS[s] for body, s in zip(BODIES, column.tolist())}
+
+    @property
+    def dasha(self) -> "DashaTimeline":
+        """Vimshottari timeline, built once per chart and shared via the chart cache."""
+        if self._dasha is None:
+            self._dasha = chart_cache.get_or_compute(
+                self.cache_key + ":vimshottari",
+                lambda: _service("dasha").build_timeline(self.snapshot.jd, self.snapshot.longitude_of("MOON")),
+            )
+        return self._dasha
+
+    @property
+    def ashtakavarga(self):
+        """Bhinnashtakavarga bindus, shape ``(7, 12)``: planets by sign (0 = Aries)."""
+        if self._ashtakavarga is None:
+            ashtakavarga = _service("ashtakavarga")
+            self._ashtakavarga = ashtakavarga.bhinnashtakavarga(
+                [self.snapshot.sign_index(c) for c in ashtakavarga.CONTRIBUTORS]
+            )
+        return self._ashtakavarga
+
+    @property
+    def sarvashtakavarga(self):
+        """Sarvashtakavarga bindus per house, index 0 = first house."""
+        ashtakavarga = _service("ashtakavarga")
+        return ashtakavarga.by_house(ashtakavarga.sarvashtakavarga(self.ashtakavarga), self.snapshot.sign_index("ASC"))
+
+    @property
+    def aspects(self):
+        """Graha drishti, shape ``(9, 12)``: 1 where a graha aspects a house (0 = first)."""
+        if self._aspects is None:
+            self._aspects = _service("aspects").aspect_matrix(self._signs)
+        return self._aspects
+
+    @property
+    def house_lords(self):
+        """Body index of the lord of each house (0 = first), shape ``(12,)``."""
+        if self._house_lords is None:
+            self._house_lords = _service("aspects").house_lords(self._signs)
+        return self._house_lords
+
+    @property
+    def lord_houses(self):
+        """House occupied by the lord of each house, shape ``(12,)``."""
+        if self._lord_houses is None:
+            self._lord_houses = _service("aspects").lord_houses(self._signs)
+        return self._lord_houses
+
+    @property
+    def _signs(self):
+        return np.frombuffer(self.snapshot.signs, dtype=np.uint8)
+
+    @property
+    def strengths(self):
+        """``(shadbala, bhava_bala)``, computed once per chart and shared via :data:`strength_cache`.
+
+        The arrays are read-only, since every chart with the same key shares them.
+        """
+        if self._strengths is None:
+            self._strengths = _read_only(
+                strength_cache.get_or_compute(self.cache_key + ":shadbala", self._compute_strengths)
+            )
+        return self._strengths
+
+    @property
+    def shadbala(self):
+        """Shadbala in virupas, shape ``(6, 7)``: components by planet.
+
+        See :data:`services.shadbala.COMPONENTS` and
+        :data:`services.shadbala.PLANETS` for the order.
+        """
+        return self.strengths[0]
+
+    @property
+    def bhava_bala(self):
+        """Bhava Bala in virupas, shape ``(3, 12)``: components by house (0 = first)."""
+        return self.strengths[1]
+
+    def _compute_strengths(self):
+        snapshot = self.snapshot
+        shadbala = _service("shadbala")
+        balas = shadbala.shadbala(
+            snapshot.longitudes,
+            snapshot.speeds,
+            snapshot.jd,
+            snapshot.latitude,
+            snapshot.longitude,
+            snapshot.ayanamsa,
+        )
+        return balas, shadbala.bhava_bala(snapshot.longitudes, balas)
+
+    @property
+    def yogas(self) -> List[str]:
+        """Names of the :data:`~services.yogas.YOGA_RULES` yogas present in this chart."""
+        return _service("yogas").yoga_engine.detect(self.snapshot.signs)
+
     def compute_chart(self):
-        dt = Datetime(self.birth_date, self.birth_time, self.utc_offset)
-        pos = GeoPos('24.8607', '67.0011')  # Karachi (make dynamic later)
-        self.chart = Chart(dt, pos)
+        self._snapshot = chart_cache.get_or_compute(self.cache_key, self._build_snapshot)
+
+    async def compute_chart_async(self):
+        """Fill the snapshot from the cache or a chart worker process."""
+        if self._snapshot is not None:
+            return
+        key = self.cache_key
+        snapshot = chart_cache.get(key)
+        if snapshot is None:
+            # Concurrent requests for the same chart share one computation.
+            snapshot = await chart_flights.do(key, self._compute_and_cache)
+        self._snapshot = snapshot
+
+    async def _compute_and_cache(self) -> ChartSnapshot:
+        snapshot = await chart_executor.compute(*self._chart_args())
+        chart_cache.put(self.cache_key, snapshot)
+        return snapshot
+
+    def _chart_args(self):
+        return (self.birth_moment, self.latitude, self.longitude, self.ayanamsa, self.house_system, self.node)
+
+    def _build_snapshot(self) -> ChartSnapshot:
+        return compute_snapshot(*self._chart_args())
+
+
+async def prepare_charts(engines: Sequence[VedicAstrologyEngine]) -> None:
+    """Fill the snapshots of many engines with as few computations as possible.
 
-        planets = [SUN, MOON, MERCURY, VENUS, MARS, JUPITER, SATURN, ASC]
-        self.placements = {obj: self.chart.get(obj).sign for obj in planets if self.chart.get(obj)}
-        self.asc_sign = self.placements.get(ASC)
+    Engines with the same birth moment, place and settings share one
+    chart; charts not in :data:`chart_cache` are computed in one batch
+    per calculation setting by :data:`chart_executor`.
+    """
+    by_key: Dict[str, List[VedicAstrologyEngine]] = defaultdict(list)
+    for engine in engines:
+        if engine._snapshot is None:
+            by_key[engine.cache_key].append(engine)
+    missing: Dict[tuple, List[str]] = defaultdict(list)
+    for key, group in by_key.items():
+        snapshot = chart_cache.get(key)
+        if snapshot is None:
+            first = group[0]
+            missing[(first.ayanamsa, first.house_system, first.node)].append(key)
+        else:
+            for engine in group:
+                engine._snapshot = snapshot
+    for (ayanamsa, house_system, node), keys in missing.items():
+        births = [by_key[key][0]._chart_args()[:3] for key in keys]
+        snapshots = await chart_executor.compute_many(births, ayanamsa, house_system, node)
+        for key, snapshot in zip(keys, snapshots):
+            chart_cache.put(key, snapshot)
+            for engine in by_key[key]:
+                engine._snapshot = snapshot
+
+
+def _read_only(arrays):
+    """Mark cached arrays read-only (again, after a round trip through the disk tier)."""
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+def prepare_strengths(engines: Sequence[VedicAstrologyEngine]) -> None:
+    """Fill Shadbala and Bhava Bala for many charted engines in one vectorised pass.
+
+    Engines must already have snapshots (see :func:`prepare_charts`).
+    Results go into :data:`strength_cache` like :attr:`VedicAstrologyEngine.strengths`.
+    """
+    by_key: Dict[str, List[VedicAstrologyEngine]] = defaultdict(list)
+    for engine in engines:
+        if engine._strengths is None:
+            by_key[engine.cache_key + ":shadbala"].append(engine)
+    missing: Dict[str, List[str]] = defaultdict(list)
+    for key, group in by_key.items():
+        strengths = strength_cache.get(key)
+        if strengths is None:
+            missing[group[0].snapshot.ayanamsa].append(key)
+        else:
+            for engine in group:
+                engine._strengths = _read_only(strengths)
+    shadbala = _service("shadbala") if missing else None
+    for ayanamsa, keys in missing.items():
+        snapshots = [by_key[key][0].snapshot for key in keys]
+        longitudes = np.array([s.longitudes for s in snapshots])
+        balas = shadbala.shadbala(
+            longitudes,
+            np.array([s.speeds for s in snapshots]),
+            np.array([s.jd for s in snapshots]),
+            np.array([s.latitude for s in snapshots]),
+            np.array([s.longitude for s in snapshots]),
+            ayanamsa,
+        )
+        bhavas = shadbala.bhava_bala(longitudes, balas)
+        for key, balas_row, bhava_row in zip(keys, balas, bhavas):
+            strengths = _read_only((balas_row.copy(), bhava_row.copy()))
+            strength_cache.put(key, strengths)
+            for engine in by_key[key]:
+                engine._strengths = strengths
@@ -0,0 +1,222 @@
+"""Process-pool chart executor for JyotishAI.
+
+pyswisseph keeps global state (ephemeris path, sidereal mode) and holds
+the GIL while it calculates, so charts computed in FastAPI's threadpool
+neither use more than one core nor stay isolated when calculation
+settings differ between requests.  :class:`ChartExecutor` runs chart
+computations in worker processes instead.  Each worker is initialised
+once – ephemeris path set, the Chebyshev file mapped and a throwaway
+chart computed – so real requests never pay start-up costs, and only the
+compact :class:`~services.chart_snapshot.ChartSnapshot` travels back.
+
+At most ``max_pending`` computations are queued or running at a time;
+further callers wait for a slot and get :class:`ChartExecutorBusy` when
+none frees up within ``queue_timeout`` seconds.
+
+The executor is configured through environment variables:
+
+* ``JYOTISHAI_CHART_WORKERS`` – worker processes per API process
+  (default 2; ``0`` computes charts in the default thread executor
+  instead).  Every uvicorn worker starts its own pool, so size it as
+  roughly ``CPUs / uvicorn workers``: with 8 CPUs and 4 uvicorn workers,
+  2 chart workers each keep all cores busy without oversubscribing them.
+* ``JYOTISHAI_CHART_MAX_PENDING`` – queued plus running computations
+  (default: four per worker).
+* ``JYOTISHAI_CHART_QUEUE_TIMEOUT`` – seconds to wait for a slot
+  (default 10).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from weakref import WeakKeyDictionary
+
+from services.chart_snapshot import ChartSnapshot
+from services.ephemeris import (
+    DEFAULT_AYANAMSA,
+    DEFAULT_HOUSE_SYSTEM,
+    DEFAULT_NODE,
+    Birth,
+    compute_charts,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ChartExecutorBusy(RuntimeError):
+    """Raised when no computation slot frees up within the queue timeout."""
+
+
+def compute_snapshot(
+    utc: datetime,
+    latitude: float,
+    longitude: float,
+    ayanamsa: str = DEFAULT_AYANAMSA,
+    house_system: str = DEFAULT_HOUSE_SYSTEM,
+    node: str = DEFAULT_NODE,
+) -> ChartSnapshot:
+    """Compute one chart and keep only its snapshot."""
+    arrays = compute_charts(
+        [Birth(utc, latitude, longitude)],
+        ayanamsa=ayanamsa,
+        house_system=house_system,
+        node=node,
+    )
+    # Only the snapshot is retained; the batch arrays are released here.
+    return ChartSnapshot.from_arrays(arrays, 0)
+
+
+def compute_snapshots(
+    births: Sequence[Tuple[datetime, float, float]],
+    ayanamsa: str = DEFAULT_AYANAMSA,
+    house_system: str = DEFAULT_HOUSE_SYSTEM,
+    node: str = DEFAULT_NODE,
+) -> List[ChartSnapshot]:
+    """Compute many charts in one batch ephemeris pass."""
+    arrays = compute_charts(
+        [Birth(utc, latitude, longitude) for utc, latitude, longitude in births],
+        ayanamsa=ayanamsa,
+        house_system=house_system,
+        node=node,
+    )
+    return [ChartSnapshot.from_arrays(arrays, i) for i in range(len(births))]
+
+
+def _init_worker() -> None:
+    # Importing services.ephemeris has set the ephemeris path; map the
+    # Chebyshev file and touch the Swiss Ephemeris data once.
+    from services.chebyshev_ephemeris import get_chebyshev_ephemeris
+
+    get_chebyshev_ephemeris()
+    compute_snapshot(datetime(2000, 1, 1, tzinfo=timezone.utc), 0.0, 0.0)
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+class ChartExecutor:
+    """Bounded, asyncio-friendly front end to a chart process pool."""
+
+    def __init__(self, workers: int, max_pending: int, queue_timeout: float = 10.0):
+        self.workers = workers
+        self.max_pending = max(max_pending, 1)
+        self.queue_timeout = queue_timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # asyncio primitives belong to one event loop; uvicorn runs one per process.
+        self._gates: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = WeakKeyDictionary()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            return self._pool
+
+    def start(self) -> None:
+        """Start and warm every worker; call once at application start-up."""
+        if self.workers <= 0:
+            return
+        pool = self._get_pool()
+        pids = {f.result() for f in [pool.submit(_ready) for _ in range(self.workers)]}
+        logger.info("Chart executor ready with %d worker processes", len(pids))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _gate(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        gate = self._gates.get(loop)
+        if gate is None:
+            gate = self._gates[loop] = asyncio.Semaphore(self.max_pending)
+        return gate
+
+    async def compute(
+        self,
+        utc: datetime,
+        latitude: float,
+        longitude: float,
+        ayanamsa: str = DEFAULT_AYANAMSA,
+        house_system: str = DEFAULT_HOUSE_SYSTEM,
+        node: str = DEFAULT_NODE,
+    ) -> ChartSnapshot:
+        """Compute a chart snapshot without blocking the event loop."""
+        return await self._run(
+            functools.partial(compute_snapshot, utc, latitude, longitude, ayanamsa, house_system, node)
+        )
+
+    async def compute_many(
+        self,
+        births: Sequence[Tuple[datetime, float, float]],
+        ayanamsa: str = DEFAULT_AYANAMSA,
+        house_system: str = DEFAULT_HOUSE_SYSTEM,
+        node: str = DEFAULT_NODE,
+    ) -> List[ChartSnapshot]:
+        """Compute ``(utc, latitude, longitude)`` births as one batch, in one slot."""
+        return await self._run(
+            functools.partial(compute_snapshots, list(births), ayanamsa, house_system, node)
+        )
+
+    async def _run(self, call):
+        gate = self._gate()
+        if gate.locked():
+            try:
+                await asyncio.wait_for(gate.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise ChartExecutorBusy(f"{self.max_pending} chart computations already pending") from None
+        else:
+            await gate.acquire()
+        self.in_flight += 1
+        try:
+            if self.workers <= 0:
+                result = await asyncio.get_running_loop().run_in_executor(None, call)
+            else:
+                result = await asyncio.wrap_future(self._get_pool().submit(call))
+            self.completed += 1
+            return result
+        except BrokenProcessPool:
+            # A worker died; replace the pool so later requests recover.
+            self.failed += 1
+            logger.exception("Chart worker pool broke; restarting it")
+            with self._lock:
+                self._pool = None
+            raise
+        finally:
+            self.in_flight -= 1
+            gate.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters suitable for monitoring endpoints."""
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+        }
+
+
+_WORKERS = int(os.getenv("JYOTISHAI_CHART_WORKERS", "2"))
+
+chart_executor = ChartExecutor(
+    workers=_WORKERS,
+    max_pending=int(os.getenv("JYOTISHAI_CHART_MAX_PENDING", str(4 * max(_WORKERS, 1)))),
+    queue_timeout=float(os.getenv("JYOTISHAI_CHART_QUEUE_TIMEOUT", "10")),
+)
@@ -0,0 +1,121 @@
+"""Feature-keyed memoisation of analysis text for JyotishAI.
+
+Most analyzers depend on only one or two placements – the rising sign,
+Saturn's sign, Venus in the Navamsa – yet build their text from scratch
+on every request.  :func:`reads` declares the chart features an analyzer
+uses and memoises its output on their values, so each combination is
+rendered once and later charts sharing it get the same string back.
+
+A feature is either an engine attribute such as ``"asc_sign"`` or a
+divisional placement written ``"D9.VENUS"``.  The declared features must
+cover everything the analyzer reads; anything else would be frozen into
+the first rendering.
+"""
+
+from __future__ import annotations
+
+import functools
+import operator
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from services.ephemeris import BODY_INDEX
+from services.vargas import VARGA_INDEX
+
+# Rendered texts kept per analyzer; beyond this the least recently used
+# combination is evicted.
+MEMO_SIZE = 4096
+
+
+def feature_getter(feature: str) -> Callable[[Any], Any]:
+    """Return a function reading ``feature`` from a chart engine."""
+    if "." in feature:
+        varga, body = feature.upper().split(".", 1)
+        row, column = BODY_INDEX[body], VARGA_INDEX[varga]
+        return lambda chart: int(chart.vargas[row, column])
+    return operator.attrgetter(feature)
+
+
+def features_key(features: Tuple[str, ...]) -> Callable[[Any], Any]:
+    """Return a function projecting a chart engine onto ``features``."""
+    if all("." not in f for f in features):
+        # attrgetter builds the tuple in C; one feature gives a bare value.
+        return operator.attrgetter(*features)
+    getters = tuple(feature_getter(f) for f in features)
+    return lambda chart: tuple(get(chart) for get in getters)
+
+
+class FeatureMemo:
+    """Texts of one analyzer keyed by the values of its features, in LRU order."""
+
+    def __init__(self, features: Tuple[str, ...], maxsize: int = MEMO_SIZE):
+        self.features = features
+        self.maxsize = maxsize
+        self.key = features_key(features)
+        self.texts: "OrderedDict[Any, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Any) -> Any:
+        """Return the text memoised for ``key``, or ``None``."""
+        with self._lock:
+            text = self.texts.get(key)
+            if text is not None:
+                self.texts.move_to_end(key)
+                self.hits += 1
+            return text
+
+    def render(self, key: Any, chart, analyze: Callable[[Any], str]) -> str:
+        text = analyze(chart)
+        with self._lock:
+            self.misses += 1
+            if self.maxsize <= 0:
+                return text
+            text = self.texts.setdefault(key, text)
+            self.texts.move_to_end(key)
+            while len(self.texts) > self.maxsize:
+                self.texts.popitem(last=False)
+                self.evictions += 1
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "features": list(self.features),
+                "size": len(self.texts),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def reads(*features: str):
+    """Declare the chart features an analyzer reads and memoise it on them.
+
+    The wrapped analyzer keeps its signature and exposes its
+    :class:`FeatureMemo` as ``memo``.
+    """
+
+    def decorate(analyze: Callable[[Any], str]) -> Callable[[Any], str]:
+        memo = FeatureMemo(features)
+        key_of, lookup = memo.key, memo.get
+
+        @functools.wraps(analyze)
+        def analyzer(chart) -> str:
+            # The hit path is a projection and one locked dict lookup.
+            key = key_of(chart)
+            text = lookup(key)
+            if text is None:
+                text = memo.render(key, chart, analyze)
+            return text
+
+        analyzer.memo = memo
+        return analyzer
+
+    return decorate
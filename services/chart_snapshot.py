@@ -0,0 +1,165 @@
+"""Compact numeric chart snapshot for JyotishAI.
+
+A :class:`ChartSnapshot` holds everything the analyzers need from one
+computed chart: sidereal longitudes and speeds, integer sign and house
+indices and retrograde flags.  It is built from one row of
+:class:`~services.ephemeris.ChartArrays` so the batch arrays can be
+released straight after extraction.  Snapshots use ``__slots__`` and
+flat ``bytes`` storage, which keeps them small in memory and cheap to
+cache, pickle and send between processes.  They are immutable, since the
+chart cache hands the same snapshot to every chart with the same key.
+"""
+
+from __future__ import annotations
+
+import struct
+from array import array
+from typing import Dict, Sequence, Tuple
+
+from services.ephemeris import BODIES, BODY_INDEX, NAKSHATRA_SPAN, SIGNS, ChartArrays
+
+_ASC = BODY_INDEX["ASC"]
+_DOUBLE = struct.Struct("d")
+
+
+class ChartSnapshot:
+    """Numeric, picklable view of a single chart.
+
+    Attributes:
+        jd: Julian day (UT) of the birth.
+        latitude: Geographic latitude of the birth place.
+        longitude: Geographic longitude of the birth place.
+        longitudes: Sidereal longitude per body in :data:`BODIES` order, as
+            a read-only ``memoryview`` of doubles.
+        speeds: Daily motion per body in :data:`BODIES` order, likewise.
+        signs: Sign index (0 = Aries) per body.
+        houses: Whole-sign house index (0 = first house) per body.
+        retrograde: Bitmask with bit ``i`` set when body ``i`` is retrograde.
+    """
+
+    __slots__ = (
+        "jd",
+        "latitude",
+        "longitude",
+        "_longitudes",
+        "_speeds",
+        "signs",
+        "houses",
+        "retrograde",
+        "ayanamsa",
+        "house_system",
+        "node",
+    )
+
+    def __init__(
+        self,
+        jd: float,
+        latitude: float,
+        longitude: float,
+        longitudes: Sequence[float],
+        speeds: Sequence[float],
+        signs: bytes,
+        houses: bytes,
+        retrograde: int,
+        ayanamsa: str,
+        house_system: str,
+        node: str,
+    ):
+        self.__setstate__(
+            (
+                jd,
+                latitude,
+                longitude,
+                array("d", longitudes),
+                array("d", speeds),
+                bytes(signs),
+                bytes(houses),
+                retrograde,
+                ayanamsa,
+                house_system,
+                node,
+            )
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays: ChartArrays, index: int) -> "ChartSnapshot":
+        """Copy row ``index`` of ``arrays`` into a standalone snapshot."""
+        signs = bytes(int(s) for s in arrays.signs[index])
+        asc = signs[_ASC]
+        speeds = arrays.speeds[index].tolist()
+        retrograde = 0
+        for i, speed in enumerate(speeds):
+            if speed < 0:
+                retrograde |= 1 << i
+        return cls(
+            jd=float(arrays.jd[index]),
+            latitude=float(arrays.latitudes[index]),
+            longitude=float(arrays.longitudes_geo[index]),
+            longitudes=arrays.longitudes[index].tolist(),
+            speeds=speeds,
+            signs=signs,
+            houses=bytes((s - asc) % 12 for s in signs),
+            retrograde=retrograde,
+            ayanamsa=arrays.ayanamsa,
+            house_system=arrays.house_system,
+            node=arrays.node,
+        )
+
+    def __getstate__(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple) -> None:
+        for name, value in zip(self.__slots__, state):
+            # bytes() also accepts the array("d") values of older pickles.
+            object.__setattr__(self, name, bytes(value) if name in ("_longitudes", "_speeds") else value)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("ChartSnapshot is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("ChartSnapshot is immutable")
+
+    @property
+    def longitudes(self) -> memoryview:
+        return memoryview(self._longitudes).cast("d")
+
+    @property
+    def speeds(self) -> memoryview:
+        return memoryview(self._speeds).cast("d")
+
+    def __repr__(self) -> str:
+        return f"ChartSnapshot(jd={self.jd!r}, asc={self.sign('ASC')})"
+
+    # ------------------------------------------------------------------
+    # Accessors
+    # ------------------------------------------------------------------
+    def sign_index(self, body: str) -> int:
+        """Return the sign index (0 = Aries) occupied by ``body``."""
+        return self.signs[BODY_INDEX[body]]
+
+    def sign(self, body: str) -> str:
+        """Return the upper-case sign name occupied by ``body``."""
+        return SIGNS[self.signs[BODY_INDEX[body]]]
+
+    def nakshatra_index(self, body: str) -> int:
+        """Return the nakshatra index (0 = Ashwini) occupied by ``body``."""
+        return int(self.longitude_of(body) // NAKSHATRA_SPAN) % 27
+
+    def house(self, body: str) -> int:
+        """Return the whole-sign house (1–12) occupied by ``body``."""
+        return self.houses[BODY_INDEX[body]] + 1
+
+    def longitude_of(self, body: str) -> float:
+        """Return the sidereal longitude of ``body`` in degrees."""
+        return _DOUBLE.unpack_from(self._longitudes, 8 * BODY_INDEX[body])[0]
+
+    def speed_of(self, body: str) -> float:
+        """Return the daily motion of ``body`` in degrees."""
+        return _DOUBLE.unpack_from(self._speeds, 8 * BODY_INDEX[body])[0]
+
+    def is_retrograde(self, body: str) -> bool:
+        return bool(self.retrograde >> BODY_INDEX[body] & 1)
+
+    def placements(self) -> Dict[str, str]:
+        """Return ``{body: sign name}`` for every body."""
+        return {body: SIGNS[s] for body, s in zip(BODIES, self.signs)}
@@ -0,0 +1,335 @@
+"""Chebyshev-compressed ephemeris for JyotishAI.
+
+Sidereal positions between 1800 and 2200 are fitted once from
+pyswisseph as piecewise Chebyshev series and written to a binary file
+(``data/chebyshev.eph`` by default, ``JYOTISHAI_CHEBYSHEV_EPHEMERIS``
+overrides it).  The file is memory-mapped and evaluated with NumPy, so
+single and batch chart computation no longer touch the Swiss Ephemeris C
+library or its global state.
+
+Besides the seven planets and both lunar nodes the file stores three
+auxiliary series used to derive the ascendant and midheaven
+analytically: the true (nutated) ayanamsa, the true obliquity of the
+ecliptic and the residual of apparent sidereal time over a GMST
+polynomial.
+
+Build and verify the file with::
+
+    python -m services.chebyshev_ephemeris build
+    python -m services.chebyshev_ephemeris check --samples 5000
+
+``build`` records the maximum error measured against pyswisseph on random
+dates for every series in the file header; :attr:`ChebyshevEphemeris.error_bounds`
+exposes it in arc-seconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import tempfile
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from services.ephemeris import BODIES, BODY_INDEX, GRAHAS, ChartArrays, swe_lock
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+DEFAULT_PATH = os.getenv("JYOTISHAI_CHEBYSHEV_EPHEMERIS", os.path.join(_DATA_DIR, "chebyshev.eph"))
+
+START_JD = 2378496.5  # 1800-01-01
+END_JD = 2524593.5  # 2200-01-01
+AYANAMSA = "LAHIRI"
+
+_MAGIC = b"JYCHEB01"
+_PREFIX = struct.Struct("<8sI")
+
+# (segment length in days, number of coefficients, angular?) per series.
+SERIES: Dict[str, Tuple[float, int, bool]] = {
+    "SUN": (16.0, 12, True),
+    "MOON": (4.0, 14, True),
+    "MERCURY": (8.0, 13, True),
+    "VENUS": (16.0, 14, True),
+    "MARS": (16.0, 12, True),
+    "JUPITER": (32.0, 13, True),
+    "SATURN": (32.0, 13, True),
+    "MEAN_NODE": (64.0, 8, True),
+    "TRUE_NODE": (4.0, 13, True),
+    "AYANAMSA": (16.0, 13, False),
+    "OBLIQUITY": (16.0, 13, False),
+    "SIDTIME": (16.0, 13, False),
+}
+_NODE_SERIES = {"MEAN": "MEAN_NODE", "TRUE": "TRUE_NODE"}
+
+
+def gmst_degrees(jd: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal time in degrees (IAU 1982 polynomial)."""
+    d = jd - 2451545.0
+    t = d / 36525.0
+    return 280.46061837 + 360.98564736629 * d + 0.000387933 * t * t - t * t * t / 38710000.0
+
+
+# ----------------------------------------------------------------------
+# Fitting
+# ----------------------------------------------------------------------
+def _sampler(name: str) -> Callable[[float], float]:
+    """Return a pyswisseph-backed function producing series ``name``."""
+    import swisseph as swe
+
+    from services.ephemeris import sidereal_flags
+
+    flags = sidereal_flags(AYANAMSA)
+    ids = {
+        "SUN": swe.SUN, "MOON": swe.MOON, "MERCURY": swe.MERCURY, "VENUS": swe.VENUS,
+        "MARS": swe.MARS, "JUPITER": swe.JUPITER, "SATURN": swe.SATURN,
+        "MEAN_NODE": swe.MEAN_NODE, "TRUE_NODE": swe.TRUE_NODE,
+    }
+    if name in ids:
+        body = ids[name]
+        return lambda jd: swe.calc_ut(jd, body, flags)[0][0]
+    if name == "AYANAMSA":
+        # pyswisseph applies the ayanamsa plus nutation in longitude.
+        return lambda jd: swe.get_ayanamsa_ut(jd) + swe.calc_ut(jd, swe.ECL_NUT)[0][2]
+    if name == "OBLIQUITY":
+        return lambda jd: swe.calc_ut(jd, swe.ECL_NUT)[0][0]
+    if name == "SIDTIME":
+        return lambda jd: (swe.sidtime(jd) * 15.0 - gmst_degrees(np.float64(jd)) + 180.0) % 360.0 - 180.0
+    raise KeyError(name)
+
+
+def _fit(name: str, start_jd: float = START_JD, end_jd: float = END_JD) -> np.ndarray:
+    """Fit series ``name`` from ``start_jd`` to ``end_jd``; returns ``(segments, n)``."""
+    span, n, angular = SERIES[name]
+    segments = int(np.ceil((end_jd - start_jd) / span))
+    k = np.arange(n)
+    nodes = np.cos(np.pi * (k + 0.5) / n)
+    starts = start_jd + span * np.arange(segments)
+    jds = starts[:, None] + (nodes[None, :] + 1.0) * (span / 2.0)
+    with swe_lock:
+        sample = _sampler(name)
+        values = np.array([sample(t) for t in jds.ravel().tolist()]).reshape(segments, n)
+    if angular:
+        values = np.degrees(np.unwrap(np.radians(values), axis=1))
+    # Discrete Chebyshev transform at the first-kind nodes.
+    basis = np.cos(np.pi * np.outer(k + 0.5, k) / n) * (2.0 / n)
+    basis[:, 0] /= 2.0
+    return values @ basis
+
+
+def _verify(ephemeris: "ChebyshevEphemeris", samples: int, seed: int = 0) -> Dict[str, float]:
+    """Return the maximum absolute error per series in arc-seconds."""
+    rng = np.random.default_rng(seed)
+    jd = rng.uniform(ephemeris.start_jd, ephemeris.end_jd, samples)
+    errors = {}
+    for name in SERIES:
+        with swe_lock:
+            sample = _sampler(name)
+            expected = np.array([sample(t) for t in jd.tolist()])
+        got = ephemeris.evaluate(name, jd)[0]
+        diff = (got - expected + 180.0) % 360.0 - 180.0
+        errors[name] = float(np.abs(diff).max() * 3600.0)
+    return errors
+
+
+def build(
+    path: str = DEFAULT_PATH,
+    verify_samples: int = 2000,
+    start_jd: float = START_JD,
+    end_jd: float = END_JD,
+) -> str:
+    """Fit every series from pyswisseph and write the ephemeris file."""
+    coefficients = {name: _fit(name, start_jd, end_jd) for name in SERIES}
+    header = {"start_jd": start_jd, "end_jd": end_jd, "ayanamsa": AYANAMSA, "series": {}}
+    offset = 0
+    for name, coefs in coefficients.items():
+        header["series"][name] = {
+            "span": SERIES[name][0],
+            "segments": coefs.shape[0],
+            "coefficients": coefs.shape[1],
+            "offset": offset,
+        }
+        offset += coefs.nbytes
+
+    def write(target: str) -> None:
+        encoded = json.dumps(header).encode("utf-8")
+        pad = -(_PREFIX.size + len(encoded)) % 8
+        directory = os.path.dirname(os.path.abspath(target))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREFIX.pack(_MAGIC, len(encoded) + pad))
+            f.write(encoded + b" " * pad)
+            for coefs in coefficients.values():
+                f.write(np.ascontiguousarray(coefs, dtype="<f8").tobytes())
+        os.replace(tmp_path, target)
+
+    write(path)
+    if verify_samples:
+        header["error_arcsec"] = _verify(ChebyshevEphemeris(path), verify_samples)
+        write(path)
+    return path
+
+
+# ----------------------------------------------------------------------
+# Evaluation
+# ----------------------------------------------------------------------
+class ChebyshevEphemeris:
+    """Memory-mapped Chebyshev ephemeris evaluated with NumPy."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_size = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a JyotishAI Chebyshev ephemeris")
+        header = json.loads(self._mmap[_PREFIX.size:_PREFIX.size + header_size].decode("utf-8"))
+        base = _PREFIX.size + header_size
+        self.start_jd: float = header["start_jd"]
+        self.end_jd: float = header["end_jd"]
+        self.ayanamsa: str = header["ayanamsa"]
+        self.error_bounds: Dict[str, float] = header.get("error_arcsec", {})
+        self._series: Dict[str, Tuple[float, np.ndarray]] = {}
+        for name, meta in header["series"].items():
+            coefs = np.frombuffer(
+                self._mmap,
+                dtype="<f8",
+                count=meta["segments"] * meta["coefficients"],
+                offset=base + meta["offset"],
+            ).reshape(meta["segments"], meta["coefficients"])
+            self._series[name] = (meta["span"], coefs)
+
+    def covers(self, jd: np.ndarray) -> bool:
+        return bool(len(jd)) and float(np.min(jd)) >= self.start_jd and float(np.max(jd)) < self.end_jd
+
+    def evaluate(self, name: str, jd: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(value, daily rate)`` of series ``name`` at each ``jd``.
+
+        Raises:
+            ValueError: a ``jd`` lies outside the fitted range.
+        """
+        span, coefs = self._series[name]
+        jd = np.asarray(jd, dtype=np.float64)
+        if jd.size and (jd.min() < self.start_jd or jd.max() >= self.end_jd):
+            raise ValueError(f"Julian days outside the ephemeris range {self.start_jd}-{self.end_jd}")
+        segment = np.clip(((jd - self.start_jd) // span).astype(np.int64), 0, len(coefs) - 1)
+        x = 2.0 * (jd - self.start_jd - segment * span) / span - 1.0
+        rows = coefs[segment]
+        # Clenshaw recurrence for the value and its derivative together.
+        b1 = np.zeros_like(x)
+        b2 = np.zeros_like(x)
+        d1 = np.zeros_like(x)
+        d2 = np.zeros_like(x)
+        for k in range(rows.shape[1] - 1, 0, -1):
+            d1, d2 = 2.0 * b1 + 2.0 * x * d1 - d2, d1
+            b1, b2 = 2.0 * x * b1 - b2 + rows[:, k], b1
+        value = x * b1 - b2 + rows[:, 0]
+        rate = (b1 + x * d1 - d2) * (2.0 / span)
+        if SERIES.get(name, (0, 0, True))[2]:
+            value = value % 360.0
+        return value, rate
+
+    def graha(self, body: str, jd: np.ndarray, node: str = "MEAN") -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(longitude, daily speed)`` of one graha at each ``jd``."""
+        if body == "KETU":
+            longitude, speed = self.evaluate(_NODE_SERIES[node.upper()], jd)
+            return (longitude + 180.0) % 360.0, speed
+        if body == "RAHU":
+            return self.evaluate(_NODE_SERIES[node.upper()], jd)
+        return self.evaluate(body, jd)
+
+    def angles(self, jd: np.ndarray, lat: np.ndarray, lon: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Sidereal ``(ascendant, midheaven)`` in degrees for each instant and place."""
+        ramc = np.radians(gmst_degrees(jd) + self.evaluate("SIDTIME", jd)[0] + lon)
+        eps = np.radians(self.evaluate("OBLIQUITY", jd)[0])
+        phi = np.radians(lat)
+        asc = np.arctan2(np.cos(ramc), -(np.sin(ramc) * np.cos(eps) + np.tan(phi) * np.sin(eps)))
+        mc = np.arctan2(np.sin(ramc), np.cos(ramc) * np.cos(eps))
+        ayanamsa = self.evaluate("AYANAMSA", jd)[0]
+        return (np.degrees(asc) - ayanamsa) % 360.0, (np.degrees(mc) - ayanamsa) % 360.0
+
+    def compute_chart_arrays(
+        self,
+        jd: np.ndarray,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        house_system: str,
+        node: str,
+    ) -> ChartArrays:
+        """Chebyshev counterpart of :func:`services.ephemeris.compute_chart_arrays`."""
+        jd = np.asarray(jd, dtype=np.float64)
+        longitudes = np.empty((len(jd), len(BODIES)), dtype=np.float64)
+        speeds = np.zeros((len(jd), len(BODIES)), dtype=np.float64)
+        for body in GRAHAS:
+            col = BODY_INDEX[body]
+            longitudes[:, col], speeds[:, col] = self.graha(body, jd, node)
+        longitudes[:, BODY_INDEX["ASC"]], longitudes[:, BODY_INDEX["MC"]] = self.angles(jd, lat, lon)
+        return ChartArrays(
+            jd=jd,
+            latitudes=lat,
+            longitudes_geo=lon,
+            longitudes=longitudes,
+            speeds=speeds,
+            signs=(longitudes // 30.0).astype(np.int8) % 12,
+            ayanamsa=self.ayanamsa,
+            house_system=house_system.upper(),
+            node=node.upper(),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_chebyshev_ephemeris() -> Optional[ChebyshevEphemeris]:
+    """Return the default ephemeris, or ``None`` when it has not been built."""
+    if not os.path.exists(DEFAULT_PATH):
+        return None
+    return ChebyshevEphemeris(DEFAULT_PATH)
+
+
+# ----------------------------------------------------------------------
+# Command line
+# ----------------------------------------------------------------------
+def _check(path: str, samples: int, seed: int) -> None:
+    """Print the error of every series and of full charts against pyswisseph."""
+    from services.ephemeris import compute_chart_arrays
+
+    ephemeris = ChebyshevEphemeris(path)
+    for name, error in _verify(ephemeris, samples, seed).items():
+        print(f"{name:<10} max error {error:10.4f} arcsec")
+
+    rng = np.random.default_rng(seed + 1)
+    jd = rng.uniform(START_JD, END_JD, samples)
+    lat = rng.uniform(-60.0, 60.0, samples)
+    lon = rng.uniform(-180.0, 180.0, samples)
+    reference = compute_chart_arrays(jd, lat, lon, use_chebyshev=False)
+    fitted = ephemeris.compute_chart_arrays(jd, lat, lon, reference.house_system, reference.node)
+    diff = (fitted.longitudes - reference.longitudes + 180.0) % 360.0 - 180.0
+    for body, error in zip(BODIES, np.abs(diff).max(axis=0) * 3600.0):
+        print(f"chart {body:<8} max error {error:10.4f} arcsec")
+    mismatched = int((fitted.signs != reference.signs).sum())
+    print(f"sign mismatches: {mismatched} of {reference.signs.size}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="fit the ephemeris from pyswisseph")
+    build_cmd.add_argument("--path", default=DEFAULT_PATH)
+    build_cmd.add_argument("--verify-samples", type=int, default=2000)
+    check_cmd = sub.add_parser("check", help="compare against pyswisseph on random dates")
+    check_cmd.add_argument("--path", default=DEFAULT_PATH)
+    check_cmd.add_argument("--samples", type=int, default=2000)
+    check_cmd.add_argument("--seed", type=int, default=12345)
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        path = build(args.path, args.verify_samples)
+        for name, error in ChebyshevEphemeris(path).error_bounds.items():
+            print(f"{name:<10} max error {error:10.4f} arcsec")
+    else:
+        _check(args.path, args.samples, args.seed)
+
+
+if __name__ == "__main__":
+    main()
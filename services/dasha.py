@@ -0,0 +1,156 @@
+"""Vimshottari dasha engine for JyotishAI.
+
+The Vimshottari cycle assigns 120 years to the nine grahas in a fixed
+order, starting from the lord of the Moon's birth nakshatra with the
+unelapsed fraction of its period.  :func:`build_timeline` expands the
+full cycle into mahadasha, antardasha and pratyantardasha levels once
+per chart and stores each level as packed NumPy arrays.
+
+Periods within a level are contiguous and sorted, so each level's
+boundary array is itself the interval index: the period running at an
+instant is one bisect and the periods overlapping a range are a slice
+between two bisects.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from services.ephemeris import NAKSHATRA_SPAN, datetime_from_jd
+
+DASHA_LORDS = ("KETU", "VENUS", "SUN", "MOON", "MARS", "RAHU", "JUPITER", "SATURN", "MERCURY")
+DASHA_YEARS = (7, 20, 6, 10, 7, 18, 16, 19, 17)
+CYCLE_YEARS = 120
+YEAR_DAYS = 365.25
+LEVEL_NAMES = ("Mahadasha", "Antardasha", "Pratyantardasha")
+
+_YEARS = np.array(DASHA_YEARS, dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class DashaPeriod:
+    """One period of the timeline.
+
+    ``lords`` holds the mahadasha lord first, then the sub-period lords
+    down to this period's level (1 = mahadasha).
+    """
+
+    lords: Tuple[str, ...]
+    start_jd: float
+    end_jd: float
+
+    @property
+    def level(self) -> int:
+        return len(self.lords)
+
+    @property
+    def lord(self) -> str:
+        return self.lords[-1]
+
+    @property
+    def start(self) -> datetime:
+        return datetime_from_jd(self.start_jd)
+
+    @property
+    def end(self) -> datetime:
+        return datetime_from_jd(self.end_jd)
+
+
+class DashaTimeline:
+    """Packed three-level Vimshottari timeline for one chart.
+
+    Attributes:
+        birth_jd: Julian day (UT) of the birth.
+        bounds: Per level, ``n + 1`` sorted Julian days; period ``i`` runs
+            from ``bounds[i]`` to ``bounds[i + 1]``.
+        lords: Per level, an ``(n, level)`` ``uint8`` array of indices into
+            :data:`DASHA_LORDS` (mahadasha lord first).
+    """
+
+    __slots__ = ("birth_jd", "bounds", "lords", "_bounds_list")
+
+    def __init__(self, birth_jd: float, bounds: List[np.ndarray], lords: List[np.ndarray]):
+        self.birth_jd = birth_jd
+        self.bounds = bounds
+        self.lords = lords
+        self._bounds_list = [b.tolist() for b in bounds]
+
+    def __getstate__(self):
+        return self.birth_jd, self.bounds, self.lords
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    @property
+    def start_jd(self) -> float:
+        return self._bounds_list[0][0]
+
+    @property
+    def end_jd(self) -> float:
+        return self._bounds_list[0][-1]
+
+    def _period(self, level: int, index: int) -> DashaPeriod:
+        bounds = self._bounds_list[level - 1]
+        lords = tuple(DASHA_LORDS[i] for i in self.lords[level - 1][index].tolist())
+        return DashaPeriod(lords, bounds[index], bounds[index + 1])
+
+    def running(self, jd: float, level: int = 3) -> List[DashaPeriod]:
+        """Return the periods running at ``jd``, mahadasha first, down to ``level``.
+
+        Returns an empty list outside the 120-year cycle.
+        """
+        if not self.start_jd <= jd < self.end_jd:
+            return []
+        return [
+            self._period(lv, bisect_right(self._bounds_list[lv - 1], jd) - 1)
+            for lv in range(1, level + 1)
+        ]
+
+    def overlapping(self, start_jd: float, end_jd: float, level: int = 1) -> List[DashaPeriod]:
+        """Return every period at ``level`` that overlaps ``[start_jd, end_jd)``."""
+        bounds = self._bounds_list[level - 1]
+        first = max(bisect_right(bounds, start_jd) - 1, 0)
+        last = min(bisect_left(bounds, end_jd), len(bounds) - 1)
+        return [self._period(level, i) for i in range(first, last)]
+
+    def next_change(self, jd: float, level: int = 1) -> Optional[DashaPeriod]:
+        """Return the first period at ``level`` starting strictly after ``jd``."""
+        bounds = self._bounds_list[level - 1]
+        i = bisect_right(bounds, jd)
+        if i >= len(bounds) - 1:
+            return None
+        return self._period(level, i)
+
+
+def moon_nakshatra_balance(moon_longitude: float) -> Tuple[int, float]:
+    """Return the starting lord index and the elapsed fraction of its period."""
+    nakshatra, offset = divmod(moon_longitude % 360.0, NAKSHATRA_SPAN)
+    return int(nakshatra) % len(DASHA_LORDS), offset / NAKSHATRA_SPAN
+
+
+def build_timeline(birth_jd: float, moon_longitude: float, levels: int = 3) -> DashaTimeline:
+    """Expand the Vimshottari cycle for a birth into ``levels`` packed levels."""
+    first, elapsed = moon_nakshatra_balance(moon_longitude)
+    cycle_start = birth_jd - elapsed * DASHA_YEARS[first] * YEAR_DAYS
+
+    # Each level subdivides every period of the previous one into nine,
+    # starting from the parent's own lord, in proportion to the lords' years.
+    order = (first + np.arange(9)) % 9
+    lords = order.reshape(9, 1)
+    lengths = _YEARS[order] * YEAR_DAYS
+    all_bounds, all_lords = [], []
+    for level in range(1, levels + 1):
+        if level > 1:
+            parent = lords[:, -1]
+            sub = (parent[:, None] + np.arange(9)[None, :]) % 9
+            lengths = (lengths[:, None] * _YEARS[sub] / CYCLE_YEARS).ravel()
+            lords = np.concatenate([np.repeat(lords, 9, axis=0), sub.reshape(-1, 1)], axis=1)
+        bounds = cycle_start + np.concatenate(([0.0], np.cumsum(lengths)))
+        all_bounds.append(bounds)
+        all_lords.append(lords.astype(np.uint8))
+    return DashaTimeline(birth_jd, all_bounds, all_lords)
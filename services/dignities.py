@@ -0,0 +1,52 @@
+"""Sign lordship and dignity tables for JyotishAI.
+
+Classical Parashari tables indexed by sign (0 = Aries) and by body in
+:data:`~services.ephemeris.BODIES` order, as NumPy arrays so that they
+can be indexed with whole arrays of sign indices.  Rahu and Ketu own no
+sign and are given no dignities, which is the usual Parashari position;
+the ascendant and midheaven likewise have none.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from services.ephemeris import BODIES, BODY_INDEX
+
+_SUN, _MOON, _MARS, _MERCURY, _JUPITER, _VENUS, _SATURN = (
+    BODY_INDEX[b] for b in ("SUN", "MOON", "MARS", "MERCURY", "JUPITER", "VENUS", "SATURN")
+)
+
+# Body index of the lord of each sign.
+SIGN_LORDS = np.array(
+    [_MARS, _VENUS, _MERCURY, _MOON, _SUN, _MERCURY, _VENUS, _MARS, _JUPITER, _SATURN, _SATURN, _JUPITER],
+    dtype=np.int64,
+)
+
+# Deepest exaltation point of each planet in sidereal degrees; debilitation
+# is the opposite point.
+EXALTATION_DEGREES = {
+    "SUN": 10.0,  # Aries 10
+    "MOON": 33.0,  # Taurus 3
+    "MARS": 298.0,  # Capricorn 28
+    "MERCURY": 165.0,  # Virgo 15
+    "JUPITER": 95.0,  # Cancer 5
+    "VENUS": 357.0,  # Pisces 27
+    "SATURN": 200.0,  # Libra 20
+}
+
+
+def _sign_masks(signs_by_body) -> np.ndarray:
+    masks = np.zeros(len(BODIES), dtype=np.uint16)
+    for body, signs in signs_by_body.items():
+        for sign in signs:
+            masks[BODY_INDEX[body]] |= 1 << sign
+    return masks
+
+
+# 12-bit masks over signs, per body.
+OWN_SIGN_MASKS = _sign_masks(
+    {BODIES[lord]: [s for s in range(12) if SIGN_LORDS[s] == lord] for lord in set(SIGN_LORDS.tolist())}
+)
+EXALTATION_MASKS = _sign_masks({body: [int(deg // 30)] for body, deg in EXALTATION_DEGREES.items()})
+DEBILITATION_MASKS = _sign_masks({body: [(int(deg // 30) + 6) % 12] for body, deg in EXALTATION_DEGREES.items()})
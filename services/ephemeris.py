@@ -0,0 +1,307 @@
+"""Batch ephemeris engine for JyotishAI.
+
+This module computes sidereal positions for many births at once by
+calling pyswisseph directly and collecting the results into NumPy
+arrays.  It avoids building one flatlib ``Chart`` per birth, which
+dominates the cost of bulk jobs.  :class:`ChartArrays` holds one row per
+birth and one column per body in :data:`BODIES`; single charts are
+extracted from it as :class:`~services.chart_snapshot.ChartSnapshot`.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+GRAHAS = ("SUN", "MOON", "MARS", "MERCURY", "JUPITER", "VENUS", "SATURN", "RAHU", "KETU")
+BODIES = GRAHAS + ("ASC", "MC")
+BODY_INDEX: Dict[str, int] = {body: i for i, body in enumerate(BODIES)}
+
+SIGNS = (
+    "ARIES", "TAURUS", "GEMINI", "CANCER", "LEO", "VIRGO",
+    "LIBRA", "SCORPIO", "SAGITTARIUS", "CAPRICORN", "AQUARIUS", "PISCES",
+)
+
+NAKSHATRAS = (
+    "ASHWINI", "BHARANI", "KRITTIKA", "ROHINI", "MRIGASHIRA", "ARDRA",
+    "PUNARVASU", "PUSHYA", "ASHLESHA", "MAGHA", "PURVA_PHALGUNI", "UTTARA_PHALGUNI",
+    "HASTA", "CHITRA", "SWATI", "VISHAKHA", "ANURADHA", "JYESHTHA",
+    "MULA", "PURVA_ASHADHA", "UTTARA_ASHADHA", "SHRAVANA", "DHANISHTA", "SHATABHISHA",
+    "PURVA_BHADRAPADA", "UTTARA_BHADRAPADA", "REVATI",
+)
+NAKSHATRA_SPAN = 360.0 / 27.0
+
+_SWE_IDS = {
+    "SUN": swe.SUN,
+    "MOON": swe.MOON,
+    "MARS": swe.MARS,
+    "MERCURY": swe.MERCURY,
+    "JUPITER": swe.JUPITER,
+    "VENUS": swe.VENUS,
+    "SATURN": swe.SATURN,
+}
+_NODE_IDS = {"MEAN": swe.MEAN_NODE, "TRUE": swe.TRUE_NODE}
+HOUSE_SYSTEMS = {
+    "WHOLE_SIGN": b"W",
+    "PLACIDUS": b"P",
+    "KOCH": b"K",
+    "EQUAL": b"E",
+    "PORPHYRY": b"O",
+    "CAMPANUS": b"C",
+    "REGIOMONTANUS": b"R",
+    "ALCABITUS": b"B",
+}
+
+DEFAULT_AYANAMSA = "LAHIRI"
+DEFAULT_HOUSE_SYSTEM = "WHOLE_SIGN"
+DEFAULT_NODE = "MEAN"
+
+_UNIX_EPOCH_JD = 2440587.5
+
+
+def _default_ephe_path() -> str:
+    """Return the Swiss Ephemeris data directory.
+
+    ``JYOTISHAI_EPHE_PATH`` takes precedence; otherwise the ``.se1`` files
+    shipped with flatlib are used.  Without data files pyswisseph falls
+    back to the (much slower) Moshier theory.
+    """
+    path = os.getenv("JYOTISHAI_EPHE_PATH")
+    if path:
+        return path
+    try:
+        import flatlib
+    except ImportError:
+        return ""
+    return os.path.join(os.path.dirname(flatlib.__file__), "resources", "swefiles")
+
+
+_EPHE_PATH = _default_ephe_path()
+swe.set_ephe_path(_EPHE_PATH)
+_thread_state = threading.local()
+
+# The Swiss Ephemeris keeps its settings per thread when built with
+# thread-local storage (as pyswisseph is on Linux) and per process
+# otherwise.  Hold this lock from :func:`sidereal_flags` until the last
+# calculation that depends on the selected mode, so threads using
+# different ayanamsas cannot race on builds that share the state.
+swe_lock = threading.RLock()
+
+
+def use_ephe_path() -> None:
+    """Point pyswisseph at the ephemeris files on the calling thread.
+
+    A thread that never set the path silently computes with the less
+    precise Moshier theory.
+    """
+    if not getattr(_thread_state, "ephe_path", False):
+        swe.set_ephe_path(_EPHE_PATH)
+        _thread_state.ephe_path = True
+
+
+@dataclass(frozen=True)
+class Birth:
+    """A birth instant and place for batch computation."""
+
+    utc: datetime
+    latitude: float
+    longitude: float
+
+
+@dataclass
+class ChartArrays:
+    """Column-oriented positions for a batch of charts.
+
+    Attributes:
+        jd: Julian day (UT) per chart, shape ``(n,)``.
+        latitudes: Geographic latitude per chart, shape ``(n,)``.
+        longitudes_geo: Geographic longitude per chart, shape ``(n,)``.
+        longitudes: Sidereal ecliptic longitude in degrees, shape ``(n, 11)``.
+        speeds: Daily motion in degrees, shape ``(n, 11)``.  The speeds of
+            the ascendant and midheaven are not computed and reported as ``0``.
+        signs: Sign index ``0`` (Aries) to ``11`` (Pisces), shape ``(n, 11)``.
+    """
+
+    jd: np.ndarray
+    latitudes: np.ndarray
+    longitudes_geo: np.ndarray
+    longitudes: np.ndarray
+    speeds: np.ndarray
+    signs: np.ndarray
+    ayanamsa: str = DEFAULT_AYANAMSA
+    house_system: str = DEFAULT_HOUSE_SYSTEM
+    node: str = DEFAULT_NODE
+
+    def __len__(self) -> int:
+        return len(self.jd)
+
+
+def julian_days(instants: Iterable[datetime]) -> np.ndarray:
+    """Convert aware datetimes to Julian days (UT) in one vectorized step."""
+    stamps = np.array(
+        [i.astimezone(timezone.utc).replace(tzinfo=None) for i in instants],
+        dtype="datetime64[us]",
+    )
+    seconds = stamps.astype(np.int64) / 1e6
+    return seconds / 86400.0 + _UNIX_EPOCH_JD
+
+
+def datetime_from_jd(jd: float) -> datetime:
+    """Convert a Julian day (UT) to an aware UTC datetime (millisecond precision)."""
+    seconds = round((jd - _UNIX_EPOCH_JD) * 86400.0, 3)
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=seconds)
+
+
+def sidereal_flags(ayanamsa: str) -> int:
+    """Select the ayanamsa and return the matching pyswisseph flags.
+
+    Call it with :data:`swe_lock` held.
+    """
+    use_ephe_path()
+    swe.set_sid_mode(getattr(swe, "SIDM_" + ayanamsa.upper()))
+    return swe.FLG_SWIEPH | swe.FLG_SPEED | swe.FLG_SIDEREAL
+
+
+def graha_longitudes(
+    body: str,
+    jd: np.ndarray,
+    ayanamsa: str = DEFAULT_AYANAMSA,
+    node: str = DEFAULT_NODE,
+    use_chebyshev: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return sidereal ``(longitude, daily speed)`` of one graha at many instants."""
+    jd = np.asarray(jd, dtype=np.float64)
+    if use_chebyshev:
+        from services.chebyshev_ephemeris import get_chebyshev_ephemeris
+
+        cheb = get_chebyshev_ephemeris()
+        if cheb is not None and cheb.ayanamsa == ayanamsa.upper() and cheb.covers(jd):
+            return cheb.graha(body, jd, node)
+
+    if body == "KETU":
+        longitude, speed = graha_longitudes("RAHU", jd, ayanamsa, node, use_chebyshev=False)
+        return (longitude + 180.0) % 360.0, speed
+    swe_id = _NODE_IDS[node.upper()] if body == "RAHU" else _SWE_IDS[body]
+    longitude = np.empty(len(jd), dtype=np.float64)
+    speed = np.empty(len(jd), dtype=np.float64)
+    calc_ut = swe.calc_ut
+    with swe_lock:
+        flags = sidereal_flags(ayanamsa)
+        for i, t in enumerate(jd.tolist()):
+            xx = calc_ut(t, swe_id, flags)[0]
+            longitude[i] = xx[0]
+            speed[i] = xx[3]
+    return longitude, speed
+
+
+def ascendant_longitudes(
+    jd: np.ndarray,
+    lat: float,
+    lon: float,
+    ayanamsa: str = DEFAULT_AYANAMSA,
+    use_chebyshev: bool = True,
+) -> np.ndarray:
+    """Return the sidereal ascendant at many instants for one place."""
+    jd = np.asarray(jd, dtype=np.float64)
+    if use_chebyshev:
+        from services.chebyshev_ephemeris import get_chebyshev_ephemeris
+
+        cheb = get_chebyshev_ephemeris()
+        if cheb is not None and cheb.ayanamsa == ayanamsa.upper() and cheb.covers(jd):
+            return cheb.angles(jd, lat, lon)[0]
+
+    houses_ex = swe.houses_ex
+    with swe_lock:
+        sidereal_flags(ayanamsa)
+        return np.array([houses_ex(t, lat, lon, b"W", swe.FLG_SIDEREAL)[1][0] for t in jd.tolist()])
+
+
+def compute_charts(
+    births: Sequence[Birth],
+    ayanamsa: str = DEFAULT_AYANAMSA,
+    house_system: str = DEFAULT_HOUSE_SYSTEM,
+    node: str = DEFAULT_NODE,
+) -> ChartArrays:
+    """Compute sidereal positions for all nine grahas, ascendant and midheaven.
+
+    Args:
+        births: Birth instants and places.
+        ayanamsa: Name of a pyswisseph ``SIDM_*`` constant, e.g. ``LAHIRI``.
+        house_system: Key of :data:`HOUSE_SYSTEMS`.
+        node: ``MEAN`` or ``TRUE`` lunar node.
+
+    Returns:
+        A :class:`ChartArrays` with one row per birth.
+    """
+    jd = julian_days(b.utc for b in births)
+    lat = np.array([b.latitude for b in births], dtype=np.float64)
+    lon = np.array([b.longitude for b in births], dtype=np.float64)
+    return compute_chart_arrays(jd, lat, lon, ayanamsa, house_system, node)
+
+
+def compute_chart_arrays(
+    jd: np.ndarray,
+    lat: np.ndarray,
+    lon: np.ndarray,
+    ayanamsa: str = DEFAULT_AYANAMSA,
+    house_system: str = DEFAULT_HOUSE_SYSTEM,
+    node: str = DEFAULT_NODE,
+    use_chebyshev: bool = True,
+) -> ChartArrays:
+    """Array form of :func:`compute_charts` taking Julian days directly.
+
+    When the Chebyshev ephemeris file has been built and covers every
+    ``jd`` it is used instead of pyswisseph (the ascendant and midheaven
+    do not depend on the house system).  Pass ``use_chebyshev=False`` to force
+    the Swiss Ephemeris path.
+    """
+    if use_chebyshev:
+        from services.chebyshev_ephemeris import get_chebyshev_ephemeris
+
+        cheb = get_chebyshev_ephemeris()
+        if cheb is not None and cheb.ayanamsa == ayanamsa.upper() and cheb.covers(jd):
+            return cheb.compute_chart_arrays(jd, lat, lon, house_system, node)
+
+    n = len(jd)
+    hsys = HOUSE_SYSTEMS[house_system.upper()]
+    longitudes = np.empty((n, len(BODIES)), dtype=np.float64)
+    speeds = np.zeros((n, len(BODIES)), dtype=np.float64)
+    calc_ut = swe.calc_ut
+    houses_ex = swe.houses_ex
+    asc, mc = BODY_INDEX["ASC"], BODY_INDEX["MC"]
+    with swe_lock:
+        flags = sidereal_flags(ayanamsa)
+        for body, swe_id in list(_SWE_IDS.items()) + [("RAHU", _NODE_IDS[node.upper()])]:
+            col = BODY_INDEX[body]
+            for i, t in enumerate(jd.tolist()):
+                xx = calc_ut(t, swe_id, flags)[0]
+                longitudes[i, col] = xx[0]
+                speeds[i, col] = xx[3]
+        for i, (t, la, lo) in enumerate(zip(jd.tolist(), lat.tolist(), lon.tolist())):
+            ascmc = houses_ex(t, la, lo, hsys, swe.FLG_SIDEREAL)[1]
+            longitudes[i, asc] = ascmc[0]
+            longitudes[i, mc] = ascmc[1]
+
+    rahu, ketu = BODY_INDEX["RAHU"], BODY_INDEX["KETU"]
+    longitudes[:, ketu] = (longitudes[:, rahu] + 180.0) % 360.0
+    speeds[:, ketu] = speeds[:, rahu]
+
+    signs = (longitudes // 30.0).astype(np.int8) % 12
+    return ChartArrays(
+        jd=np.asarray(jd, dtype=np.float64),
+        latitudes=lat,
+        longitudes_geo=lon,
+        longitudes=longitudes,
+        speeds=speeds,
+        signs=signs,
+        ayanamsa=ayanamsa.upper(),
+        house_system=house_system.upper(),
+        node=node.upper(),
+    )
+
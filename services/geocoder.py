@@ -0,0 +1,451 @@
+"""Offline geocoder for JyotishAI.
+
+Birth locations are resolved against a bundled gazetteer
+(``data/cities.tsv``: the GeoNames cities of 15,000 people or more, in
+the ``cities15000.txt`` column layout) without any network round-trip.
+A location that cannot be resolved is an error (:class:`UnknownLocation`);
+no default place is ever substituted.  The gazetteer is compiled once into a
+binary index that is memory-mapped by every worker, so opening it costs
+no parsing and the pages are shared through the OS page cache.
+
+The index contains:
+
+* fixed-size city records (coordinates, population, country, timezone);
+* sorted, normalised name keys for exact, prefix and fuzzy lookup;
+* an implicit KD-tree over unit vectors for nearest-city queries on
+  coordinate strings such as ``"24.86, 67.00"`` or ``"24.86N 67.00E"``.
+
+The index is rebuilt automatically when it is missing or older than the
+gazetteer.  ``JYOTISHAI_GAZETTEER`` and ``JYOTISHAI_GEO_INDEX`` override
+the default paths.
+"""
+
+from __future__ import annotations
+
+import difflib
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+DEFAULT_GAZETTEER = os.getenv("JYOTISHAI_GAZETTEER", os.path.join(_DATA_DIR, "cities.tsv"))
+DEFAULT_INDEX = os.getenv("JYOTISHAI_GEO_INDEX", os.path.join(_DATA_DIR, "cities.idx"))
+
+_MAGIC = b"JYGEOIDX"
+_VERSION = 1
+_SECTIONS = ("cities", "strings", "key_blob", "key_offsets", "key_city", "kd_xyz", "kd_city")
+_HEADER = struct.Struct("<8sI" + "QQ" * len(_SECTIONS))
+
+CITY_DTYPE = np.dtype(
+    [
+        ("lat", "<f8"),
+        ("lon", "<f8"),
+        ("population", "<u8"),
+        ("name_off", "<u4"),
+        ("name_len", "<u2"),
+        ("tz_off", "<u4"),
+        ("tz_len", "<u2"),
+        ("country", "S2"),
+    ]
+)
+
+# Country names accepted as hints in "City, Country" queries.
+COUNTRY_NAMES: Dict[str, str] = {
+    "AE": "united arab emirates", "AF": "afghanistan", "AR": "argentina",
+    "AT": "austria", "AU": "australia", "BD": "bangladesh", "BE": "belgium",
+    "BH": "bahrain", "BR": "brazil", "BT": "bhutan", "CA": "canada",
+    "CH": "switzerland", "CL": "chile", "CN": "china", "CO": "colombia",
+    "DE": "germany", "DK": "denmark", "EG": "egypt", "ES": "spain",
+    "ET": "ethiopia", "FI": "finland", "FJ": "fiji", "FR": "france",
+    "GB": "united kingdom", "GH": "ghana", "GR": "greece", "GY": "guyana",
+    "HK": "hong kong", "ID": "indonesia", "IE": "ireland", "IL": "israel",
+    "IN": "india", "IQ": "iraq", "IR": "iran", "IT": "italy", "JP": "japan",
+    "KE": "kenya", "KR": "south korea", "KW": "kuwait", "KZ": "kazakhstan",
+    "LK": "sri lanka", "MA": "morocco", "MM": "myanmar", "MU": "mauritius",
+    "MV": "maldives", "MX": "mexico", "MY": "malaysia", "NG": "nigeria",
+    "NL": "netherlands", "NO": "norway", "NP": "nepal", "NZ": "new zealand",
+    "OM": "oman", "PE": "peru", "PH": "philippines", "PK": "pakistan",
+    "PL": "poland", "PT": "portugal", "QA": "qatar", "RU": "russia",
+    "SA": "saudi arabia", "SE": "sweden", "SG": "singapore", "TH": "thailand",
+    "TR": "turkey", "TT": "trinidad and tobago", "TZ": "tanzania",
+    "US": "united states", "UZ": "uzbekistan", "VN": "vietnam",
+    "ZA": "south africa",
+}
+_COUNTRY_ALIASES = {"uk": "GB", "england": "GB", "usa": "US", "us": "US", "uae": "AE", "america": "US"}
+_COUNTRY_CODES: Dict[str, str] = {
+    **{name: code for code, name in COUNTRY_NAMES.items()},
+    **{code.lower(): code for code in COUNTRY_NAMES},
+    **_COUNTRY_ALIASES,
+}
+
+# Population weight of a city matched by an alternate name rather than its own.
+_ALIAS_WEIGHT = 0.1
+
+_COORDINATES = re.compile(
+    r"^\s*([+-]?\d+(?:\.\d+)?)\s*°?\s*([NSns])?\s*[,;\s]\s*"
+    r"([+-]?\d+(?:\.\d+)?)\s*°?\s*([EWew])?\s*$"
+)
+
+
+class UnknownLocation(LookupError):
+    """Raised when a location cannot be resolved against the gazetteer."""
+
+    def __init__(self, location: str):
+        super().__init__(f"Could not resolve location {location!r}")
+        self.location = location
+
+
+class GazetteerUnavailable(RuntimeError):
+    """Raised when the gazetteer or its index cannot be read."""
+
+
+@dataclass(frozen=True)
+class Place:
+    """A resolved location."""
+
+    name: str
+    country: str
+    latitude: float
+    longitude: float
+    timezone: str
+    population: int = 0
+
+
+def normalize(text: str) -> str:
+    """Return ``text`` lower-cased, accent-free and with single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]+", " ", stripped.lower()).strip()
+
+
+def parse_coordinates(text: str) -> Optional[Tuple[float, float]]:
+    """Parse ``"lat, lon"`` strings with optional hemisphere letters."""
+    match = _COORDINATES.match(text)
+    if not match:
+        return None
+    lat, ns, lon, ew = match.groups()
+    latitude, longitude = float(lat), float(lon)
+    if ns and ns.upper() == "S":
+        latitude = -abs(latitude)
+    if ew and ew.upper() == "W":
+        longitude = -abs(longitude)
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        return None
+    return latitude, longitude
+
+
+def _unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    phi = np.radians(lat)
+    lam = np.radians(lon)
+    return np.column_stack((np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)))
+
+
+# ----------------------------------------------------------------------
+# Index compilation
+# ----------------------------------------------------------------------
+def _read_gazetteer(path: str) -> Iterator[Tuple[str, List[str], float, float, str, int, str]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            cols = line.rstrip("\n").split("\t")
+            name, asciiname, alternates = cols[1], cols[2], cols[3]
+            aliases = [name, asciiname] + [a for a in alternates.split(",") if a]
+            population = int(cols[14]) if cols[14] else 0
+            yield name, aliases, float(cols[4]), float(cols[5]), cols[8], population, cols[17]
+
+
+def _kd_order(points: np.ndarray) -> np.ndarray:
+    """Return a permutation laying ``points`` out as an implicit KD-tree.
+
+    Each subrange ``[lo, hi)`` stores its splitting node at the midpoint,
+    with the left and right subtrees in the two halves around it.
+    """
+    order = np.arange(len(points))
+
+    def build(lo: int, hi: int, depth: int) -> None:
+        if hi - lo <= 1:
+            return
+        axis = depth % 3
+        segment = order[lo:hi]
+        order[lo:hi] = segment[np.argsort(points[segment, axis], kind="stable")]
+        mid = (lo + hi) // 2
+        build(lo, mid, depth + 1)
+        build(mid + 1, hi, depth + 1)
+
+    build(0, len(points), 0)
+    return order
+
+
+def build_index(gazetteer: str = DEFAULT_GAZETTEER, index: str = DEFAULT_INDEX) -> str:
+    """Compile ``gazetteer`` into the binary index at ``index``."""
+    strings = bytearray()
+    string_offsets: Dict[str, Tuple[int, int]] = {}
+
+    def intern(text: str) -> Tuple[int, int]:
+        if text not in string_offsets:
+            encoded = text.encode("utf-8")
+            string_offsets[text] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return string_offsets[text]
+
+    records = []
+    keys: List[Tuple[bytes, int]] = []
+    for city_id, (name, aliases, lat, lon, country, population, tz) in enumerate(_read_gazetteer(gazetteer)):
+        name_off, name_len = intern(name)
+        tz_off, tz_len = intern(tz)
+        records.append((lat, lon, population, name_off, name_len, tz_off, tz_len, country.encode("ascii")))
+        for key in {normalize(a) for a in aliases} - {""}:
+            keys.append((key.encode("ascii"), city_id))
+
+    cities = np.array(records, dtype=CITY_DTYPE)
+    keys.sort()
+    key_blob = b"".join(k for k, _ in keys)
+    key_offsets = np.zeros(len(keys) + 1, dtype="<u4")
+    key_offsets[1:] = np.cumsum([len(k) for k, _ in keys])
+    key_city = np.array([c for _, c in keys], dtype="<u4")
+
+    xyz = _unit_vectors(cities["lat"], cities["lon"])
+    order = _kd_order(xyz)
+    kd_xyz = np.ascontiguousarray(xyz[order], dtype="<f8")
+    kd_city = order.astype("<u4")
+
+    payloads = [cities.tobytes(), bytes(strings), key_blob, key_offsets.tobytes(),
+                key_city.tobytes(), kd_xyz.tobytes(), kd_city.tobytes()]
+    layout: List[int] = []
+    body = bytearray()
+    for payload in payloads:
+        body.extend(b"\0" * (-(_HEADER.size + len(body)) % 8))
+        layout += [_HEADER.size + len(body), len(payload)]
+        body.extend(payload)
+
+    directory = os.path.dirname(os.path.abspath(index))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, *layout))
+        f.write(body)
+    os.replace(tmp_path, index)
+    return index
+
+
+# ----------------------------------------------------------------------
+# Lookup
+# ----------------------------------------------------------------------
+class Geocoder:
+    """Read-only view over a memory-mapped gazetteer index."""
+
+    def __init__(self, index: str = DEFAULT_INDEX):
+        with open(index, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = _HEADER.unpack_from(self._mmap, 0)
+        if header[0] != _MAGIC or header[1] != _VERSION:
+            raise ValueError(f"{index} is not a JyotishAI gazetteer index")
+        spans = dict(zip(_SECTIONS, zip(header[2::2], header[3::2])))
+
+        def section(name: str, dtype) -> np.ndarray:
+            offset, size = spans[name]
+            return np.frombuffer(self._mmap, dtype=dtype, count=size // np.dtype(dtype).itemsize, offset=offset)
+
+        self._cities = section("cities", CITY_DTYPE)
+        self._strings = spans["strings"][0]
+        self._key_blob = spans["key_blob"][0]
+        self._key_offsets = section("key_offsets", "<u4")
+        self._key_city = section("key_city", "<u4")
+        self._kd_xyz = section("kd_xyz", "<f8").reshape(-1, 3)
+        self._kd_city = section("kd_city", "<u4")
+
+    @classmethod
+    def open(cls, gazetteer: str = DEFAULT_GAZETTEER, index: str = DEFAULT_INDEX) -> "Geocoder":
+        """Open ``index``, compiling it from ``gazetteer`` when stale."""
+        if not os.path.exists(index) or (
+            os.path.exists(gazetteer) and os.path.getmtime(index) < os.path.getmtime(gazetteer)
+        ):
+            build_index(gazetteer, index)
+        return cls(index)
+
+    def __len__(self) -> int:
+        return len(self._cities)
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings + offset
+        return self._mmap[start:start + length].decode("utf-8")
+
+    def _key(self, i: int) -> bytes:
+        start = self._key_blob + int(self._key_offsets[i])
+        end = self._key_blob + int(self._key_offsets[i + 1])
+        return self._mmap[start:end]
+
+    def place(self, city_id: int) -> Place:
+        rec = self._cities[city_id]
+        return Place(
+            name=self._string(int(rec["name_off"]), int(rec["name_len"])),
+            country=rec["country"].decode("ascii"),
+            latitude=float(rec["lat"]),
+            longitude=float(rec["lon"]),
+            timezone=self._string(int(rec["tz_off"]), int(rec["tz_len"])),
+            population=int(rec["population"]),
+        )
+
+    def timezones(self) -> List[str]:
+        """Return the distinct IANA time zones of the gazetteer's cities."""
+        spans = np.unique(self._cities[["tz_off", "tz_len"]])
+        return sorted({self._string(int(off), int(length)) for off, length in spans.tolist()} - {""})
+
+    def _bisect(self, key: bytes) -> int:
+        lo, hi = 0, len(self._key_city)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _by_population(self, city_ids) -> List[int]:
+        unique = list(dict.fromkeys(int(c) for c in city_ids))
+        return sorted(unique, key=lambda c: -int(self._cities[c]["population"]))
+
+    def exact(self, name: str) -> List[int]:
+        """Return city ids whose normalised name or alternate name equals ``name``.
+
+        Cities are ranked by population, an alternate-name match counting a
+        tenth of it, so Islamabad beats a larger city once also called so.
+        """
+        key = normalize(name).encode("ascii", "ignore")
+        i = self._bisect(key)
+        ids = []
+        while i < len(self._key_city) and self._key(i) == key:
+            ids.append(self._key_city[i])
+            i += 1
+        text = key.decode("ascii")
+
+        def weight(city_id: int) -> float:
+            rec = self._cities[city_id]
+            own = normalize(self._string(int(rec["name_off"]), int(rec["name_len"]))) == text
+            return -float(rec["population"]) * (1.0 if own else _ALIAS_WEIGHT)
+
+        return sorted(dict.fromkeys(int(c) for c in ids), key=weight)
+
+    def _prefix_ids(self, text: str) -> List[int]:
+        key = normalize(text).encode("ascii", "ignore")
+        i = self._bisect(key)
+        ids = []
+        while i < len(self._key_city) and self._key(i).startswith(key):
+            ids.append(self._key_city[i])
+            i += 1
+        return self._by_population(ids)
+
+    def prefix(self, text: str, limit: int = 10) -> List[Place]:
+        """Return up to ``limit`` places whose name starts with ``text``."""
+        return [self.place(c) for c in self._prefix_ids(text)[:limit]]
+
+    def fuzzy(self, text: str, limit: int = 5, cutoff: float = 0.8) -> List[int]:
+        """Return city ids with names close to ``text`` (same first letter)."""
+        key = normalize(text)
+        if not key:
+            return []
+        lo = self._bisect(key[0].encode("ascii", "ignore"))
+        hi = self._bisect(chr(ord(key[0]) + 1).encode("ascii", "ignore"))
+        candidates: Dict[str, List[int]] = {}
+        for i in range(lo, hi):
+            candidates.setdefault(self._key(i).decode("ascii"), []).append(self._key_city[i])
+        matches = difflib.get_close_matches(key, candidates, n=limit, cutoff=cutoff)
+        return self._by_population(c for m in matches for c in candidates[m])
+
+    def nearest(self, latitude: float, longitude: float) -> Place:
+        """Return the gazetteer city closest to the given coordinates."""
+        target = _unit_vectors(np.array([latitude]), np.array([longitude]))[0].tolist()
+        points = self._kd_xyz
+        best = [math.inf, -1]
+
+        def search(lo: int, hi: int, depth: int) -> None:
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            px, py, pz = points[mid].tolist()
+            dist = (px - target[0]) ** 2 + (py - target[1]) ** 2 + (pz - target[2]) ** 2
+            if dist < best[0]:
+                best[0], best[1] = dist, mid
+            axis = depth % 3
+            delta = target[axis] - (px, py, pz)[axis]
+            near, far = ((lo, mid), (mid + 1, hi)) if delta < 0 else ((mid + 1, hi), (lo, mid))
+            search(near[0], near[1], depth + 1)
+            if delta * delta < best[0]:
+                search(far[0], far[1], depth + 1)
+
+        search(0, len(points), 0)
+        return self.place(int(self._kd_city[best[1]]))
+
+    def resolve(self, location: str) -> Optional[Place]:
+        """Resolve a free-text location or coordinate string to a place."""
+        coordinates = parse_coordinates(location)
+        if coordinates:
+            near = self.nearest(*coordinates)
+            return Place(
+                name=f"{coordinates[0]:.4f}, {coordinates[1]:.4f}",
+                country=near.country,
+                latitude=coordinates[0],
+                longitude=coordinates[1],
+                timezone=near.timezone,
+            )
+        parts = [p for p in (normalize(p) for p in location.split(",")) if p]
+        if not parts:
+            return None
+        hints = {_COUNTRY_CODES[p] for p in parts[1:] if p in _COUNTRY_CODES}
+        name = parts[0]
+        ids = self.exact(" ".join(parts)) or self.exact(name)
+        if not ids:
+            # "Hyderabad India": peel trailing words off as a country hint.
+            words = name.split()
+            for split in range(len(words) - 1, 0, -1):
+                tail = " ".join(words[split:])
+                if tail in _COUNTRY_CODES:
+                    name = " ".join(words[:split])
+                    hints.add(_COUNTRY_CODES[tail])
+                    break
+            ids = self.exact(name) or self._prefix_ids(name) or self.fuzzy(name)
+        if not ids:
+            return None
+        if hints:
+            ids = [c for c in ids if self._cities[c]["country"].decode("ascii") in hints] or ids
+        return self.place(ids[0])
+
+
+@lru_cache(maxsize=1)
+def get_geocoder() -> Geocoder:
+    """Return the process-wide geocoder, compiling the index if needed."""
+    return Geocoder.open()
+
+
+@lru_cache(maxsize=4096)
+def resolve_location(location: str) -> Optional[Place]:
+    """Resolve ``location`` with the default gazetteer (memoised).
+
+    Raises:
+        GazetteerUnavailable: the gazetteer could not be opened.  Failures
+            are not memoised, so a later call retries.
+    """
+    try:
+        geocoder = get_geocoder()
+    except (OSError, ValueError) as exc:
+        raise GazetteerUnavailable(f"Gazetteer unavailable: {exc}") from exc
+    return geocoder.resolve(location)
+
+
+def require_location(location: str) -> Place:
+    """Like :func:`resolve_location`, raising :class:`UnknownLocation` instead of returning ``None``."""
+    place = resolve_location(location)
+    if place is None:
+        raise UnknownLocation(location)
+    return place
@@ -0,0 +1,292 @@
+"""Sign and nakshatra ingress index for JyotishAI.
+
+Most analyzers only need to know which sign (or nakshatra) a graha
+occupies, not its exact degree.  This module precomputes every ingress
+of every graha over a long date range and keeps them as sorted arrays,
+so "sign of Saturn at *t*" is a bisect rather than an ephemeris call and
+"all Jupiter ingresses between *t1* and *t2*" is a slice.
+
+The index is built from :func:`services.ephemeris.graha_longitudes`
+(the Chebyshev ephemeris when available) by sampling each graha on a
+grid finer than it can cross a division twice, then bisecting each
+change of division to about a second.  The result is saved as
+``data/ingress.npz`` (``JYOTISHAI_INGRESS_INDEX`` overrides the path).
+Building the full range takes minutes, so only
+``python -m services.ingress_index build`` does it; the application
+merely loads the file on first use.  :mod:`services.transits` takes its
+house ingresses from the index and falls back to sampling the ephemeris
+while the file is missing or was built for a different range or node.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.ephemeris import (
+    DEFAULT_AYANAMSA,
+    DEFAULT_NODE,
+    GRAHAS,
+    NAKSHATRA_SPAN,
+    NAKSHATRAS,
+    SIGNS,
+    graha_longitudes,
+)
+
+logger = logging.getLogger(__name__)
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+DEFAULT_INDEX = os.getenv("JYOTISHAI_INGRESS_INDEX", os.path.join(_DATA_DIR, "ingress.npz"))
+
+START_JD = 2378496.5  # 1800-01-01
+END_JD = 2524593.5  # 2200-01-01
+
+# Width in degrees and display names of each indexed division.
+DIVISIONS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "SIGN": (30.0, SIGNS),
+    "NAKSHATRA": (NAKSHATRA_SPAN, NAKSHATRAS),
+}
+
+# Sampling step in days; small enough that no graha leaves and re-enters
+# a division between two samples.
+_STEP_DAYS = {
+    "SUN": 1.0,
+    "MOON": 0.25,
+    "MARS": 1.0,
+    "MERCURY": 1.0,
+    "JUPITER": 2.0,
+    "VENUS": 1.0,
+    "SATURN": 2.0,
+    "RAHU": 1.0,
+    "KETU": 1.0,
+}
+_BISECT_ITERATIONS = 20
+
+
+@dataclass(frozen=True)
+class Ingress:
+    """A graha leaving one division and entering another."""
+
+    jd: float
+    body: str
+    division: str
+    previous: int
+    entered: int
+
+    @property
+    def name(self) -> str:
+        """Name of the entered sign or nakshatra."""
+        return DIVISIONS[self.division][1][self.entered]
+
+    @property
+    def retrograde(self) -> bool:
+        """True when the graha moved backwards into the new division."""
+        count = len(DIVISIONS[self.division][1])
+        return (self.entered - self.previous) % count != 1
+
+
+def _find_ingresses(
+    body: str, width: float, start: float, end: float, ayanamsa: str, node: str
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Return ``(times, entered, initial)`` for one graha and division."""
+    step = _STEP_DAYS[body]
+    grid = np.append(np.arange(start, end, step), end - 1e-6)
+    index = (graha_longitudes(body, grid, ayanamsa, node)[0] // width).astype(np.int64)
+    changed = np.flatnonzero(index[1:] != index[:-1])
+
+    lo = grid[changed]
+    hi = grid[changed + 1]
+    before = index[changed]
+    for _ in range(_BISECT_ITERATIONS):
+        mid = (lo + hi) / 2.0
+        same = (graha_longitudes(body, mid, ayanamsa, node)[0] // width).astype(np.int64) == before
+        lo = np.where(same, mid, lo)
+        hi = np.where(same, hi, mid)
+    return hi, index[changed + 1].astype(np.int8), int(index[0])
+
+
+class IngressIndex:
+    """Sorted ingress instants per graha and division.
+
+    ``tables[(body, division)]`` holds ``(times, entered, initial)``:
+    Julian days of each ingress, the division entered at each one, and
+    the division occupied at :attr:`start_jd`.
+    """
+
+    def __init__(
+        self,
+        start_jd: float,
+        end_jd: float,
+        ayanamsa: str,
+        node: str,
+        tables: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray, int]],
+    ):
+        self.start_jd = start_jd
+        self.end_jd = end_jd
+        self.ayanamsa = ayanamsa
+        self.node = node
+        self.tables = tables
+        # Plain lists make scalar lookups a C-level bisect without NumPy overhead.
+        self._times: Dict[Tuple[str, str], List[float]] = {
+            key: times.tolist() for key, (times, _, _) in tables.items()
+        }
+
+    @classmethod
+    def build(
+        cls,
+        start_jd: float = START_JD,
+        end_jd: float = END_JD,
+        ayanamsa: str = DEFAULT_AYANAMSA,
+        node: str = DEFAULT_NODE,
+    ) -> "IngressIndex":
+        """Compute every ingress between ``start_jd`` and ``end_jd``."""
+        tables = {}
+        for body in GRAHAS:
+            for division, (width, _) in DIVISIONS.items():
+                tables[(body, division)] = _find_ingresses(body, width, start_jd, end_jd, ayanamsa, node)
+        return cls(start_jd, end_jd, ayanamsa.upper(), node.upper(), tables)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, path: str) -> None:
+        arrays = {
+            "meta": np.array([self.start_jd, self.end_jd]),
+            "labels": np.array([self.ayanamsa, self.node]),
+        }
+        for (body, division), (times, entered, initial) in self.tables.items():
+            arrays[f"{body}.{division}.times"] = times
+            arrays[f"{body}.{division}.entered"] = entered
+            arrays[f"{body}.{division}.initial"] = np.array(initial)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IngressIndex":
+        with np.load(path) as data:
+            start_jd, end_jd = (float(v) for v in data["meta"])
+            ayanamsa, node = (str(v) for v in data["labels"])
+            tables = {
+                (body, division): (
+                    data[f"{body}.{division}.times"],
+                    data[f"{body}.{division}.entered"],
+                    int(data[f"{body}.{division}.initial"]),
+                )
+                for body in GRAHAS
+                for division in DIVISIONS
+            }
+        return cls(start_jd, end_jd, ayanamsa, node, tables)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _check_range(self, jd: float) -> None:
+        if not self.start_jd <= jd < self.end_jd:
+            raise ValueError(f"Julian day {jd} is outside the ingress index range")
+
+    def division_at(self, body: str, jd: float, division: str = "SIGN") -> int:
+        """Return the division index occupied by ``body`` at ``jd``."""
+        self._check_range(jd)
+        key = (body, division)
+        i = bisect_right(self._times[key], jd)
+        _, entered, initial = self.tables[key]
+        return int(entered[i - 1]) if i else initial
+
+    def divisions_at(self, body: str, jd: np.ndarray, division: str = "SIGN") -> np.ndarray:
+        """Vectorised :meth:`division_at` for an array of Julian days."""
+        jd = np.asarray(jd, dtype=np.float64)
+        if len(jd) and (jd.min() < self.start_jd or jd.max() >= self.end_jd):
+            raise ValueError("Julian days outside the ingress index range")
+        times, entered, initial = self.tables[(body, division)]
+        i = np.searchsorted(times, jd, side="right")
+        lookup = np.concatenate(([initial], entered)).astype(np.int8)
+        return lookup[i]
+
+    def sign_at(self, body: str, jd: float) -> str:
+        """Return the sign name occupied by ``body`` at ``jd``."""
+        return SIGNS[self.division_at(body, jd, "SIGN")]
+
+    def nakshatra_at(self, body: str, jd: float) -> str:
+        """Return the nakshatra name occupied by ``body`` at ``jd``."""
+        return NAKSHATRAS[self.division_at(body, jd, "NAKSHATRA")]
+
+    def ingresses(self, body: str, start_jd: float, end_jd: float, division: str = "SIGN") -> List[Ingress]:
+        """Return every ingress of ``body`` with ``start_jd <= jd < end_jd``."""
+        key = (body, division)
+        lo = bisect_right(self._times[key], start_jd - 1e-9)
+        hi = bisect_right(self._times[key], end_jd - 1e-9)
+        return [self._ingress(key, i) for i in range(lo, hi)]
+
+    def _ingress(self, key: Tuple[str, str], i: int) -> Ingress:
+        times, entered, initial = self.tables[key]
+        previous = int(entered[i - 1]) if i else initial
+        return Ingress(float(times[i]), key[0], key[1], previous, int(entered[i]))
+
+    def next_ingress(self, body: str, jd: float, division: str = "SIGN") -> Optional[Ingress]:
+        """Return the first ingress of ``body`` strictly after ``jd``."""
+        key = (body, division)
+        i = bisect_right(self._times[key], jd)
+        return self._ingress(key, i) if i < len(self._times[key]) else None
+
+    def previous_ingress(self, body: str, jd: float, division: str = "SIGN") -> Optional[Ingress]:
+        """Return the last ingress of ``body`` at or before ``jd``."""
+        key = (body, division)
+        i = bisect_right(self._times[key], jd)
+        return self._ingress(key, i - 1) if i else None
+
+
+_index: Optional[IngressIndex] = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def _load_default(path: str) -> Optional[IngressIndex]:
+    if not os.path.exists(path):
+        logger.info("Ingress index %s not built; transits will sample the ephemeris", path)
+        return None
+    try:
+        index = IngressIndex.load(path)
+    except (OSError, KeyError, ValueError):
+        logger.warning("Ingress index %s is unreadable", path)
+        return None
+    if (index.start_jd, index.end_jd, index.ayanamsa, index.node) != (START_JD, END_JD, DEFAULT_AYANAMSA, DEFAULT_NODE):
+        logger.warning("Ingress index %s was built for another range or node", path)
+        return None
+    return index
+
+
+def get_ingress_index() -> Optional[IngressIndex]:
+    """Return the default index, loading it on first use, or ``None`` when it has not been built.
+
+    Never builds the index: that belongs to the command line, not to a
+    server process.
+    """
+    global _index, _index_loaded
+    if not _index_loaded:
+        with _index_lock:
+            if not _index_loaded:
+                _index = _load_default(DEFAULT_INDEX)
+                _index_loaded = True
+    return _index
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prebuild the sign and nakshatra ingress index.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--output", default=DEFAULT_INDEX)
+    args = parser.parse_args()
+    IngressIndex.build().save(args.output)
+    print(f"Ingress index written to {args.output}")
@@ -0,0 +1,277 @@
+"""One-to-many matchmaking index for JyotishAI.
+
+Scoring a profile against a large candidate pool one pair at a time
+recomputes both charts per pair.  :class:`MatchIndex` instead stores the
+few chart features Ashtakoota needs column-wise – Moon nakshatra, Moon
+sign and the manglik flag, alongside each profile's role (groom or
+bride) – and scores the whole pool with one gather
+from a precomputed (27·12)×(27·12) table of guna totals.  Top matches
+are selected with ``argpartition`` so only ``k`` rows are ever sorted.
+A search for a groom only considers brides and vice versa.
+
+An index is built from NDJSON profiles with::
+
+    python -m services.matchmaking build profiles.ndjson data/matches.npz
+
+and served from the path in ``JYOTISHAI_MATCH_INDEX``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from services.ashtakoota import KOOTAS, koota_scores
+from services.chart_snapshot import ChartSnapshot
+from services.ephemeris import BODY_INDEX, NAKSHATRA_SPAN, Birth, compute_charts
+
+logger = logging.getLogger(__name__)
+
+MATCH_INDEX_PATH = os.getenv("JYOTISHAI_MATCH_INDEX")
+
+# Mars in these whole-sign houses from the ascendant gives manglik dosha.
+MANGLIK_HOUSES = (1, 2, 4, 7, 8, 12)
+_MANGLIK_MASK = np.zeros(12, dtype=bool)
+_MANGLIK_MASK[[h - 1 for h in MANGLIK_HOUSES]] = True
+
+# GUNA_TOTALS[groom_nakshatra, groom_sign, bride_nakshatra, bride_sign]
+GUNA_TOTALS = koota_scores(
+    np.arange(27)[:, None, None, None],
+    np.arange(12)[None, :, None, None],
+    np.arange(27)[None, None, :, None],
+    np.arange(12)[None, None, None, :],
+).sum(axis=-1).astype(np.float32)
+
+_BUILD_BATCH = 10000
+
+ROLES = ("groom", "bride")
+
+
+def manglik_dosha(mars_house) -> np.ndarray:
+    """True where Mars occupies a manglik house (1–12, from the ascendant)."""
+    return _MANGLIK_MASK[np.asarray(mars_house, dtype=np.int64) - 1]
+
+
+def groom_flags(roles: Sequence[str]) -> np.ndarray:
+    """Map ``"groom"``/``"bride"`` roles to the boolean ``grooms`` column."""
+    roles = [str(role).strip().lower() for role in roles]
+    unknown = sorted(set(roles) - set(ROLES))
+    if unknown:
+        raise ValueError(f"Unknown roles: {', '.join(map(repr, unknown))}; expected groom or bride")
+    return np.array([role == "groom" for role in roles], dtype=bool)
+
+
+@dataclass
+class Match:
+    """One candidate returned by :meth:`MatchIndex.search`."""
+
+    id: str
+    total: float
+    scores: Dict[str, float]
+    manglik: bool
+
+
+class MatchIndex:
+    """Column-wise store of candidate roles, Moon placements and manglik flags.
+
+    ``grooms`` is true for profiles indexed as grooms and false for brides.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        grooms: np.ndarray,
+        nakshatras: np.ndarray,
+        signs: np.ndarray,
+        manglik: np.ndarray,
+    ):
+        self.ids = np.asarray(ids, dtype=str)
+        self.grooms = np.asarray(grooms, dtype=bool)
+        self.nakshatras = np.asarray(nakshatras, dtype=np.uint8)
+        self.signs = np.asarray(signs, dtype=np.uint8)
+        self.manglik = np.asarray(manglik, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def pool_size(self, as_groom: bool = True) -> int:
+        """Number of candidates a search for a groom (or a bride) considers."""
+        return int(np.count_nonzero(self.grooms != as_groom))
+
+    @classmethod
+    def from_snapshots(
+        cls, ids: Sequence[str], roles: Sequence[str], snapshots: Sequence[ChartSnapshot]
+    ) -> "MatchIndex":
+        return cls(
+            ids,
+            groom_flags(roles),
+            [s.nakshatra_index("MOON") for s in snapshots],
+            [s.sign_index("MOON") for s in snapshots],
+            [bool(manglik_dosha(s.house("MARS"))) for s in snapshots],
+        )
+
+    @classmethod
+    def from_births(cls, ids: Sequence[str], roles: Sequence[str], births: Sequence[Birth]) -> "MatchIndex":
+        """Compute candidate columns with the batch ephemeris engine."""
+        parts = []
+        for start in range(0, len(births), _BUILD_BATCH):
+            arrays = compute_charts(births[start:start + _BUILD_BATCH])
+            moon = arrays.longitudes[:, BODY_INDEX["MOON"]]
+            signs = arrays.signs
+            mars_house = (signs[:, BODY_INDEX["MARS"]] - signs[:, BODY_INDEX["ASC"]]) % 12 + 1
+            parts.append(
+                ((moon // NAKSHATRA_SPAN).astype(np.int64) % 27, signs[:, BODY_INDEX["MOON"]], manglik_dosha(mars_house))
+            )
+        if not parts:
+            return cls([], [], [], [], [])
+        nakshatras, signs, manglik = (np.concatenate(column) for column in zip(*parts))
+        return cls(ids, groom_flags(roles), nakshatras, signs, manglik)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                ids=self.ids,
+                grooms=self.grooms,
+                nakshatras=self.nakshatras,
+                signs=self.signs,
+                manglik=self.manglik,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "MatchIndex":
+        with np.load(path) as data:
+            if "grooms" not in data:
+                raise ValueError(f"Match index {path} has no role column; rebuild it")
+            return cls(data["ids"], data["grooms"], data["nakshatras"], data["signs"], data["manglik"])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def scores(self, nakshatra: int, sign: int, as_groom: bool = True) -> np.ndarray:
+        """Guna totals of the query Moon against every candidate."""
+        if as_groom:
+            table = GUNA_TOTALS[nakshatra, sign]
+        else:
+            table = GUNA_TOTALS[:, :, nakshatra, sign]
+        return table[self.nakshatras, self.signs]
+
+    def search(
+        self,
+        nakshatra: int,
+        sign: int,
+        as_groom: bool = True,
+        k: int = 10,
+        min_score: float = 0.0,
+        exclude_manglik: bool = False,
+    ) -> List[Match]:
+        """Return the ``k`` best candidates of the opposite role passing the filters, best first."""
+        scores = self.scores(nakshatra, sign, as_groom)
+        keep = (self.grooms != as_groom) & (scores >= min_score)
+        if exclude_manglik:
+            keep &= ~self.manglik
+        candidates = np.flatnonzero(keep)
+        if len(candidates) > k:
+            top = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[top]
+        # Highest score first; ties keep index order.
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+
+        n, s = self.nakshatras[candidates], self.signs[candidates]
+        if as_groom:
+            detail = koota_scores(nakshatra, sign, n, s)
+        else:
+            detail = koota_scores(n, s, nakshatra, sign)
+        return [
+            Match(
+                id=str(self.ids[i]),
+                total=float(scores[i]),
+                scores={koota: float(v) for koota, v in zip(KOOTAS, row)},
+                manglik=bool(self.manglik[i]),
+            )
+            for i, row in zip(candidates.tolist(), detail.tolist())
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_match_index() -> Optional[MatchIndex]:
+    """Return the index configured by ``JYOTISHAI_MATCH_INDEX``, if any."""
+    if not MATCH_INDEX_PATH or not os.path.exists(MATCH_INDEX_PATH):
+        return None
+    return MatchIndex.load(MATCH_INDEX_PATH)
+
+
+# ----------------------------------------------------------------------
+# Command line
+# ----------------------------------------------------------------------
+def read_profiles(path: str) -> Iterator[Dict[str, object]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def profile_births(profiles: Iterable[Dict[str, object]]):
+    """Resolve NDJSON profiles (``id``, ``role``, ``birth_date``, ``birth_time``, ``location``) to births.
+
+    Returns ``(ids, roles, births)``; ``role`` is only needed to build a
+    :class:`MatchIndex`.  Raises :class:`~services.geocoder.UnknownLocation`
+    for a location missing from the gazetteer.
+    """
+    from services.chart_engine import parse_birth_moment
+    from services.geocoder import require_location
+    from services.timezones import parse_utc_offset, resolve_utc_offset
+
+    ids, roles, births = [], [], []
+    for profile in profiles:
+        place = require_location(str(profile["location"]))
+        offset = parse_utc_offset(profile.get("utc_offset"))
+        if offset is None:
+            offset = resolve_utc_offset(place.timezone, profile["birth_date"], profile["birth_time"])
+        ids.append(str(profile["id"]))
+        roles.append(str(profile.get("role", "")))
+        births.append(
+            Birth(
+                parse_birth_moment(profile["birth_date"], profile["birth_time"], offset),
+                place.latitude,
+                place.longitude,
+            )
+        )
+    return ids, roles, births
+
+
+def main(argv=None) -> None:
+    from services.geocoder import UnknownLocation
+
+    parser = argparse.ArgumentParser(description="Build a matchmaking index from NDJSON profiles.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build")
+    build_cmd.add_argument("profiles", help="NDJSON file with id, role, birth_date, birth_time, location[, utc_offset]")
+    build_cmd.add_argument("output", help="path of the .npz index to write")
+    args = parser.parse_args(argv)
+    try:
+        ids, roles, births = profile_births(read_profiles(args.profiles))
+    except UnknownLocation as exc:
+        parser.error(str(exc))
+    index = MatchIndex.from_births(ids, roles, births)
+    index.save(args.output)
+    print(f"indexed {len(index)} profiles into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
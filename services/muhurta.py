@@ -0,0 +1,293 @@
+"""Muhurta (auspicious window) search for JyotishAI.
+
+A :class:`MuhurtaRules` set restricts tithi, nakshatra, vara and lagna
+and may exclude Rahu kaal.  :func:`search_muhurta` splits the date range
+into runs of whole varas (sunrise to sunrise, so no window ever spans
+two chunks) and evaluates the chunks in a process pool.  Each worker
+samples its chunk on a coarse grid, keeps the runs where every rule
+holds and refines both edges of each run by bisection.  Windows are
+yielded chunk by chunk as workers finish, so the first results arrive
+long before a multi-year search is done.
+
+The pool size comes from ``JYOTISHAI_MUHURTA_WORKERS`` (default 2).
+Every API process has its own pool, so the total is that many times the
+number of server workers.  The pool is started by the first search and
+uses the ``forkserver`` start method, since a request thread must not
+fork a multi-threaded server; :func:`shutdown_executor` stops it.
+"""
+
+from __future__ import annotations
+
+import heapq
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from services.ephemeris import SIGNS, NAKSHATRAS, ascendant_longitudes
+from services.panchang import KARANAS, VARAS, VedicDay, panchang_indices, vedic_days
+
+MUHURTA_WORKERS = max(int(os.getenv("JYOTISHAI_MUHURTA_WORKERS", "2")), 1)
+
+DAYS_PER_CHUNK = 7
+COARSE_MINUTES = 10.0
+# Halving a 10-minute bracket 6 times pins an edge to about 10 seconds.
+_REFINE_ITERATIONS = 6
+
+# Tithis (1-30) that are avoided for new undertakings: the Rikta tithis
+# and the new Moon.
+RIKTA_TITHIS = (4, 9, 14, 19, 24, 29, 30)
+_VISHTI = KARANAS.index("VISHTI")
+
+
+@dataclass(frozen=True)
+class MuhurtaRules:
+    """Constraints every instant of a window must satisfy.
+
+    ``None`` leaves an element unrestricted.  Tithis are numbered 1–30
+    (Shukla Pratipada to Amavasya); the other elements use the upper-case
+    names in :data:`~services.ephemeris.NAKSHATRAS`,
+    :data:`~services.panchang.VARAS` and :data:`~services.ephemeris.SIGNS`.
+    """
+
+    tithis: Optional[Tuple[int, ...]] = None
+    nakshatras: Optional[Tuple[str, ...]] = None
+    varas: Optional[Tuple[str, ...]] = None
+    lagnas: Optional[Tuple[str, ...]] = None
+    avoid_rahu_kaal: bool = True
+    min_minutes: float = 30.0
+
+    def validate(self) -> None:
+        """Raise :class:`ValueError` naming any unknown element."""
+        unknown = [str(t) for t in self.tithis or () if not 1 <= t <= 30]
+        for values, names in ((self.nakshatras, NAKSHATRAS), (self.varas, VARAS), (self.lagnas, SIGNS)):
+            unknown += [v for v in values or () if v not in names]
+        if unknown:
+            raise ValueError(f"Unknown panchang elements: {', '.join(unknown)}")
+
+
+@dataclass(order=True)
+class MuhurtaWindow:
+    """An interval (Julian days, UT) in which every rule holds.
+
+    The panchang elements are those at the window's midpoint.
+    """
+
+    score: float
+    start: float = field(compare=False)
+    end: float = field(compare=False)
+    tithi: int = field(compare=False)
+    nakshatra: str = field(compare=False)
+    vara: str = field(compare=False)
+    lagna: str = field(compare=False)
+
+    @property
+    def minutes(self) -> float:
+        return (self.end - self.start) * 1440.0
+
+
+class _Mask:
+    """Vectorised rule check for one chunk of varas at one place."""
+
+    def __init__(self, days: Sequence[VedicDay], lat: float, lon: float, rules: MuhurtaRules):
+        self.lat, self.lon, self.rules = lat, lon, rules
+        self.sunrises = np.array([d.sunrise for d in days])
+        self.varas = np.array([d.vara for d in days])
+        self.rahu = np.array([d.rahu_kaal for d in days])
+        self.tithis = _index_set(t - 1 for t in rules.tithis) if rules.tithis else None
+        self.nakshatras = _index_set(map(NAKSHATRAS.index, rules.nakshatras)) if rules.nakshatras else None
+        self.allowed_varas = _index_set(map(VARAS.index, rules.varas)) if rules.varas else None
+        self.lagnas = _index_set(map(SIGNS.index, rules.lagnas)) if rules.lagnas else None
+
+    def elements(self, jd: np.ndarray) -> Dict[str, np.ndarray]:
+        values = panchang_indices(jd)
+        day = np.clip(np.searchsorted(self.sunrises, jd, side="right") - 1, 0, len(self.sunrises) - 1)
+        values["day"] = day
+        values["vara"] = self.varas[day]
+        if self.lagnas is not None:
+            values["lagna"] = (ascendant_longitudes(jd, self.lat, self.lon) // 30.0).astype(np.int64) % 12
+        return values
+
+    def __call__(self, jd: np.ndarray) -> np.ndarray:
+        values = self.elements(jd)
+        ok = np.ones(len(jd), dtype=bool)
+        for key, allowed in (
+            ("tithi", self.tithis),
+            ("nakshatra", self.nakshatras),
+            ("vara", self.allowed_varas),
+            ("lagna", self.lagnas),
+        ):
+            if allowed is not None:
+                ok &= allowed[values[key]]
+        if self.rules.avoid_rahu_kaal:
+            rahu = self.rahu[values["day"]]
+            ok &= ~((jd >= rahu[:, 0]) & (jd < rahu[:, 1]))
+        return ok
+
+
+def _index_set(indices) -> np.ndarray:
+    mask = np.zeros(30, dtype=bool)
+    mask[list(indices)] = True
+    return mask
+
+
+def _refine(mask: _Mask, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Bisect each bracket to the instant the mask changes; returns the right edges."""
+    initial = mask(lo)
+    for _ in range(_REFINE_ITERATIONS):
+        mid = (lo + hi) / 2.0
+        still = mask(mid) == initial
+        lo = np.where(still, mid, lo)
+        hi = np.where(still, hi, mid)
+    return hi
+
+
+def score_window(tithi: int, karana: int, minutes: float) -> float:
+    """Rank windows: waxing Moon and longer windows score higher;
+    Rikta tithis, Amavasya and Vishti karana lower."""
+    score = min(minutes, 120.0) / 60.0
+    if tithi <= 15:
+        score += 1.0
+    if tithi in RIKTA_TITHIS:
+        score -= 1.0
+    if karana == _VISHTI:
+        score -= 1.0
+    return round(score, 3)
+
+
+def search_chunk(
+    days: Sequence[VedicDay],
+    lat: float,
+    lon: float,
+    rules: MuhurtaRules,
+    start_jd: float,
+    end_jd: float,
+) -> List[MuhurtaWindow]:
+    """Find the windows inside ``days`` clipped to ``[start_jd, end_jd)``."""
+    lo_jd = max(days[0].sunrise, start_jd)
+    hi_jd = min(days[-1].next_sunrise, end_jd)
+    if hi_jd <= lo_jd:
+        return []
+    mask = _Mask(days, lat, lon, rules)
+    step = min(COARSE_MINUTES, rules.min_minutes / 2.0) / 1440.0
+    grid = np.append(np.arange(lo_jd, hi_jd, step), hi_jd)
+    ok = mask(grid)
+    # Coarse pass: runs of passing samples; fine pass: bisect each edge.
+    edges = np.flatnonzero(ok[1:] != ok[:-1])
+    refined = _refine(mask, grid[edges], grid[edges + 1]) if len(edges) else edges
+    rises = [refined[i] for i, e in enumerate(edges) if ok[e + 1]]
+    falls = [refined[i] for i, e in enumerate(edges) if ok[e]]
+    if ok[0]:
+        rises.insert(0, lo_jd)
+    if ok[-1]:
+        falls.append(hi_jd)
+    # Windows never cross a sunrise: the vara changes there.
+    sunrises = [d.sunrise for d in days[1:] if lo_jd < d.sunrise < hi_jd]
+    spans = []
+    for start, end in zip(rises, falls):
+        cuts = [s for s in sunrises if start < s < end]
+        bounds = [start] + cuts + [end]
+        spans.extend(zip(bounds, bounds[1:]))
+    spans = [(s, e) for s, e in spans if (e - s) * 1440.0 >= rules.min_minutes]
+    if not spans:
+        return []
+
+    mid = np.array([(s + e) / 2.0 for s, e in spans])
+    values = mask.elements(mid)
+    lagnas = values.get("lagna")
+    if lagnas is None:
+        lagnas = (ascendant_longitudes(mid, lat, lon) // 30.0).astype(np.int64) % 12
+    windows = []
+    for i, (start, end) in enumerate(spans):
+        tithi = int(values["tithi"][i]) + 1
+        windows.append(
+            MuhurtaWindow(
+                score=score_window(tithi, int(values["karana"][i]), (end - start) * 1440.0),
+                start=float(start),
+                end=float(end),
+                tithi=tithi,
+                nakshatra=NAKSHATRAS[values["nakshatra"][i]],
+                vara=VARAS[values["vara"][i]],
+                lagna=SIGNS[lagnas[i]],
+            )
+        )
+    return windows
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the search pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=MUHURTA_WORKERS, mp_context=multiprocessing.get_context("forkserver")
+            )
+        return _pool
+
+
+def shutdown_executor() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def search_muhurta(
+    start_jd: float,
+    end_jd: float,
+    lat: float,
+    lon: float,
+    rules: MuhurtaRules,
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> Iterator[List[MuhurtaWindow]]:
+    """Yield the windows of each chunk, best first, as the pool finishes them.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    for long ranges; closing the generator cancels the chunks not yet
+    started.
+    """
+    rules.validate()
+    executor = executor or get_executor()
+    days = vedic_days(start_jd, end_jd, lat, lon)
+    chunks = (days[i:i + DAYS_PER_CHUNK] for i in range(0, len(days), DAYS_PER_CHUNK))
+    limit = 2 * getattr(executor, "_max_workers", MUHURTA_WORKERS)
+    pending: Set[Future] = set()
+    try:
+        while True:
+            for chunk in chunks:
+                pending.add(executor.submit(search_chunk, chunk, lat, lon, rules, start_jd, end_jd))
+                if len(pending) >= limit:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                windows = future.result()
+                if windows:
+                    yield sorted(windows, reverse=True)
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def best_windows(results: Iterable[List[MuhurtaWindow]], limit: int) -> List[MuhurtaWindow]:
+    """Keep the ``limit`` best windows of :func:`search_muhurta` output."""
+    heap: List[Tuple[float, float, MuhurtaWindow]] = []
+    for windows in results:
+        for window in windows:
+            # Earlier windows win ties.
+            item = (window.score, -window.start, window)
+            if len(heap) < limit:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+    return [item[2] for item in sorted(heap, key=lambda item: item[:2], reverse=True)]
@@ -0,0 +1,319 @@
+"""Panchang elements for JyotishAI.
+
+The five limbs of the Hindu almanac are derived from the sidereal Sun
+and Moon:
+
+* tithi – each 12° of Moon–Sun elongation (30 per lunar month),
+* nakshatra – the Moon's 13°20′ lunar mansion,
+* yoga – each 13°20′ of the summed Sun and Moon longitudes,
+* karana – half a tithi (60 per lunar month),
+* vara – the weekday, which runs from one sunrise to the next.
+
+All functions take arrays of Julian days (UT) so a whole grid of
+instants is classified in one ephemeris pass.  Sunrise and sunset use
+the Hindu convention: centre of the disc, no refraction.
+
+:func:`panchang_year` returns a whole year's daily calendar for a place:
+the elements in force at sunrise with their end times (found by Newton
+iteration on the ephemeris), sunrise, sunset and Rahu kaal.  Years are
+computed once per grid cell of ``JYOTISHAI_PANCHANG_CELL_DEGREES``
+(default 0.1°, about half a minute of sunrise) and stored as small
+columnar ``.npz`` files under ``JYOTISHAI_PANCHANG_CACHE_DIR``.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from services.ephemeris import (
+    DEFAULT_AYANAMSA,
+    NAKSHATRA_SPAN,
+    NAKSHATRAS,
+    graha_longitudes,
+    julian_days,
+    use_ephe_path,
+)
+
+TITHI_SPAN = 12.0
+KARANA_SPAN = 6.0
+YOGA_SPAN = 360.0 / 27.0
+
+_TITHI_NAMES = (
+    "PRATIPADA", "DWITIYA", "TRITIYA", "CHATURTHI", "PANCHAMI", "SHASHTHI", "SAPTAMI",
+    "ASHTAMI", "NAVAMI", "DASHAMI", "EKADASHI", "DWADASHI", "TRAYODASHI", "CHATURDASHI",
+)
+# Index 0 = Shukla Pratipada (tithi 1), 14 = Purnima, 29 = Amavasya.
+TITHIS = (
+    tuple(f"SHUKLA_{name}" for name in _TITHI_NAMES) + ("PURNIMA",)
+    + tuple(f"KRISHNA_{name}" for name in _TITHI_NAMES) + ("AMAVASYA",)
+)
+YOGAS = (
+    "VISHKUMBHA", "PRITI", "AYUSHMAN", "SAUBHAGYA", "SHOBHANA", "ATIGANDA", "SUKARMA",
+    "DHRITI", "SHULA", "GANDA", "VRIDDHI", "DHRUVA", "VYAGHATA", "HARSHANA", "VAJRA",
+    "SIDDHI", "VYATIPATA", "VARIYAN", "PARIGHA", "SHIVA", "SIDDHA", "SADHYA", "SHUBHA",
+    "SHUKLA", "BRAHMA", "INDRA", "VAIDHRITI",
+)
+_MOVABLE_KARANAS = ("BAVA", "BALAVA", "KAULAVA", "TAITILA", "GARA", "VANIJA", "VISHTI")
+# Index 0 is the first half of Shukla Pratipada.
+KARANAS = ("KIMSTUGHNA",) + _MOVABLE_KARANAS * 8 + ("SHAKUNI", "CHATUSHPADA", "NAGA")
+VARAS = ("SUNDAY", "MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY")
+
+# Which eighth of daytime (0-based) is Rahu kaal, by vara from Sunday.
+RAHU_KAAL_SEGMENT = (7, 1, 6, 4, 5, 3, 2)
+
+_RISE_FLAGS = swe.BIT_HINDU_RISING
+
+ELEMENTS = ("tithi", "nakshatra", "yoga", "karana")
+_SPANS = {"tithi": TITHI_SPAN, "nakshatra": NAKSHATRA_SPAN, "yoga": YOGA_SPAN, "karana": KARANA_SPAN}
+# Newton steps for end times; each one roughly squares the error, and
+# the first guess from the current rate is already within minutes.
+_NEWTON_ITERATIONS = 4
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+PANCHANG_CACHE_DIR = os.getenv("JYOTISHAI_PANCHANG_CACHE_DIR", os.path.join(_DATA_DIR, "panchang"))
+PANCHANG_CELL_DEGREES = float(os.getenv("JYOTISHAI_PANCHANG_CELL_DEGREES", "0.1"))
+# Bump when the stored columns or their meaning change.
+_CACHE_VERSION = 1
+_UNIX_EPOCH_JD = 2440587.5
+
+
+def panchang_indices(jd, ayanamsa: str = DEFAULT_AYANAMSA) -> Dict[str, np.ndarray]:
+    """Return tithi, nakshatra, yoga and karana indices at each instant."""
+    jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+    sun = graha_longitudes("SUN", jd, ayanamsa)[0]
+    moon = graha_longitudes("MOON", jd, ayanamsa)[0]
+    elongation = (moon - sun) % 360.0
+    return {
+        "tithi": (elongation // TITHI_SPAN).astype(np.int64) % 30,
+        "nakshatra": (moon // NAKSHATRA_SPAN).astype(np.int64) % 27,
+        "yoga": (((sun + moon) % 360.0) // YOGA_SPAN).astype(np.int64) % 27,
+        "karana": (elongation // KARANA_SPAN).astype(np.int64) % 60,
+    }
+
+
+def _angle_and_rate(element: str, jd: np.ndarray, ayanamsa: str) -> Tuple[np.ndarray, np.ndarray]:
+    """The angle an element divides and its daily rate of change."""
+    moon, moon_speed = graha_longitudes("MOON", jd, ayanamsa)
+    if element == "nakshatra":
+        return moon, moon_speed
+    sun, sun_speed = graha_longitudes("SUN", jd, ayanamsa)
+    if element == "yoga":
+        return (sun + moon) % 360.0, sun_speed + moon_speed
+    return (moon - sun) % 360.0, moon_speed - sun_speed
+
+
+def element_end_times(element: str, jd, index, ayanamsa: str = DEFAULT_AYANAMSA) -> np.ndarray:
+    """Return when element ``index`` (in force at ``jd``) ends.
+
+    ``element`` is one of :data:`ELEMENTS`; both arguments may be arrays.
+    The boundary angle is found by Newton iteration on the ephemeris.
+    """
+    jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+    target = (np.asarray(index, dtype=np.float64) + 1.0) * _SPANS[element] % 360.0
+    # The first step always moves forward to the boundary ahead.
+    angle, rate = _angle_and_rate(element, jd, ayanamsa)
+    t = jd + (target - angle) % 360.0 / rate
+    for _ in range(_NEWTON_ITERATIONS - 1):
+        angle, rate = _angle_and_rate(element, t, ayanamsa)
+        t = t + ((target - angle + 180.0) % 360.0 - 180.0) / rate
+    return t
+
+
+def _local_mean_midnight(day: date, lon: float) -> float:
+    """Julian day (UT) of local mean-solar midnight starting ``day``."""
+    midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    return float(julian_days([midnight])[0]) - lon / 360.0
+
+
+def civil_weekday(jd, longitude: float = 0.0) -> np.ndarray:
+    """Weekday (0 = Sunday) of the local mean-solar date containing ``jd``."""
+    jd = np.asarray(jd, dtype=np.float64)
+    return (np.floor(jd + 0.5 + longitude / 360.0).astype(np.int64) + 1) % 7
+
+
+def _next_event(jd: float, lat: float, lon: float, rsmi: int) -> Optional[float]:
+    use_ephe_path()
+    status, times = swe.rise_trans(jd, swe.SUN, lon, lat, rsmi=rsmi | _RISE_FLAGS)
+    return times[0] if status[0] == 0 else None
+
+
+@dataclass(frozen=True)
+class VedicDay:
+    """One vara, from ``sunrise`` to ``next_sunrise`` (Julian days, UT).
+
+    Where the Sun does not rise or set (polar day and night) local mean
+    06:00 and 18:00 stand in for sunrise and sunset.
+    """
+
+    sunrise: float
+    sunset: float
+    next_sunrise: float
+    vara: int
+
+    @property
+    def rahu_kaal(self) -> Tuple[float, float]:
+        eighth = (self.sunset - self.sunrise) / 8.0
+        start = self.sunrise + RAHU_KAAL_SEGMENT[self.vara] * eighth
+        return start, start + eighth
+
+
+def vedic_days(start_jd: float, end_jd: float, lat: float, lon: float) -> List[VedicDay]:
+    """Return every vara overlapping ``[start_jd, end_jd)`` at a place."""
+    # Local mean midnight before the range, less a day so the vara in
+    # progress at ``start_jd`` is included.
+    midnight = np.floor(start_jd + 0.5 + lon / 360.0) - 0.5 - lon / 360.0 - 1.0
+    sunrises = []
+    day = midnight
+    while not sunrises or sunrises[-1][0] < end_jd:
+        rise = _next_event(day, lat, lon, swe.CALC_RISE)
+        if rise is None or rise >= day + 1.0:
+            rise, sunset = day + 0.25, day + 0.75
+        else:
+            sunset = _next_event(rise, lat, lon, swe.CALC_SET)
+            if sunset is None or sunset >= day + 1.5:
+                sunset = day + 0.75
+        sunrises.append((rise, sunset))
+        day += 1.0
+    days = []
+    for (rise, sunset), (next_rise, _) in zip(sunrises, sunrises[1:]):
+        if next_rise > start_jd:
+            days.append(VedicDay(rise, sunset, next_rise, int(civil_weekday(rise, lon))))
+    return days
+
+
+@dataclass(frozen=True)
+class PanchangYear:
+    """Daily panchang for one year at one place, stored column-wise.
+
+    Row ``i`` is the vara beginning at ``sunrise[i]``; times are Julian
+    days (UT).  ``elements[name]`` holds the index in force at sunrise
+    and ``ends[name]`` the moment it ends, which may be before or after
+    the next sunrise.
+    """
+
+    year: int
+    latitude: float
+    longitude: float
+    dates: np.ndarray  # days since 1970-01-01 of the local date of each sunrise
+    sunrise: np.ndarray
+    sunset: np.ndarray
+    vara: np.ndarray
+    rahu_kaal: np.ndarray  # (n, 2) start and end
+    elements: Dict[str, np.ndarray]
+    ends: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @classmethod
+    def compute(cls, year: int, lat: float, lon: float, ayanamsa: str = DEFAULT_AYANAMSA) -> "PanchangYear":
+        start = _local_mean_midnight(date(year, 1, 1), lon)
+        end = _local_mean_midnight(date(year + 1, 1, 1), lon)
+        days = [d for d in vedic_days(start, end, lat, lon) if start <= d.sunrise < end]
+        sunrise = np.array([d.sunrise for d in days])
+        indices = panchang_indices(sunrise, ayanamsa)
+        return cls(
+            year=year,
+            latitude=lat,
+            longitude=lon,
+            dates=np.floor(sunrise + 0.5 + lon / 360.0 - _UNIX_EPOCH_JD).astype(np.int32),
+            sunrise=sunrise,
+            sunset=np.array([d.sunset for d in days]),
+            vara=np.array([d.vara for d in days], dtype=np.uint8),
+            rahu_kaal=np.array([d.rahu_kaal for d in days]),
+            elements={name: indices[name].astype(np.uint8) for name in ELEMENTS},
+            ends={name: element_end_times(name, sunrise, indices[name], ayanamsa) for name in ELEMENTS},
+        )
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz")
+        columns = {f"{name}_end": self.ends[name] for name in ELEMENTS}
+        columns.update(self.elements)
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                meta=np.array([self.year, self.latitude, self.longitude]),
+                dates=self.dates,
+                sunrise=self.sunrise,
+                sunset=self.sunset,
+                vara=self.vara,
+                rahu_kaal=self.rahu_kaal,
+                **columns,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PanchangYear":
+        with np.load(path) as data:
+            year, lat, lon = data["meta"].tolist()
+            return cls(
+                year=int(year),
+                latitude=lat,
+                longitude=lon,
+                dates=data["dates"],
+                sunrise=data["sunrise"],
+                sunset=data["sunset"],
+                vara=data["vara"],
+                rahu_kaal=data["rahu_kaal"],
+                elements={name: data[name] for name in ELEMENTS},
+                ends={name: data[f"{name}_end"] for name in ELEMENTS},
+            )
+
+    def row(self, day: date) -> Optional[int]:
+        """Index of the row for a local date, or ``None`` outside the year."""
+        key = (day - date(1970, 1, 1)).days
+        i = int(np.searchsorted(self.dates, key))
+        return i if i < len(self.dates) and self.dates[i] == key else None
+
+    def day(self, i: int) -> Dict[str, object]:
+        """Row ``i`` as a dict of names and Julian days."""
+        result: Dict[str, object] = {
+            "date": date(1970, 1, 1) + timedelta(days=int(self.dates[i])),
+            "vara": VARAS[self.vara[i]],
+            "sunrise": float(self.sunrise[i]),
+            "sunset": float(self.sunset[i]),
+            "rahu_kaal": (float(self.rahu_kaal[i, 0]), float(self.rahu_kaal[i, 1])),
+        }
+        for name, names in (("tithi", TITHIS), ("nakshatra", NAKSHATRAS), ("yoga", YOGAS), ("karana", KARANAS)):
+            result[name] = names[self.elements[name][i]]
+            result[f"{name}_end"] = float(self.ends[name][i])
+        return result
+
+
+def grid_cell(lat: float, lon: float) -> Tuple[float, float]:
+    """Centre of the cache grid cell containing a place."""
+    size = PANCHANG_CELL_DEGREES
+    return (
+        round((np.floor(lat / size) + 0.5) * size, 6),
+        round((np.floor(lon / size) + 0.5) * size, 6),
+    )
+
+
+def _cache_path(year: int, cell: Tuple[float, float]) -> str:
+    name = f"v{_CACHE_VERSION}_{year}_{cell[0]:+.4f}_{cell[1]:+.4f}.npz"
+    return os.path.join(PANCHANG_CACHE_DIR, f"{PANCHANG_CELL_DEGREES:g}", name)
+
+
+@lru_cache(maxsize=256)
+def _cell_year(year: int, cell: Tuple[float, float]) -> PanchangYear:
+    path = _cache_path(year, cell)
+    if os.path.exists(path):
+        return PanchangYear.load(path)
+    calendar = PanchangYear.compute(year, *cell)
+    calendar.save(path)
+    return calendar
+
+
+def panchang_year(year: int, lat: float, lon: float) -> PanchangYear:
+    """Return the (cached) daily panchang for ``year`` at the grid cell of a place."""
+    return _cell_year(year, grid_cell(lat, lon))
@@ -0,0 +1,374 @@
+"""Shadbala and Bhava Bala engine for JyotishAI.
+
+Shadbala is the Parashari measure of the strength of the seven planets,
+the sum of six components expressed in virupas (60 virupas = 1 rupa):
+
+* sthana bala – positional strength: exaltation (uchcha), dignity in
+  the seven vargas (saptavargaja), odd/even sign in the rasi and navamsa
+  (ojhayugma), angularity (kendradi) and decanate (drekkana);
+* dig bala – directional strength, from the arc to the angle in which
+  each planet is strongest;
+* kala bala – temporal strength: day/night (nathonnata), lunar phase
+  (paksha), third of the day or night (tribhaga), lords of the year,
+  month, weekday and hour, and declination (ayana);
+* chesta bala – motional strength;
+* naisargika bala – the fixed natural strength of each planet;
+* drik bala – aspects received from benefics less those from malefics.
+
+Bhava Bala scores the twelve houses from the Shadbala of their lords,
+the kind of sign on each house midpoint and the aspects they receive.
+
+Everything is computed from the numeric chart (longitudes, speeds, the
+birth instant and place) with lookup tables and NumPy arithmetic, so the
+same functions serve one snapshot and a whole :class:`ChartArrays`
+batch.  A few simplifications keep the batch path closed-form:
+
+* sunrise and the hours of the day use local mean time and the Sun's
+  declination rather than a rise/set search, which is accurate to a few
+  minutes;
+* the year and month lords count 360-day years and 30-day months from
+  the Kali Yuga epoch;
+* chesta bala of Mars to Saturn grades the daily motion against the
+  planet's mean motion instead of using the seeghra kendra;
+* drik bala uses the whole-sign aspects of :mod:`services.aspects` at
+  full strength rather than graded aspects;
+* yuddha bala (planetary war) is not applied.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from services.aspects import aspect_matrix, graha_aspects, house_lords
+from services.dignities import EXALTATION_DEGREES, SIGN_LORDS
+from services.ephemeris import BODY_INDEX, DEFAULT_AYANAMSA, ChartArrays, sidereal_flags, swe_lock
+from services.vargas import VARGA_INDEX, varga_signs
+
+PLANETS = ("SUN", "MOON", "MARS", "MERCURY", "JUPITER", "VENUS", "SATURN")
+COMPONENTS = ("sthana", "dig", "kala", "chesta", "naisargika", "drik")
+BHAVA_COMPONENTS = ("adhipati", "dig", "drishti")
+VIRUPAS_PER_RUPA = 60.0
+
+# Minimum Shadbala, in rupas, for a planet to be considered strong.
+REQUIRED_RUPAS: Dict[str, float] = {
+    "SUN": 6.5,
+    "MOON": 6.0,
+    "MARS": 5.0,
+    "MERCURY": 7.0,
+    "JUPITER": 6.5,
+    "VENUS": 5.5,
+    "SATURN": 5.0,
+}
+
+_N = len(PLANETS)
+_SUN, _MOON, _MARS, _MERCURY, _JUPITER, _VENUS, _SATURN = range(_N)
+_ASC, _MC = BODY_INDEX["ASC"], BODY_INDEX["MC"]
+_OBLIQUITY = np.radians(23.44)
+_KALI_EPOCH_DAY = 588466  # civil day number of 18 February 3102 BCE, a Friday
+_CIRCLE = 360.0
+
+# ----------------------------------------------------------------------
+# Sthana bala
+# ----------------------------------------------------------------------
+_DEBILITATION = np.array([(EXALTATION_DEGREES[p] + 180.0) % _CIRCLE for p in PLANETS])
+
+# Natural relationships: +1 friend, 0 neutral, -1 enemy; row = planet.
+_NATURAL = np.array(
+    [
+        #  Su  Mo  Ma  Me  Ju  Ve  Sa
+        [0, 1, 1, 0, 1, -1, -1],  # Sun
+        [1, 0, 0, 1, 0, 0, 0],  # Moon
+        [1, 1, 0, -1, 1, 0, 0],  # Mars
+        [1, -1, 0, 0, 0, 1, 0],  # Mercury
+        [1, 1, 1, -1, 0, -1, 0],  # Jupiter
+        [-1, -1, 0, 1, 0, 0, 1],  # Venus
+        [-1, -1, -1, 1, 0, 1, 0],  # Saturn
+    ],
+    dtype=np.int64,
+)
+# Temporal friendship by the house (0 = same sign) of the other planet:
+# friends in the 2nd, 3rd, 4th, 10th, 11th and 12th.
+_TEMPORAL = np.array([-1, 1, 1, 1, -1, -1, -1, -1, -1, 1, 1, 1], dtype=np.int64)
+# Saptavargaja virupas by compound relationship -2 (great enemy) to +2
+# (great friend), and in own sign and moolatrikona.
+_RELATION_VIRUPAS = np.array([2.0, 4.0, 10.0, 15.0, 20.0])
+_OWN_VIRUPAS = 30.0
+_MOOLATRIKONA_VIRUPAS = 45.0
+_SAPTAVARGAS = np.array([VARGA_INDEX[v] for v in ("D1", "D2", "D3", "D7", "D9", "D12", "D30")])
+# Moolatrikona arcs in sidereal degrees [start, end).
+_MOOLATRIKONA = np.array(
+    [(120.0, 140.0), (33.0, 60.0), (0.0, 12.0), (165.0, 170.0), (240.0, 250.0), (180.0, 195.0), (300.0, 320.0)]
+)
+# Planets strong in even signs (Moon, Venus); the rest in odd signs.
+_EVEN_SIGN = np.array([0, 1, 0, 0, 0, 1, 0], dtype=np.int64)
+# Kendradi virupas by house: kendra, panapara, apoklima.
+_KENDRADI = np.array([60.0, 30.0, 15.0] * 4)
+# Decanate (0-2) in which each planet earns drekkana bala: male, female
+# and neutral planets in the first, third and second respectively.
+_DREKKANA = np.array([0, 2, 0, 1, 0, 2, 1], dtype=np.int64)
+
+# ----------------------------------------------------------------------
+# Dig bala: angle of full strength as (body, offset in degrees).
+# ----------------------------------------------------------------------
+_DIG_POINTS = ((_MC, 0.0), (_MC, 180.0), (_MC, 0.0), (_ASC, 0.0), (_ASC, 0.0), (_MC, 180.0), (_ASC, 180.0))
+_DIG_BODIES = np.array([body for body, _ in _DIG_POINTS])
+_DIG_OFFSETS = np.array([offset for _, offset in _DIG_POINTS])
+
+# ----------------------------------------------------------------------
+# Kala bala
+# ----------------------------------------------------------------------
+# Nathonnata: a + b * (fraction of the way from midnight to noon).
+_NATHONNATA_A = np.array([0.0, 60.0, 60.0, 60.0, 0.0, 0.0, 60.0])
+_NATHONNATA_B = np.array([60.0, -60.0, -60.0, 0.0, 60.0, 60.0, -60.0])
+# Paksha: a + b * (Moon-Sun elongation in degrees, 0-180); the Moon's is doubled.
+_PAKSHA_A = np.array([60.0, 0.0, 60.0, 0.0, 0.0, 0.0, 60.0])
+_PAKSHA_B = np.array([-1.0, 2.0, -1.0, 1.0, 1.0, 1.0, -1.0]) / 3.0
+# Tribhaga lords: thirds of the day, then thirds of the night.  Jupiter
+# always receives tribhaga bala.
+_TRIBHAGA_LORDS = np.array([_MERCURY, _SUN, _SATURN, _MOON, _VENUS, _MARS])
+_TRIBHAGA_VIRUPAS = 60.0
+_ABDA_VIRUPAS, _MASA_VIRUPAS, _VARA_VIRUPAS, _HORA_VIRUPAS = 15.0, 30.0, 45.0, 60.0
+# Hora lords follow the Chaldean order; weekdays from Sunday are ruled by
+# the planets in PLANETS order.
+_CHALDEAN = np.array([_SUN, _VENUS, _MERCURY, _MOON, _SATURN, _JUPITER, _MARS])
+_CHALDEAN_POSITION = np.argsort(_CHALDEAN)
+# Ayana: (24 + sign * declination) / 48 * 60; Mercury counts either
+# declination as north and the Sun's is doubled.
+_AYANA_SIGN = np.array([1.0, -1.0, 1.0, 1.0, 1.0, 1.0, -1.0])
+_AYANA_SCALE = np.array([2.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]) * 60.0 / 48.0
+
+# ----------------------------------------------------------------------
+# Chesta bala: daily motion as a ratio of mean motion, graded as
+# retrograde, stationary, slowest, slow, mean, fast and fastest.
+# ----------------------------------------------------------------------
+_MEAN_MOTION = np.array([0.9856, 13.1764, 0.5240, 0.9856, 0.0831, 0.9856, 0.0335])
+_CHESTA_BOUNDS = np.array([0.0, 0.1, 0.5, 0.9, 1.1, 1.5])
+_CHESTA_VIRUPAS = np.array([60.0, 15.0, 15.0, 30.0, 7.5, 45.0, 30.0])
+
+_NAISARGIKA = np.array([7.0, 6.0, 2.0, 3.0, 4.0, 5.0, 1.0]) * 60.0 / 7.0
+
+# Drik bala weight of a full aspect from each planet.
+_BENEFIC = np.array([-1.0, 1.0, -1.0, 1.0, 1.0, 1.0, -1.0])
+_DRIK_WEIGHTS = _BENEFIC * 60.0 / 4.0
+
+# ----------------------------------------------------------------------
+# Bhava Bala
+# ----------------------------------------------------------------------
+# House (0 = first) in which each half-sign is strongest: human signs in
+# the 1st, watery in the 4th, Scorpio in the 7th and quadrupeds in the 10th.
+_NARA, _JALACHARA, _KEETA, _CHATUSHPADA = 0, 3, 6, 9
+_BHAVA_DIG_HOUSE = np.array(
+    [
+        _CHATUSHPADA, _CHATUSHPADA,  # Aries
+        _CHATUSHPADA, _CHATUSHPADA,  # Taurus
+        _NARA, _NARA,  # Gemini
+        _JALACHARA, _JALACHARA,  # Cancer
+        _CHATUSHPADA, _CHATUSHPADA,  # Leo
+        _NARA, _NARA,  # Virgo
+        _NARA, _NARA,  # Libra
+        _KEETA, _KEETA,  # Scorpio
+        _NARA, _CHATUSHPADA,  # Sagittarius
+        _CHATUSHPADA, _JALACHARA,  # Capricorn
+        _NARA, _NARA,  # Aquarius
+        _JALACHARA, _JALACHARA,  # Pisces
+    ]
+)
+# Bhava drishti per full aspect: Jupiter and Mercury count in full, other
+# benefics add and malefics subtract a quarter.
+_BHAVA_DRISHTI_WEIGHTS = np.array([-15.0, 15.0, -15.0, 60.0, 60.0, 15.0, -15.0])
+
+
+def _arc(a: np.ndarray, b) -> np.ndarray:
+    """Shortest angular distance between ``a`` and ``b`` (0-180 degrees)."""
+    return np.abs((a - b + 180.0) % _CIRCLE - 180.0)
+
+
+def ayanamsa_degrees(jd, ayanamsa: str = DEFAULT_AYANAMSA) -> np.ndarray:
+    """Ayanamsa in degrees at each Julian day (UT)."""
+    jd = np.asarray(jd, dtype=np.float64)
+    get = swe.get_ayanamsa_ut
+    # Selecting the ayanamsa changes pyswisseph's global state.
+    with swe_lock:
+        sidereal_flags(ayanamsa)
+        return np.array([get(t) for t in jd.ravel().tolist()]).reshape(jd.shape)
+
+
+def _sthana(longitudes: np.ndarray, signs: np.ndarray) -> np.ndarray:
+    planets = longitudes[..., :_N]
+    uchcha = _arc(planets, _DEBILITATION) / 3.0
+
+    vargas = varga_signs(planets).astype(np.int64)[..., _SAPTAVARGAS]  # (..., 7, 7 vargas)
+    lords = SIGN_LORDS[vargas]
+    houses = (signs[..., None, :_N] - signs[..., :_N, None]) % 12
+    compound = _NATURAL + _TEMPORAL[houses]  # (..., planet, other)
+    relation = np.take_along_axis(compound, lords, axis=-1)
+    saptavargaja = _RELATION_VIRUPAS[relation + 2]
+    own = lords == np.arange(_N)[:, None]
+    saptavargaja = np.where(own, _OWN_VIRUPAS, saptavargaja)
+    moolatrikona = (planets >= _MOOLATRIKONA[:, 0]) & (planets < _MOOLATRIKONA[:, 1])
+    saptavargaja[..., 0] = np.where(moolatrikona, _MOOLATRIKONA_VIRUPAS, saptavargaja[..., 0])
+    saptavargaja = saptavargaja.sum(axis=-1)
+
+    rasi_navamsa = vargas[..., [0, 4]] % 2  # D1 and D9
+    ojhayugma = 15.0 * (rasi_navamsa == _EVEN_SIGN[:, None]).sum(axis=-1)
+
+    house = (signs[..., :_N] - signs[..., _ASC, None]) % 12
+    kendradi = _KENDRADI[house]
+
+    decanate = (planets % 30.0 // 10.0).astype(np.int64)
+    drekkana = np.where(decanate == _DREKKANA, 15.0, 0.0)
+    return uchcha + saptavargaja + ojhayugma + kendradi + drekkana
+
+
+def _dig(longitudes: np.ndarray) -> np.ndarray:
+    strongest = longitudes[..., _DIG_BODIES] + _DIG_OFFSETS
+    return (180.0 - _arc(longitudes[..., :_N], strongest)) / 3.0
+
+
+def _declinations(tropical: np.ndarray) -> np.ndarray:
+    """Declination in degrees of points on the ecliptic."""
+    return np.degrees(np.arcsin(np.sin(_OBLIQUITY) * np.sin(np.radians(tropical))))
+
+
+def _kala(longitudes, jd, latitude, longitude, ayanamsa) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return kala bala and its ayana and paksha parts, which chesta bala reuses."""
+    planets = longitudes[..., :_N]
+    declination = _declinations(planets + ayanamsa[..., None])
+
+    # Local mean time as a fraction of a day from midnight; the Sun's
+    # hour angle from it and the half-arc of daytime from its declination.
+    local = jd + 0.5 + longitude / _CIRCLE
+    day_fraction = local % 1.0
+    hour_angle = (day_fraction - 0.5) * _CIRCLE
+    cos_half_day = -np.tan(np.radians(latitude)) * np.tan(np.radians(declination[..., _SUN]))
+    half_day = np.degrees(np.arccos(np.clip(cos_half_day, -1.0, 1.0)))
+    since_sunrise = (hour_angle + half_day) % _CIRCLE
+    is_day = since_sunrise < 2.0 * half_day
+
+    unnata = 1.0 - np.abs(hour_angle) / 180.0
+    nathonnata = _NATHONNATA_A + _NATHONNATA_B * unnata[..., None]
+
+    elongation = _arc(planets[..., _MOON], planets[..., _SUN])
+    paksha = _PAKSHA_A + _PAKSHA_B * elongation[..., None]
+
+    day_length = np.maximum(2.0 * half_day, 1e-9)
+    day_third = np.minimum((since_sunrise / day_length * 3.0).astype(np.int64), 2)
+    night_length = np.maximum(_CIRCLE - 2.0 * half_day, 1e-9)
+    night_third = np.minimum(((since_sunrise - 2.0 * half_day) / night_length * 3.0).astype(np.int64), 2)
+    tribhaga_lord = _TRIBHAGA_LORDS[np.where(is_day, day_third, 3 + np.maximum(night_third, 0))]
+    tribhaga = _TRIBHAGA_VIRUPAS * (np.arange(_N) == tribhaga_lord[..., None])
+    tribhaga[..., _JUPITER] += _TRIBHAGA_VIRUPAS
+
+    # The Vedic day runs from sunrise; before sunrise it is still yesterday.
+    # Day numbers are local mean-solar dates, as in
+    # :func:`services.panchang.civil_weekday`.
+    day_number = np.floor(local).astype(np.int64) - (day_fraction * _CIRCLE < 180.0 - half_day)
+    weekday = (day_number + 1) % 7
+    kali_days = day_number - _KALI_EPOCH_DAY
+    year_lord = (day_number - kali_days % 360 + 1) % 7
+    month_lord = (day_number - kali_days % 30 + 1) % 7
+    hora = (since_sunrise / 15.0).astype(np.int64)
+    hora_lord = _CHALDEAN[(_CHALDEAN_POSITION[weekday] + hora) % 7]
+    planet = np.arange(_N)
+    lords = (
+        _ABDA_VIRUPAS * (planet == year_lord[..., None])
+        + _MASA_VIRUPAS * (planet == month_lord[..., None])
+        + _VARA_VIRUPAS * (planet == weekday[..., None])
+        + _HORA_VIRUPAS * (planet == hora_lord[..., None])
+    )
+
+    declination[..., _MERCURY] = np.abs(declination[..., _MERCURY])
+    ayana = (24.0 + _AYANA_SIGN * declination) * _AYANA_SCALE
+    return nathonnata + paksha + tribhaga + lords + ayana, ayana, paksha
+
+
+def _chesta(speeds: np.ndarray, ayana: np.ndarray, paksha: np.ndarray) -> np.ndarray:
+    ratio = speeds[..., :_N] / _MEAN_MOTION
+    chesta = _CHESTA_VIRUPAS[np.searchsorted(_CHESTA_BOUNDS, ratio, side="right")]
+    chesta[..., _SUN] = ayana[..., _SUN]
+    chesta[..., _MOON] = paksha[..., _MOON]
+    return chesta
+
+
+def shadbala(
+    longitudes,
+    speeds,
+    jd,
+    latitude,
+    longitude,
+    ayanamsa: str = DEFAULT_AYANAMSA,
+) -> np.ndarray:
+    """Return the six Shadbala components in virupas.
+
+    Args:
+        longitudes: Sidereal longitudes in :data:`~services.ephemeris.BODIES`
+            order, shape ``(..., 11)``.
+        speeds: Daily motions in the same order.
+        jd: Julian day (UT) of each chart, shape ``(...)``.
+        latitude: Geographic latitude of each chart.
+        longitude: Geographic longitude of each chart (east positive).
+        ayanamsa: Ayanamsa the longitudes were computed with.
+
+    Returns:
+        Array of shape ``(..., 6, 7)``: :data:`COMPONENTS` by
+        :data:`PLANETS`.  Sum over axis ``-2`` for the total Shadbala.
+    """
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    speeds = np.asarray(speeds, dtype=np.float64)
+    jd = np.asarray(jd, dtype=np.float64)
+    latitude = np.asarray(latitude, dtype=np.float64)
+    longitude = np.asarray(longitude, dtype=np.float64)
+    signs = (longitudes // 30.0).astype(np.int64) % 12
+
+    kala, ayana, paksha = _kala(longitudes, jd, latitude, longitude, ayanamsa_degrees(jd, ayanamsa))
+    drik = graha_aspects(signs)[..., :_N, :_N].astype(np.float64)
+    out = np.empty(longitudes.shape[:-1] + (len(COMPONENTS), _N))
+    out[..., 0, :] = _sthana(longitudes, signs)
+    out[..., 1, :] = _dig(longitudes)
+    out[..., 2, :] = kala
+    out[..., 3, :] = _chesta(speeds, ayana, paksha)
+    out[..., 4, :] = _NAISARGIKA
+    out[..., 5, :] = np.einsum("a,...ab->...b", _DRIK_WEIGHTS, drik)
+    return out
+
+
+def bhava_bala(longitudes, balas: np.ndarray) -> np.ndarray:
+    """Return the three Bhava Bala components in virupas.
+
+    Args:
+        longitudes: Sidereal longitudes, shape ``(..., 11)``.
+        balas: The matching :func:`shadbala` output, shape ``(..., 6, 7)``.
+
+    Returns:
+        Array of shape ``(..., 3, 12)``: :data:`BHAVA_COMPONENTS` by house
+        (0 = first).  House midpoints are taken at the ascendant's degree
+        in each sign.
+    """
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    signs = (longitudes // 30.0).astype(np.int64) % 12
+    totals = balas.sum(axis=-2)
+    adhipati = np.take_along_axis(totals, house_lords(signs), axis=-1)
+
+    midpoints = (longitudes[..., _ASC, None] + 30.0 * np.arange(12)) % _CIRCLE
+    strongest = _BHAVA_DIG_HOUSE[(midpoints // 15.0).astype(np.int64)]
+    dig = 10.0 * (6 - np.abs((np.arange(12) - strongest + 6) % 12 - 6))
+
+    aspects = aspect_matrix(signs)[..., :_N, :].astype(np.float64)
+    drishti = np.einsum("a,...ah->...h", _BHAVA_DRISHTI_WEIGHTS, aspects)
+
+    out = np.empty(longitudes.shape[:-1] + (len(BHAVA_COMPONENTS), 12))
+    out[..., 0, :] = adhipati
+    out[..., 1, :] = dig
+    out[..., 2, :] = drishti
+    return out
+
+
+def chart_strengths(arrays: ChartArrays) -> Tuple[np.ndarray, np.ndarray]:
+    """Shadbala ``(n, 6, 7)`` and Bhava Bala ``(n, 3, 12)`` for a batch of charts."""
+    balas = shadbala(
+        arrays.longitudes, arrays.speeds, arrays.jd, arrays.latitudes, arrays.longitudes_geo, arrays.ayanamsa
+    )
+    return balas, bhava_bala(arrays.longitudes, balas)
@@ -0,0 +1,76 @@
+"""Request coalescing for JyotishAI.
+
+When many clients send the same payload at once – a popular page
+refreshing, a retrying client – each request would otherwise compute its
+own chart and module text.  :class:`SingleFlight` lets concurrent callers
+with the same key share one computation: the first caller starts it and
+everyone else awaits its result.  Nothing is kept once the computation
+finishes; caching finished results is :mod:`services.chart_cache`'s job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+from weakref import WeakKeyDictionary
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one computation."""
+
+    def __init__(self):
+        # asyncio tasks belong to one event loop; uvicorn runs one per process.
+        self._flights: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = WeakKeyDictionary()
+        self.calls = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    def _in_flight(self) -> Dict[str, asyncio.Task]:
+        loop = asyncio.get_running_loop()
+        flights = self._flights.get(loop)
+        if flights is None:
+            flights = self._flights[loop] = {}
+        return flights
+
+    async def do(self, key: str, compute: Callable[[], Awaitable[T]]) -> T:
+        """Return ``await compute()``, sharing it with concurrent calls for ``key``.
+
+        The computation runs in its own task, so a caller that is
+        cancelled does not cancel it for the others.  An exception is
+        raised to every caller waiting on the key.
+        """
+        self.calls += 1
+        flights = self._in_flight()
+        task = flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            flights[key] = task
+            task.add_done_callback(lambda done: self._finished(flights, key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, flights: Dict[str, asyncio.Task], key: str, task: asyncio.Task) -> None:
+        if flights.get(key) is task:
+            del flights[key]
+        if task.cancelled() or task.exception() is not None:
+            self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters suitable for monitoring endpoints."""
+        executed = self.calls - self.coalesced
+        return {
+            "calls": self.calls,
+            "executed": executed,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "in_flight": sum(len(flights) for flights in self._flights.values()),
+        }
+
+
+# Chart computations, keyed on the chart cache key.
+chart_flights = SingleFlight()
+# Whole /analyze fan-outs, keyed on the chart keys plus the module set.
+analysis_flights = SingleFlight()
@@ -0,0 +1,333 @@
+"""Historical timezone resolution for JyotishAI.
+
+Callers used to supply ``utc_offset`` by hand, which pushes daylight
+saving and historical offset mistakes onto them.  This module derives
+the correct offset for a local birth date and time from the IANA tz
+database (via :mod:`zoneinfo`, with the ``tzdata`` package as a fallback
+source).
+
+For each zone the offset transitions between 1800 and 2100 are read
+once from the same TZif file :mod:`zoneinfo` loads: the transitions it
+lists, then the ones its POSIX TZ rule generates for later years.  They
+are stored as sorted integer arrays; a lookup is then a single bisect.
+Instants outside that window fall back to :mod:`zoneinfo`.
+
+:func:`warm` builds the tables for every zone in the gazetteer at startup
+and keeps them in ``JYOTISHAI_TZ_TABLES`` (default ``data/zones.npz``),
+keyed by the tz database version; later startups only load that file.
+``python -m services.timezones build`` prebuilds it.
+"""
+
+from __future__ import annotations
+
+import calendar
+import logging
+import os
+import re
+import struct
+import tempfile
+import threading
+import zoneinfo
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from importlib import resources
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+TZ_TABLES = os.getenv("JYOTISHAI_TZ_TABLES", os.path.join(_DATA_DIR, "zones.npz"))
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_TABLE_START = int((datetime(1800, 1, 1, tzinfo=timezone.utc) - _EPOCH).total_seconds())
+_TABLE_END = int((datetime(2100, 1, 1, tzinfo=timezone.utc) - _EPOCH).total_seconds())
+# Bumped whenever the way tables are built changes, so older files are rebuilt.
+_TABLE_FORMAT = 2
+
+# TZif header (RFC 8536): magic, version, then the six section counts
+# isutcnt, isstdcnt, leapcnt, timecnt, typecnt and charcnt.
+_TZIF_HEADER = struct.Struct(">4sc15x6l")
+# POSIX TZ rule in a TZif footer, e.g. "CET-1CEST,M3.5.0,M10.5.0/3".
+_TZ_NAME = r"(?:[A-Za-z]{3,}|<[+\-0-9A-Za-z]+>)"
+_TZ_TIME = r"[+-]?\d{1,3}(?::\d{1,2}){0,2}"
+_TZ_DATE = r"(?:J\d{1,3}|\d{1,3}|M\d{1,2}\.\d\.\d)"
+_TZ_CHANGE = rf"({_TZ_DATE})(?:/({_TZ_TIME}))?"
+_TZ_RULE = re.compile(rf"^{_TZ_NAME}({_TZ_TIME})(?:{_TZ_NAME}({_TZ_TIME})?,{_TZ_CHANGE},{_TZ_CHANGE})?$")
+
+_OFFSET_PATTERN = re.compile(r"^\s*(?:UTC|GMT)?\s*([+-])?\s*(\d{1,2})(?::?(\d{2}))?\s*$", re.IGNORECASE)
+
+
+class ZoneTable:
+    """Precomputed offset transitions for one IANA zone.
+
+    Attributes:
+        transitions: UTC seconds at which the offset changes.
+        offsets: Offset in seconds before the first transition, followed
+            by the offset in force after each transition.
+        local_transitions: Wall-clock seconds at which each transition
+            takes effect for local-time lookups.
+    """
+
+    __slots__ = ("name", "zone", "transitions", "offsets", "local_transitions")
+
+    def __init__(self, name: str, transitions: List[int], offsets: List[int]):
+        self.name = name
+        self.zone = ZoneInfo(name)
+        self.transitions = transitions
+        self.offsets = offsets
+        # Taking the larger of the two offsets matches PEP 495 ``fold=0``:
+        # ambiguous and skipped wall times use the pre-transition offset.
+        self.local_transitions = [
+            t + max(before, after) for t, before, after in zip(transitions, offsets, offsets[1:])
+        ]
+
+    def offset_at_utc(self, seconds: int) -> int:
+        """Return the offset in seconds in force at a UTC instant."""
+        if not _TABLE_START <= seconds < _TABLE_END:
+            instant = _EPOCH + timedelta(seconds=seconds)
+            return int(instant.astimezone(self.zone).utcoffset().total_seconds())
+        return self.offsets[bisect_right(self.transitions, seconds)]
+
+    def offset_at_local(self, seconds: int) -> int:
+        """Return the offset in seconds for a wall-clock time.
+
+        ``seconds`` counts local time from 1970-01-01T00:00 as if it were
+        UTC.  Ambiguous or non-existent times resolve like ``fold=0``.
+        """
+        if not _TABLE_START <= seconds < _TABLE_END:
+            local = (_EPOCH + timedelta(seconds=seconds)).replace(tzinfo=self.zone)
+            return int(local.utcoffset().total_seconds())
+        return self.offsets[bisect_right(self.local_transitions, seconds)]
+
+
+def _offset(zone: ZoneInfo, seconds: int) -> int:
+    return int((_EPOCH + timedelta(seconds=seconds)).astimezone(zone).utcoffset().total_seconds())
+
+
+def _tzif_data(name: str) -> bytes:
+    """Return the TZif file for ``name``, searched in :mod:`zoneinfo`'s order."""
+    for root in zoneinfo.TZPATH:
+        path = os.path.join(root, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                return f.read()
+    try:
+        return resources.files("tzdata.zoneinfo").joinpath(name).read_bytes()
+    except (ImportError, OSError):
+        raise zoneinfo.ZoneInfoNotFoundError(f"No time zone found with key {name}") from None
+
+
+def _read_tzif(data: bytes) -> Tuple[List[int], List[int], str]:
+    """Parse a TZif file into transition times, the offset after each and the footer rule."""
+    magic, version, isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = _TZIF_HEADER.unpack_from(data)
+    if magic != b"TZif":
+        raise ValueError("not a TZif file")
+    start, time_format = _TZIF_HEADER.size, "l"
+    if version >= b"2":
+        # Skip the 32-bit block; the second header repeats the counts for 64-bit times.
+        start += timecnt * 5 + typecnt * 6 + charcnt + leapcnt * 8 + isstdcnt + isutcnt
+        _, _, isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = _TZIF_HEADER.unpack_from(data, start)
+        start, time_format = start + _TZIF_HEADER.size, "q"
+    times = struct.unpack_from(f">{timecnt}{time_format}", data, start)
+    start += struct.calcsize(time_format) * timecnt
+    types = data[start:start + timecnt]
+    start += timecnt
+    utoffs = [struct.unpack_from(">l", data, start + 6 * i)[0] for i in range(typecnt)]
+    start += typecnt * 6 + charcnt + leapcnt * (struct.calcsize(time_format) + 4) + isstdcnt + isutcnt
+    footer = data[start:].strip(b"\n").decode("ascii") if version >= b"2" else ""
+    return list(times), [utoffs[i] for i in types], footer
+
+
+def _posix_seconds(text: str) -> int:
+    sign = -1 if text.startswith("-") else 1
+    hours, minutes, seconds = ([int(v) for v in text.lstrip("+-").split(":")] + [0, 0])[:3]
+    return sign * (hours * 3600 + minutes * 60 + seconds)
+
+
+def _rule_day(rule: str, year: int) -> date:
+    if rule.startswith("J"):
+        # Jn counts 1..365 and never includes 29 February.
+        n = int(rule[1:])
+        return date(year, 1, 1) + timedelta(days=n - 1 + (calendar.isleap(year) and n >= 60))
+    if rule.startswith("M"):
+        # Mm.w.d: weekday d (0 = Sunday) of week w (5 = last) of month m.
+        month, week, weekday = (int(v) for v in rule[1:].split("."))
+        first = date(year, month, 1)
+        day = first + timedelta(days=(weekday - first.isoweekday()) % 7 + 7 * (week - 1))
+        while day.month != month:
+            day -= timedelta(days=7)
+        return day
+    return date(year, 1, 1) + timedelta(days=int(rule))
+
+
+def _rule_transitions(footer: str, after: int) -> List[Tuple[int, int]]:
+    """Transitions a POSIX TZ rule generates after ``after`` and before 2100."""
+    match = _TZ_RULE.match(footer)
+    if match is None:
+        raise ValueError(f"Unsupported TZ rule {footer!r}")
+    std_text, dst_text, start_rule, start_time, end_rule, end_time = match.groups()
+    if start_rule is None:
+        return []
+    # POSIX offsets count hours west of Greenwich.
+    std = -_posix_seconds(std_text)
+    dst = -_posix_seconds(dst_text) if dst_text else std + 3600
+    first_year = (_EPOCH + timedelta(seconds=max(after, _TABLE_START))).year - 1
+    changes = []
+    for year in range(first_year, (_EPOCH + timedelta(seconds=_TABLE_END)).year):
+        # The change to daylight time is given in standard local time, the change back in daylight time.
+        for rule, time, before, offset in ((start_rule, start_time, std, dst), (end_rule, end_time, dst, std)):
+            day = (_rule_day(rule, year) - _EPOCH.date()).days
+            changes.append((day * 86400 + _posix_seconds(time or "2") - before, offset))
+    return sorted(change for change in changes if after < change[0] < _TABLE_END)
+
+
+def _build_table(name: str) -> ZoneTable:
+    zone = ZoneInfo(name)
+    times, after, footer = _read_tzif(_tzif_data(name))
+    changes = list(zip(times, after))
+    if footer:
+        changes += _rule_transitions(footer, times[-1] if times else _TABLE_START)
+    transitions: List[int] = []
+    offsets = [_offset(zone, _TABLE_START)]
+    for t, offset in changes:
+        # Changes of abbreviation or DST flag alone keep the offset.
+        if _TABLE_START < t < _TABLE_END and offset != offsets[-1]:
+            transitions.append(t)
+            offsets.append(offset)
+    return ZoneTable(name, transitions, offsets)
+
+
+_tables: Dict[str, ZoneTable] = {}
+_tables_lock = threading.Lock()
+
+
+def zone_table(name: str) -> ZoneTable:
+    """Return the (memoised) transition table for IANA zone ``name``."""
+    table = _tables.get(name)
+    if table is None:
+        # Only zones missing from the warmed set are built on demand.
+        table = _tables.setdefault(name, _build_table(name))
+    return table
+
+
+def tzdata_version() -> str:
+    """Version of the tz database :mod:`zoneinfo` reads, e.g. ``"2025b"``."""
+    for root in zoneinfo.TZPATH:
+        path = os.path.join(root, "tzdata.zi")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return f.readline().split()[-1]
+    try:
+        import tzdata
+    except ImportError:
+        return ""
+    return tzdata.IANA_VERSION
+
+
+def load_tables(path: str = TZ_TABLES) -> Dict[str, ZoneTable]:
+    """Read tables saved by :func:`save_tables`; empty if missing or stale."""
+    try:
+        with np.load(path) as data:
+            if int(data["format"]) != _TABLE_FORMAT or str(data["version"]) != tzdata_version():
+                return {}
+            names = data["names"].tolist()
+            bounds = np.concatenate(([0], np.cumsum(data["counts"]))).tolist()
+            transitions = data["transitions"].tolist()
+            offsets = data["offsets"].tolist()
+    except (OSError, KeyError, ValueError):
+        return {}
+    return {
+        name: ZoneTable(name, transitions[lo:hi], offsets[lo + i:hi + i + 1])
+        for i, (name, lo, hi) in enumerate(zip(names, bounds, bounds[1:]))
+    }
+
+
+def save_tables(tables: Iterable[ZoneTable], path: str = TZ_TABLES) -> None:
+    """Write transition tables to ``path`` atomically."""
+    tables = list(tables)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz")
+    with os.fdopen(fd, "wb") as f:
+        np.savez(
+            f,
+            format=np.array(_TABLE_FORMAT),
+            version=np.array(tzdata_version()),
+            names=np.array([t.name for t in tables]),
+            counts=np.array([len(t.transitions) for t in tables], dtype=np.int64),
+            transitions=np.array([x for t in tables for x in t.transitions], dtype=np.int64),
+            offsets=np.array([x for t in tables for x in t.offsets], dtype=np.int64),
+        )
+    os.replace(tmp_path, path)
+
+
+def warm(zone_names: Iterable[str], path: Optional[str] = TZ_TABLES) -> None:
+    """Make the tables for ``zone_names`` available without building them on lookup.
+
+    Tables are loaded from ``path`` when it matches the installed tz
+    database; zones missing from it are built and the file rewritten.
+    """
+    with _tables_lock:
+        if path:
+            for name, table in load_tables(path).items():
+                _tables.setdefault(name, table)
+        missing = sorted(set(zone_names) - set(_tables))
+        if missing:
+            logger.info("Precomputing UTC offset tables for %d time zones", len(missing))
+        for name in missing:
+            try:
+                _tables[name] = _build_table(name)
+            except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+                logger.warning("Unknown time zone %r", name)
+        if path and missing:
+            save_tables(_tables.values(), path)
+
+
+def _local_seconds(birth_date: str, birth_time: str) -> int:
+    year, month, day = (int(v) for v in birth_date.replace("/", "-").split("-"))
+    parts = [int(v) for v in birth_time.split(":")]
+    second = parts[2] if len(parts) > 2 else 0
+    local = datetime(year, month, day, parts[0], parts[1], second, tzinfo=timezone.utc)
+    return int((local - _EPOCH).total_seconds())
+
+
+def resolve_utc_offset(zone_name: str, birth_date: str, birth_time: str) -> float:
+    """Return the UTC offset in hours for a local date and time in a zone."""
+    return zone_table(zone_name).offset_at_local(_local_seconds(birth_date, birth_time)) / 3600.0
+
+
+def parse_utc_offset(value: Union[str, float, int, None]) -> Optional[float]:
+    """Normalise an explicit offset such as ``5.5``, ``"+05:30"`` or ``"UTC-4"``.
+
+    Returns hours as a float, or ``None`` when no offset was given.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    match = _OFFSET_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Invalid UTC offset: {value!r}")
+    sign, hours, minutes = match.groups()
+    hours_value = int(hours) + int(minutes or 0) / 60.0
+    return -hours_value if sign == "-" else hours_value
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from services.geocoder import get_geocoder
+
+    parser = argparse.ArgumentParser(description="Prebuild UTC offset tables for the gazetteer's time zones.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--output", default=TZ_TABLES)
+    args = parser.parse_args()
+    warm(get_geocoder().timezones(), args.output)
+    print(f"{len(_tables)} zones written to {args.output}")
@@ -0,0 +1,206 @@
+"""Transit event generator for JyotishAI.
+
+:func:`transit_events` walks a date range over a natal chart and lazily
+yields three kinds of events for the transiting grahas:
+
+* ``HOUSE_INGRESS`` – a graha enters a new whole-sign house counted from
+  the natal ascendant,
+* ``CONJUNCTION`` – a graha reaches the exact longitude of a natal body,
+* ``STATION_RETROGRADE`` / ``STATION_DIRECT`` – a graha's speed changes
+  sign.
+
+Each chunk of the range is sampled coarsely only to bracket events; the
+exact instant is then found by vectorised bisection on the ephemeris.
+House ingresses are read from the precomputed sign ingresses of
+:mod:`services.ingress_index` when that index is built and covers the
+chunk, leaving only conjunctions and stations to bracket.
+Events are yielded chunk by chunk in time order, so memory stays bounded
+and the first results arrive immediately even for multi-decade windows.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from services.chart_snapshot import ChartSnapshot
+from services.ephemeris import DEFAULT_AYANAMSA, GRAHAS, SIGNS, datetime_from_jd, graha_longitudes
+from services.ingress_index import IngressIndex, get_ingress_index
+
+HOUSE_INGRESS = "HOUSE_INGRESS"
+CONJUNCTION = "CONJUNCTION"
+STATION_RETROGRADE = "STATION_RETROGRADE"
+STATION_DIRECT = "STATION_DIRECT"
+
+TRANSIT_BODIES = ("SUN", "MARS", "MERCURY", "JUPITER", "VENUS", "SATURN", "RAHU", "KETU")
+NATAL_POINTS = GRAHAS + ("ASC",)
+# Grahas that never station, or whose nodal wobble is not a station.
+_NO_STATIONS = {"SUN", "MOON", "RAHU", "KETU"}
+
+# Bracketing step in days: shorter than the gap between two events of
+# the same kind for each graha.
+_STEP_DAYS: Dict[str, float] = {
+    "SUN": 1.0,
+    "MOON": 0.25,
+    "MARS": 1.0,
+    "MERCURY": 0.5,
+    "JUPITER": 1.0,
+    "VENUS": 1.0,
+    "SATURN": 1.0,
+    "RAHU": 2.0,
+    "KETU": 2.0,
+}
+CHUNK_DAYS = 365.0
+# Halving a 1-day bracket 24 times pins an event to about 5 ms.
+_BISECT_ITERATIONS = 24
+
+
+@dataclass(frozen=True)
+class TransitEvent:
+    """A transit event at Julian day ``jd``.
+
+    ``target`` names the natal body for conjunctions; ``house`` is the
+    whole-sign house (1–12) occupied by the transiting graha.
+    """
+
+    jd: float
+    kind: str
+    body: str
+    longitude: float
+    house: int
+    target: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "time": datetime_from_jd(self.jd).isoformat().replace("+00:00", "Z"),
+            "kind": self.kind,
+            "body": self.body,
+            "target": self.target,
+            "house": self.house,
+            "sign": SIGNS[int(self.longitude // 30.0) % 12],
+            "longitude": round(self.longitude, 4),
+        }
+
+
+def _wrap(delta: np.ndarray) -> np.ndarray:
+    """Map angular differences into ``[-180, 180)``."""
+    return (delta + 180.0) % 360.0 - 180.0
+
+
+def _chunk_events(
+    body: str,
+    grid: np.ndarray,
+    asc_sign: int,
+    natal: Dict[str, float],
+    node: str,
+    ingresses: bool = True,
+) -> List[TransitEvent]:
+    """Find every event of one graha within ``grid``.
+
+    Brackets of all three kinds are refined in a single vectorised
+    bisection so each iteration costs one ephemeris evaluation.  With
+    ``ingresses`` false, house ingresses are left to the caller.
+    """
+    lon, speed = graha_longitudes(body, grid, node=node)
+    targets = list(natal)
+    natal_lon = np.array([natal[t] for t in targets])
+
+    # House ingress: the whole-sign index changes between two samples.
+    sign = (lon // 30.0).astype(np.int64)
+    ingress = np.flatnonzero(sign[1:] != sign[:-1]) if ingresses else np.empty(0, dtype=np.int64)
+    # Conjunctions: the wrapped separation changes sign near zero, not
+    # across the +/-180 degree seam.
+    delta = _wrap(lon[None, :] - natal_lon[:, None])
+    target, conj = np.nonzero((np.sign(delta[:, 1:]) != np.sign(delta[:, :-1])) & (np.abs(delta[:, :-1]) < 90.0))
+    # Stations: the daily speed changes sign.
+    station = np.empty(0, dtype=np.int64)
+    if body not in _NO_STATIONS:
+        station = np.flatnonzero(np.sign(speed[1:]) != np.sign(speed[:-1]))
+
+    left = np.concatenate((ingress, conj, station))
+    if not len(left):
+        return []
+    n_ingress, n_conj = len(ingress), len(conj)
+    is_ingress = np.arange(len(left)) < n_ingress
+    is_conj = ~is_ingress & (np.arange(len(left)) < n_ingress + n_conj)
+    is_station = ~is_ingress & ~is_conj
+    # Per bracket: the natal longitude for conjunctions, and the state at
+    # the left edge that persists until the event happens.
+    reference = np.zeros(len(left))
+    reference[is_conj] = natal_lon[target]
+    initial = np.concatenate((sign[ingress], np.sign(delta[target, conj]), speed[station] > 0)).astype(np.int64)
+
+    def state(t: np.ndarray) -> np.ndarray:
+        lon_t, speed_t = graha_longitudes(body, t, node=node)
+        return np.where(
+            is_ingress,
+            (lon_t // 30.0).astype(np.int64),
+            np.where(is_conj, np.sign(_wrap(lon_t - reference)), speed_t > 0).astype(np.int64),
+        )
+
+    lo, hi = grid[left], grid[left + 1]
+    for _ in range(_BISECT_ITERATIONS):
+        mid = (lo + hi) / 2.0
+        still = state(mid) == initial
+        lo = np.where(still, mid, lo)
+        hi = np.where(still, hi, mid)
+
+    kinds = np.where(
+        is_ingress, HOUSE_INGRESS, np.where(is_conj, CONJUNCTION, np.where(initial == 1, STATION_RETROGRADE, STATION_DIRECT))
+    )
+    names = [None] * n_ingress + [targets[k] for k in target.tolist()] + [None] * len(station)
+    events = []
+    for t, longitude, kind, name in zip(hi.tolist(), graha_longitudes(body, hi, node=node)[0].tolist(), kinds.tolist(), names):
+        house = (int(longitude // 30.0) - asc_sign) % 12 + 1
+        events.append(TransitEvent(t, kind, body, longitude, house, name))
+    return events
+
+
+def _indexed_ingresses(
+    index: IngressIndex, body: str, start_jd: float, end_jd: float, asc_sign: int
+) -> List[TransitEvent]:
+    """House ingresses of one graha between ``start_jd`` and ``end_jd``, from the index."""
+    found = index.ingresses(body, start_jd, end_jd)
+    if not found:
+        return []
+    times = np.array([ingress.jd for ingress in found])
+    longitudes = graha_longitudes(body, times, node=index.node)[0].tolist()
+    return [
+        TransitEvent(ingress.jd, HOUSE_INGRESS, body, longitude, (ingress.entered - asc_sign) % 12 + 1)
+        for ingress, longitude in zip(found, longitudes)
+    ]
+
+
+def transit_events(
+    natal: ChartSnapshot,
+    start_jd: float,
+    end_jd: float,
+    bodies: Sequence[str] = TRANSIT_BODIES,
+    targets: Sequence[str] = NATAL_POINTS,
+    chunk_days: float = CHUNK_DAYS,
+) -> Iterator[TransitEvent]:
+    """Yield transit events over ``natal`` between ``start_jd`` and ``end_jd`` in time order."""
+    natal_longitudes = {target: natal.longitude_of(target) for target in targets}
+    asc_sign = natal.sign_index("ASC")
+    # Transits use the default ayanamsa, so the index serves them when its node matches.
+    index = get_ingress_index()
+    if index is not None and (index.ayanamsa, index.node) != (DEFAULT_AYANAMSA.upper(), natal.node.upper()):
+        index = None
+    chunk_start = start_jd
+    while chunk_start < end_jd:
+        chunk_end = min(chunk_start + chunk_days, end_jd)
+        indexed = index is not None and index.start_jd <= chunk_start and chunk_end < index.end_jd
+        events: List[TransitEvent] = []
+        for body in bodies:
+            step = _STEP_DAYS[body]
+            count = max(int(np.ceil((chunk_end - chunk_start) / step)), 1)
+            grid = np.linspace(chunk_start, chunk_end, count + 1)
+            events.extend(_chunk_events(body, grid, asc_sign, natal_longitudes, natal.node, ingresses=not indexed))
+            if indexed:
+                events.extend(_indexed_ingresses(index, body, chunk_start, chunk_end, asc_sign))
+        # Brackets never straddle chunk boundaries, so each event is found once.
+        events.sort(key=lambda e: e.jd)
+        yield from events
+        chunk_start = chunk_end
@@ -0,0 +1,104 @@
+"""Divisional chart (varga) engine for JyotishAI.
+
+Derives the sixteen Parashari vargas (D1 to D60) for any array of
+sidereal longitudes in one vectorised pass.  Longitudes are converted
+once to integer arc-seconds; every varga is then integer arithmetic on
+the sign index and the part of the sign the body falls in, so all
+sixteen charts for a full chart (or a batch of charts) cost a few
+NumPy operations rather than extra ephemeris work.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+VARGAS: Tuple[str, ...] = (
+    "D1", "D2", "D3", "D4", "D7", "D9", "D10", "D12",
+    "D16", "D20", "D24", "D27", "D30", "D40", "D45", "D60",
+)
+VARGA_INDEX: Dict[str, int] = {name: i for i, name in enumerate(VARGAS)}
+VARGA_NAMES: Dict[str, str] = {
+    "D1": "Rasi",
+    "D2": "Hora",
+    "D3": "Drekkana",
+    "D4": "Chaturthamsa",
+    "D7": "Saptamsa",
+    "D9": "Navamsa",
+    "D10": "Dasamsa",
+    "D12": "Dwadasamsa",
+    "D16": "Shodasamsa",
+    "D20": "Vimsamsa",
+    "D24": "Chaturvimsamsa",
+    "D27": "Bhamsa",
+    "D30": "Trimsamsa",
+    "D40": "Khavedamsa",
+    "D45": "Akshavedamsa",
+    "D60": "Shashtiamsa",
+}
+
+_SIGN_SECONDS = 30 * 3600
+_CIRCLE_SECONDS = 360 * 3600
+
+# Trimsamsa: degree boundaries and the sign each segment maps to, for
+# odd (Aries, Gemini, ...) and even signs.
+_D30_ODD_BOUNDS = np.array([5, 10, 18, 25]) * 3600
+_D30_ODD_SIGNS = np.array([0, 10, 8, 2, 6], dtype=np.int64)  # Aries, Aquarius, Sagittarius, Gemini, Libra
+_D30_EVEN_BOUNDS = np.array([5, 12, 20, 25]) * 3600
+_D30_EVEN_SIGNS = np.array([1, 5, 11, 9, 7], dtype=np.int64)  # Taurus, Virgo, Pisces, Capricorn, Scorpio
+
+# First sign counted from, by modality (movable, fixed, dual).
+_D16_START = np.array([0, 4, 8])  # Aries, Leo, Sagittarius
+_D20_START = np.array([0, 8, 4])  # Aries, Sagittarius, Leo
+_D45_START = np.array([0, 4, 8])  # Aries, Leo, Sagittarius
+
+
+def to_arc_seconds(longitudes: np.ndarray) -> np.ndarray:
+    """Round longitudes in degrees to integer arc-seconds in ``[0, 1296000)``."""
+    seconds = np.rint(np.asarray(longitudes, dtype=np.float64) * 3600.0).astype(np.int64)
+    return seconds % _CIRCLE_SECONDS
+
+
+def varga_signs(longitudes: np.ndarray) -> np.ndarray:
+    """Return the sign index of every longitude in every varga.
+
+    Args:
+        longitudes: Sidereal longitudes in degrees, any shape.
+
+    Returns:
+        ``int8`` array of shape ``longitudes.shape + (16,)`` ordered as
+        :data:`VARGAS`, with ``0`` for Aries through ``11`` for Pisces.
+    """
+    seconds = to_arc_seconds(longitudes)
+    sign = seconds // _SIGN_SECONDS
+    within = seconds % _SIGN_SECONDS
+    odd = sign % 2 == 0  # Aries (index 0) is an odd sign
+    modality = sign % 3
+
+    def part(n: int) -> np.ndarray:
+        return within * n // _SIGN_SECONDS
+
+    out = np.empty(seconds.shape + (len(VARGAS),), dtype=np.int64)
+    out[..., VARGA_INDEX["D1"]] = sign
+    # Hora: odd signs Leo then Cancer, even signs Cancer then Leo.
+    out[..., VARGA_INDEX["D2"]] = np.where(odd, 4 - part(2), 3 + part(2))
+    out[..., VARGA_INDEX["D3"]] = sign + 4 * part(3)
+    out[..., VARGA_INDEX["D4"]] = sign + 3 * part(4)
+    out[..., VARGA_INDEX["D7"]] = np.where(odd, sign, sign + 6) + part(7)
+    out[..., VARGA_INDEX["D9"]] = sign * 9 + part(9)
+    out[..., VARGA_INDEX["D10"]] = np.where(odd, sign, sign + 8) + part(10)
+    out[..., VARGA_INDEX["D12"]] = sign + part(12)
+    out[..., VARGA_INDEX["D16"]] = _D16_START[modality] + part(16)
+    out[..., VARGA_INDEX["D20"]] = _D20_START[modality] + part(20)
+    out[..., VARGA_INDEX["D24"]] = np.where(odd, 4, 3) + part(24)
+    out[..., VARGA_INDEX["D27"]] = sign * 27 + part(27)
+    out[..., VARGA_INDEX["D30"]] = np.where(
+        odd,
+        _D30_ODD_SIGNS[np.searchsorted(_D30_ODD_BOUNDS, within, side="right")],
+        _D30_EVEN_SIGNS[np.searchsorted(_D30_EVEN_BOUNDS, within, side="right")],
+    )
+    out[..., VARGA_INDEX["D40"]] = np.where(odd, 0, 6) + part(40)
+    out[..., VARGA_INDEX["D45"]] = _D45_START[modality] + part(45)
+    out[..., VARGA_INDEX["D60"]] = sign + part(60)
+    return (out % 12).astype(np.int8)
@@ -0,0 +1,387 @@
+"""Yoga detection for JyotishAI.
+
+Yogas are written as short declarative rules, for example::
+
+    "JUPITER in kendra from MOON"
+    "MARS in kendra and (MARS in own sign or MARS in exaltation)"
+    "lord of 9 with lord of 10"
+    "not taragrahas in houses 2,12 from MOON"
+
+and compiled once into bitmask operations.  A body's position is a
+12-bit board with the bit of its sign set; a set of houses counted from a
+reference body is a 12-bit mask rotated by the reference's sign (looked
+up, not computed); sign dignities are per-body masks.  ``in`` is then an
+AND of a board with a mask and ``with`` a comparison of two signs.  Each
+compiled rule has two evaluators over the same tables: one over the
+integer signs of a single snapshot, and one over the ``(n, 11)`` sign
+arrays of a chart batch, so prevalence across many charts is a handful
+of NumPy operations per rule.
+
+Grammar (keywords are case-insensitive)::
+
+    rule    := clause ("or" clause)*
+    clause  := factor ("and" factor)*
+    factor  := "not" factor | "(" rule ")" | subject "in" place | subject "with" subject
+    subject := BODY | GROUP | "lord of" N ["from" REF]
+    place   := HOUSES ["from" REF] | ("house" | "houses") N ("," N)* ["from" REF]
+             | "own sign" | "exaltation" | "debilitation" | SIGN
+
+Houses are counted from the ascendant unless ``from`` names another
+body.  A group subject (``benefics``, ``malefics``, ``taragrahas``)
+matches when any of its members does.  A planet is always ``with``
+itself, so a single lord of a kendra and a trikona (yogakaraka) forms the
+corresponding raja yoga on its own, as classically held.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from services.dignities import DEBILITATION_MASKS, EXALTATION_MASKS, OWN_SIGN_MASKS, SIGN_LORDS
+from services.ephemeris import BODY_INDEX, SIGNS, compute_charts
+
+HOUSE_SETS = {
+    "kendra": (1, 4, 7, 10),
+    "trikona": (1, 5, 9),
+    "dusthana": (6, 8, 12),
+    "upachaya": (3, 6, 10, 11),
+    "panaphara": (2, 5, 8, 11),
+    "apoklima": (3, 6, 9, 12),
+}
+GROUPS = {
+    "benefics": ("MERCURY", "JUPITER", "VENUS"),
+    "malefics": ("SUN", "MARS", "SATURN", "RAHU", "KETU"),
+    # The five planets other than the luminaries and the nodes.
+    "taragrahas": ("MARS", "MERCURY", "JUPITER", "VENUS", "SATURN"),
+}
+DIGNITIES = {
+    "own": OWN_SIGN_MASKS,
+    "exaltation": EXALTATION_MASKS,
+    "debilitation": DEBILITATION_MASKS,
+}
+
+YOGA_RULES: Dict[str, str] = {
+    "GAJAKESARI": "JUPITER in kendra from MOON",
+    "RUCHAKA": "MARS in kendra and (MARS in own sign or MARS in exaltation)",
+    "BHADRA": "MERCURY in kendra and (MERCURY in own sign or MERCURY in exaltation)",
+    "HAMSA": "JUPITER in kendra and (JUPITER in own sign or JUPITER in exaltation)",
+    "MALAVYA": "VENUS in kendra and (VENUS in own sign or VENUS in exaltation)",
+    "SASA": "SATURN in kendra and (SATURN in own sign or SATURN in exaltation)",
+    "SUNAPHA": "taragrahas in house 2 from MOON",
+    "ANAPHA": "taragrahas in house 12 from MOON",
+    "DURUDHARA": "taragrahas in house 2 from MOON and taragrahas in house 12 from MOON",
+    "KEMADRUMA": "not taragrahas in houses 2,12 from MOON and not taragrahas in kendra from MOON",
+    "VESI": "taragrahas in house 2 from SUN",
+    "VASI": "taragrahas in house 12 from SUN",
+    "UBHAYACHARI": "taragrahas in house 2 from SUN and taragrahas in house 12 from SUN",
+    "ADHI": "benefics in houses 6,7,8 from MOON",
+    "AMALA": "benefics in house 10 or benefics in house 10 from MOON",
+    "BUDHADITYA": "MERCURY with SUN",
+    "CHANDRA_MANGALA": "MOON with MARS",
+    "GURU_CHANDALA": "JUPITER with RAHU",
+    "SHAKATA": "JUPITER in houses 6,8,12 from MOON",
+    "DHARMA_KARMADHIPATI": "lord of 9 with lord of 10",
+    "RAJA": (
+        "lord of 1 with lord of 5 or lord of 1 with lord of 9 or lord of 4 with lord of 5 "
+        "or lord of 4 with lord of 9 or lord of 7 with lord of 5 or lord of 7 with lord of 9 "
+        "or lord of 10 with lord of 5"
+    ),
+    "DHANA": "lord of 2 with lord of 11 or lord of 5 with lord of 11 or lord of 9 with lord of 11",
+    "HARSHA": "lord of 6 in dusthana",
+    "SARALA": "lord of 8 in dusthana",
+    "VIMALA": "lord of 12 in dusthana",
+    "NEECHA_SUN": "SUN in debilitation",
+    "NEECHA_MOON": "MOON in debilitation",
+    "MANGLIK": "MARS in houses 1,2,4,7,8,12",
+}
+
+# Evaluators: one over a single chart's signs, one over an (n, 11) array.
+SingleTest = Callable[[Sequence[int]], bool]
+BatchTest = Callable[[np.ndarray], np.ndarray]
+
+_TOKEN = re.compile(r"\(|\)|,|[A-Za-z_]+|\d+")
+
+
+def _rotations(houses: Sequence[int]) -> Tuple[int, ...]:
+    """The mask of ``houses`` over absolute signs, for a reference in each sign."""
+    mask = sum(1 << (h - 1) for h in houses)
+    return tuple(((mask << s) | (mask >> (12 - s))) & 0xFFF for s in range(12))
+
+
+class _Tables:
+    """Lookup tables referenced by generated code, as tuples and as arrays."""
+
+    def __init__(self):
+        self.single: Dict[str, tuple] = {"L": tuple(SIGN_LORDS.tolist())}
+        self.batch: Dict[str, object] = {"L": SIGN_LORDS, "np": np}
+        self._names: Dict[tuple, str] = {}
+
+    def add(self, values: Sequence[int]) -> str:
+        values = tuple(int(v) for v in values)
+        name = self._names.get(values)
+        if name is None:
+            name = self._names[values] = f"T{len(self._names)}"
+            self.single[name] = values
+            self.batch[name] = np.array(values, dtype=np.int64)
+        return name
+
+
+class _Member:
+    """One body a subject stands for: a fixed body or the lord of a house.
+
+    ``single`` and ``batch`` are source expressions for the member's
+    body index; ``s`` is one chart's signs, ``S`` an ``(n, 11)`` array
+    and ``R`` its row numbers.
+    """
+
+    def __init__(self, body: int = -1, lord_of: int = 0, ref: int = -1):
+        self.body = body
+        if body >= 0:
+            self.single = self.batch = str(body)
+            self.single_sign, self.batch_sign = f"s[{body}]", f"S[:, {body}]"
+        else:
+            self.single = f"L[(s[{ref}] + {lord_of - 1}) % 12]"
+            self.batch = f"L[(S[:, {ref}] + {lord_of - 1}) % 12]"
+            self.single_sign, self.batch_sign = f"s[{self.single}]", f"S[R, {self.batch}]"
+
+
+class _Parser:
+    """Recursive-descent compiler from rule text to ``(single, batch)`` source."""
+
+    def __init__(self, text: str, tables: _Tables):
+        self.text = text
+        self.tables = tables
+        self.tokens = [t.lower() for t in _TOKEN.findall(text)]
+        self.pos = 0
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"Cannot parse yoga rule {self.text!r}: {message}")
+
+    def peek(self) -> str:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else ""
+
+    def take(self, *expected: str) -> str:
+        token = self.peek()
+        if expected and token not in expected:
+            raise self.error(f"expected {' or '.join(expected)}, found {token or 'end of rule'!r}")
+        if not token:
+            raise self.error("unexpected end of rule")
+        self.pos += 1
+        return token
+
+    def parse(self) -> Tuple[str, str]:
+        source = self.rule()
+        if self.peek():
+            raise self.error(f"unexpected {self.peek()!r}")
+        return source
+
+    @staticmethod
+    def _join(parts: List[Tuple[str, str]], single_op: str, batch_op: str) -> Tuple[str, str]:
+        if len(parts) == 1:
+            return parts[0]
+        singles, batches = zip(*parts)
+        return f"({f' {single_op} '.join(singles)})", f"({f' {batch_op} '.join(batches)})"
+
+    def rule(self) -> Tuple[str, str]:
+        parts = [self.clause()]
+        while self.peek() == "or":
+            self.take()
+            parts.append(self.clause())
+        return self._join(parts, "or", "|")
+
+    def clause(self) -> Tuple[str, str]:
+        parts = [self.factor()]
+        while self.peek() == "and":
+            self.take()
+            parts.append(self.factor())
+        return self._join(parts, "and", "&")
+
+    def factor(self) -> Tuple[str, str]:
+        if self.peek() == "not":
+            self.take()
+            single, batch = self.factor()
+            return f"(not {single})", f"(~{batch})"
+        if self.peek() == "(":
+            self.take()
+            source = self.rule()
+            self.take(")")
+            return source
+        members = self.subject()
+        if self.take("in", "with") == "with":
+            return self.conjunction(members, self.subject())
+        return self.placement(members)
+
+    def body(self) -> int:
+        token = self.take()
+        if token == "lagna":
+            return BODY_INDEX["ASC"]
+        if token.upper() not in BODY_INDEX:
+            raise self.error(f"unknown body {token!r}")
+        return BODY_INDEX[token.upper()]
+
+    def number(self) -> int:
+        token = self.take()
+        if not token.isdigit() or not 1 <= int(token) <= 12:
+            raise self.error(f"expected a house number from 1 to 12, found {token!r}")
+        return int(token)
+
+    def reference(self) -> int:
+        if self.peek() == "from":
+            self.take()
+            return self.body()
+        return BODY_INDEX["ASC"]
+
+    def subject(self) -> List[_Member]:
+        token = self.peek()
+        if token in GROUPS:
+            self.take()
+            return [_Member(body=BODY_INDEX[b]) for b in GROUPS[token]]
+        if token == "lord":
+            self.take()
+            self.take("of")
+            house = self.number()
+            return [_Member(lord_of=house, ref=self.reference())]
+        return [_Member(body=self.body())]
+
+    def placement(self, members: List[_Member]) -> Tuple[str, str]:
+        token = self.take()
+        if token in HOUSE_SETS or token in ("house", "houses"):
+            if token in HOUSE_SETS:
+                houses = list(HOUSE_SETS[token])
+            else:
+                houses = [self.number()]
+                while self.peek() == ",":
+                    self.take()
+                    houses.append(self.number())
+            table = self.tables.add(_rotations(houses))
+            ref = self.reference()
+            # The house mask does not depend on the member: build it once.
+            masks = [(f"{table}[s[{ref}]]", f"{table}[S[:, {ref}]]")] * len(members)
+        elif token in DIGNITIES:
+            if token == "own":
+                self.take("sign")
+            table = self.tables.add(DIGNITIES[token])
+            masks = [(f"{table}[{m.single}]", f"{table}[{m.batch}]") for m in members]
+        elif token.upper() in SIGNS:
+            bit = str(1 << SIGNS.index(token.upper()))
+            masks = [(bit, bit)] * len(members)
+        else:
+            raise self.error(f"unknown place {token!r}")
+        return self._join(
+            [
+                (f"((1 << {m.single_sign}) & {single})", f"(((1 << {m.batch_sign}) & {batch}) != 0)")
+                for m, (single, batch) in zip(members, masks)
+            ],
+            "or",
+            "|",
+        )
+
+    def conjunction(self, left: List[_Member], right: List[_Member]) -> Tuple[str, str]:
+        pairs = [
+            (f"({a.single_sign} == {b.single_sign})", f"({a.batch_sign} == {b.batch_sign})")
+            for a in left
+            for b in right
+            # A group member is not "with" the same fixed body.
+            if not (a.body >= 0 and a.body == b.body)
+        ]
+        if not pairs:
+            raise self.error("a body cannot be conjunct with itself")
+        return self._join(pairs, "or", "|")
+
+
+def _compile(source: str, namespace: Dict[str, object]):
+    # Rule text only reaches the generated source as validated body
+    # indices, house numbers and table names.
+    return eval(compile(source, "<yoga rule>", "eval"), dict(namespace))
+
+
+def compile_rule(text: str) -> Tuple[SingleTest, BatchTest]:
+    """Compile rule text into ``(single, batch)`` evaluators.
+
+    ``single`` takes the sign index per body of one chart (e.g.
+    :attr:`ChartSnapshot.signs`) and returns a bool; ``batch`` takes an
+    ``(n, 11)`` sign array (e.g. :attr:`ChartArrays.signs`) and returns a
+    boolean array of shape ``(n,)``.
+    """
+    tables = _Tables()
+    single, batch = _Parser(text, tables).parse()
+    return _compile(f"lambda s: bool({single})", tables.single), _batch_function(batch, tables)
+
+
+def _batch_function(source: str, tables: _Tables) -> BatchTest:
+    evaluate = _compile(f"lambda S, R: {source}", tables.batch)
+
+    def batch(signs: np.ndarray) -> np.ndarray:
+        signs = np.asarray(signs, dtype=np.int64)
+        return evaluate(signs, np.arange(len(signs)))
+
+    return batch
+
+
+class YogaEngine:
+    """A compiled set of named yoga rules.
+
+    All rules are generated into one function per backend, so a single
+    chart is evaluated by one call doing integer lookups and bit tests.
+    """
+
+    def __init__(self, rules: Dict[str, str]):
+        self.names = tuple(rules)
+        tables = _Tables()
+        sources = [_Parser(text, tables).parse() for text in rules.values()]
+        self._single = _compile(
+            "lambda s: (" + "".join(f"{single}, " for single, _ in sources) + ")", tables.single
+        )
+        self._batch = _compile(
+            "lambda S, R: (" + "".join(f"{batch}, " for _, batch in sources) + ")", tables.batch
+        )
+
+    def detect(self, signs: Sequence[int]) -> List[str]:
+        """Return the names of the yogas present in one chart."""
+        return [name for name, present in zip(self.names, self._single(signs)) if present]
+
+    def evaluate(self, signs: np.ndarray) -> np.ndarray:
+        """Return a boolean ``(n, rules)`` matrix for an ``(n, 11)`` sign array."""
+        signs = np.asarray(signs, dtype=np.int64)
+        result = np.empty((len(signs), len(self.names)), dtype=bool)
+        for j, column in enumerate(self._batch(signs, np.arange(len(signs)))):
+            result[:, j] = column
+        return result
+
+    def prevalence(self, signs: np.ndarray) -> Dict[str, int]:
+        """Count the charts in an ``(n, 11)`` sign array that have each yoga."""
+        counts = self.evaluate(signs).sum(axis=0)
+        return dict(zip(self.names, counts.tolist()))
+
+
+yoga_engine = YogaEngine(YOGA_RULES)
+
+
+def main(argv=None) -> None:
+    from services.geocoder import UnknownLocation
+    from services.matchmaking import profile_births, read_profiles
+
+    parser = argparse.ArgumentParser(description="Count yoga prevalence over NDJSON profiles.")
+    parser.add_argument("profiles", help="NDJSON file with id, birth_date, birth_time, location[, utc_offset]")
+    parser.add_argument("--batch", type=int, default=10_000, help="charts computed per batch")
+    args = parser.parse_args(argv)
+    try:
+        _, _, births = profile_births(read_profiles(args.profiles))
+    except UnknownLocation as exc:
+        parser.error(str(exc))
+    counts = dict.fromkeys(yoga_engine.names, 0)
+    for start in range(0, len(births), args.batch):
+        arrays = compute_charts(births[start:start + args.batch])
+        for name, count in yoga_engine.prevalence(arrays.signs).items():
+            counts[name] += count
+    total = max(len(births), 1)
+    for name, count in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f"{name:<22} {count:>8}  {100.0 * count / total:6.2f}%")
+
+
+if __name__ == "__main__":
+    main()
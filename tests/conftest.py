@@ -0,0 +1,8 @@
+"""Shared pytest configuration for the JyotishAI backend tests."""
+
+import os
+
+# Charts are computed in threads rather than a worker pool under test, and
+# no test reads or writes the on-disk caches.
+os.environ.setdefault("JYOTISHAI_CHART_WORKERS", "0")
+os.environ.pop("JYOTISHAI_CHART_CACHE_DIR", None)
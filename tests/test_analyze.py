@@ -0,0 +1,128 @@
+"""Tests for the /analyze module fan-out."""
+
+import asyncio
+import json
+import threading
+import time
+
+import main
+from models.schemas import ModuleName
+
+
+def _run(module, call, timeout):
+    return asyncio.run(main._run_module(module, call, timeout))
+
+
+def test_module_within_budget_returns_analysis():
+    result = _run(ModuleName.CAREER, lambda: ("text", None), 1.0)
+    assert result.analysis == "text"
+    assert result.error is None
+
+
+def _blocked():
+    """An analyzer that runs until the returned event is set."""
+    release = threading.Event()
+
+    def slow():
+        release.wait(5.0)
+        return "late", None
+
+    return slow, release
+
+
+def test_text_module_overrunning_budget_gets_timeout_marker():
+    # Career only formats text; it must still be held to the deadline.
+    slow, release = _blocked()
+    started = time.perf_counter()
+    result = _run(ModuleName.CAREER, slow, 0.05)
+    release.set()
+    assert time.perf_counter() - started < 0.4
+    assert result.error == "timed out after 0.05 s"
+    assert result.analysis == ""
+
+
+def test_every_module_runs_under_the_deadline():
+    slow, release = _blocked()
+    try:
+        for module in ModuleName:
+            assert _run(module, slow, 0.02).error.startswith("timed out")
+    finally:
+        release.set()
+
+
+def test_overrunning_modules_leave_the_shared_threadpool_free():
+    import anyio.to_thread
+    from fastapi.concurrency import run_in_threadpool
+
+    slow, release = _blocked()
+
+    async def run():
+        # One shared thread: an analyzer holding it would stall the call below.
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 1
+        await asyncio.gather(*(main._run_module(ModuleName.CAREER, slow, 0.02) for _ in range(2 * main.MODULE_THREADS)))
+        return await asyncio.wait_for(run_in_threadpool(lambda: "free"), 1.0)
+
+    try:
+        assert asyncio.run(run()) == "free"
+    finally:
+        release.set()
+
+
+def test_failing_module_gets_error_marker():
+    def broken():
+        raise RuntimeError("boom")
+
+    result = _run(ModuleName.YOGAS, broken, 1.0)
+    assert result.error == "RuntimeError: boom"
+
+
+def test_unknown_location_is_404():
+    from fastapi.testclient import TestClient
+
+    client = TestClient(main.app)
+    body = {"name": "A", "birth_date": "1991-05-17", "birth_time": "10:30", "location": "Nowhereville"}
+    for extra in ({}, {"utc_offset": 5.0}):
+        response = client.post("/analyze", json={**body, **extra})
+        assert response.status_code == 404
+        assert "Nowhereville" in response.json()["detail"]
+
+
+def _batch(client, lines):
+    body = "\n".join(json.dumps(line) for line in lines) + "\n"
+    response = client.post("/analyze/batch", content=body)
+    assert response.status_code == 200
+    return sorted((json.loads(line) for line in response.text.splitlines()), key=lambda r: r["index"])
+
+
+BIRTH = {"name": "A", "birth_date": "1991-05-17", "birth_time": "10:30", "location": "Delhi, India"}
+
+
+def test_batch_survives_failing_batch_strengths(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    def broken(charts):
+        raise RuntimeError("no strengths")
+
+    monkeypatch.setattr(main, "prepare_strengths", broken)
+    lines = _batch(TestClient(main.app), [{**BIRTH, "modules": ["Shadbala"]}, {**BIRTH, "location": "Nowhereville"}])
+    assert lines[0]["results"][0]["error"] is None
+    assert "Nowhereville" in lines[1]["error"]
+
+
+def test_batch_chart_failure_becomes_error_lines(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    async def broken(engines):
+        raise RuntimeError("ephemeris down")
+
+    monkeypatch.setattr(main, "prepare_charts", broken)
+    lines = _batch(TestClient(main.app), [BIRTH, BIRTH])
+    assert [line["error"] for line in lines] == ["RuntimeError: ephemeris down"] * 2
+
+
+def test_batch_upload_is_capped(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(main, "MAX_UPLOAD_BYTES", 100)
+    body = (json.dumps(BIRTH) + "\n") * 5
+    assert TestClient(main.app).post("/analyze/batch", content=body).status_code == 413
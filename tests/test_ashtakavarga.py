@@ -0,0 +1,55 @@
+"""Tests for the Ashtakavarga engine."""
+
+import numpy as np
+
+from services.ashtakavarga import (
+    BINDU_HOUSES,
+    CONTRIBUTORS,
+    PLANETS,
+    bhinnashtakavarga,
+    by_house,
+    sarvashtakavarga,
+    transit_bindus,
+)
+
+rng = np.random.default_rng(11)
+SIGNS = rng.integers(0, 12, (200, len(CONTRIBUTORS)))
+
+
+def _brute_force(signs):
+    table = np.zeros((len(PLANETS), 12), dtype=int)
+    for p, planet in enumerate(PLANETS):
+        for c, houses in enumerate(BINDU_HOUSES[planet]):
+            for house in houses:
+                table[p, (signs[c] + house - 1) % 12] += 1
+    return table
+
+
+def test_matches_a_brute_force_count():
+    bav = bhinnashtakavarga(SIGNS)
+    assert bav.shape == (len(SIGNS), 7, 12)
+    for signs, table in zip(SIGNS, bav):
+        assert np.array_equal(table, _brute_force(signs))
+    assert np.array_equal(bhinnashtakavarga(SIGNS[0]), bav[0])
+
+
+def test_classical_totals_hold_for_every_chart():
+    bav = bhinnashtakavarga(SIGNS)
+    assert (bav.sum(axis=-1) == [48, 49, 39, 54, 56, 52, 39]).all()
+    assert (sarvashtakavarga(bav).sum(axis=-1) == 337).all()
+
+
+def test_by_house_starts_from_the_ascendant():
+    sav = sarvashtakavarga(bhinnashtakavarga(SIGNS))
+    asc = SIGNS[:, CONTRIBUTORS.index("ASC")]
+    houses = by_house(sav, asc)
+    for row, ordered, a in zip(sav, houses, asc):
+        assert ordered.tolist() == [row[(a + h) % 12] for h in range(12)]
+    bav = bhinnashtakavarga(SIGNS)
+    assert np.array_equal(by_house(bav, asc[:, None])[:, 0], by_house(bav[:, 0], asc))
+
+
+def test_transit_bindus_index_the_natal_table():
+    bav = bhinnashtakavarga(SIGNS[0])
+    days = np.array([0, 5, 11, 5])
+    assert transit_bindus(bav, "SATURN", days).tolist() == [bav[6, d] for d in days]
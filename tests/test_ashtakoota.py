@@ -0,0 +1,58 @@
+"""Tests for Ashtakoota scoring."""
+
+import numpy as np
+import pytest
+
+from services.ashtakoota import KOOTAS, MAX_POINTS, TOTAL_POINTS, koota_scores, score_pair
+
+GROOM_N = np.arange(27)[:, None, None, None]
+GROOM_S = np.arange(12)[None, :, None, None]
+BRIDE_N = np.arange(27)[None, None, :, None]
+BRIDE_S = np.arange(12)[None, None, None, :]
+
+
+@pytest.fixture(scope="module")
+def every_pair():
+    return koota_scores(GROOM_N, GROOM_S, BRIDE_N, BRIDE_S)
+
+
+def test_points_stay_within_each_koota_maximum(every_pair):
+    assert every_pair.shape == (27, 12, 27, 12, 8)
+    assert (every_pair >= 0).all()
+    assert (every_pair <= np.array([MAX_POINTS[k] for k in KOOTAS])).all()
+    assert sum(MAX_POINTS.values()) == TOTAL_POINTS
+    assert every_pair.sum(axis=-1).max() <= TOTAL_POINTS
+
+
+@pytest.mark.parametrize("koota", ["tara", "yoni", "bhakoot", "nadi"])
+def test_symmetric_kootas_ignore_who_is_groom(every_pair, koota):
+    k = KOOTAS.index(koota)
+    table = every_pair[..., k]
+    assert np.array_equal(table, table.transpose(2, 3, 0, 1))
+
+
+def test_same_moon_for_both():
+    # Same nakshatra: same nadi (0), first tara (3), same yoni (4), same gana (6).
+    scores = score_pair(3, 1, 3, 1)
+    assert scores["nadi"] == 0.0
+    assert scores["tara"] == 3.0
+    assert scores["yoni"] == 4.0
+    assert scores["gana"] == 6.0
+    assert scores["bhakoot"] == 7.0
+    assert scores["graha_maitri"] == 5.0
+    assert scores["total"] == sum(scores[k] for k in KOOTAS)
+
+
+def test_bhakoot_breaks_on_6_8_positions():
+    # Aries and Virgo are 6/8 from each other.
+    assert score_pair(0, 0, 13, 5)["bhakoot"] == 0.0
+    assert score_pair(0, 0, 13, 6)["bhakoot"] == 7.0
+
+
+def test_arrays_score_like_single_pairs(every_pair):
+    rng = np.random.default_rng(5)
+    gn, gs, bn, bs = rng.integers(0, 27, 50), rng.integers(0, 12, 50), rng.integers(0, 27, 50), rng.integers(0, 12, 50)
+    batch = koota_scores(gn, gs, bn, bs)
+    for row, args in zip(batch, zip(gn, gs, bn, bs)):
+        assert row.tolist() == [score_pair(*map(int, args))[k] for k in KOOTAS]
+        assert np.array_equal(row, every_pair[args])
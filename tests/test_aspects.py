@@ -0,0 +1,51 @@
+"""Tests for graha drishti and house lordship."""
+
+import numpy as np
+
+from services.aspects import ASPECT_HOUSES, aspect_matrix, body_houses, graha_aspects, house_lords, lord_houses
+from services.dignities import SIGN_LORDS
+from services.ephemeris import BODY_INDEX, GRAHAS
+
+rng = np.random.default_rng(29)
+SIGNS = rng.integers(0, 12, (300, len(BODY_INDEX)))
+ASC = BODY_INDEX["ASC"]
+
+
+def test_aspect_matrix_matches_brute_force():
+    batch = aspect_matrix(SIGNS)
+    assert batch.shape == (len(SIGNS), 9, 12)
+    for signs, matrix in zip(SIGNS, batch):
+        expected = np.zeros((9, 12), dtype=int)
+        for g, graha in enumerate(GRAHAS):
+            own = (signs[g] - signs[ASC]) % 12
+            for house in ASPECT_HOUSES[graha]:
+                expected[g, (own + house - 1) % 12] = 1
+        assert np.array_equal(matrix, expected)
+        assert np.array_equal(aspect_matrix(signs), matrix)
+
+
+def test_graha_aspects_match_brute_force():
+    batch = graha_aspects(SIGNS)
+    for signs, matrix in zip(SIGNS, batch):
+        for a, graha in enumerate(GRAHAS):
+            for b in range(len(GRAHAS)):
+                distance = (signs[b] - signs[a]) % 12 + 1
+                assert matrix[a, b] == (distance in ASPECT_HOUSES[graha])
+
+
+def test_every_graha_aspects_its_seventh():
+    matrix = aspect_matrix(SIGNS)
+    houses = body_houses(SIGNS)[:, : len(GRAHAS)]
+    seventh = np.take_along_axis(matrix, ((houses + 6) % 12)[..., None], axis=-1)[..., 0]
+    assert (seventh == 1).all()
+    assert (matrix.sum(axis=-1) == [len(ASPECT_HOUSES[g]) for g in GRAHAS]).all()
+
+
+def test_house_lord_graph_matches_brute_force():
+    lords = house_lords(SIGNS)
+    placed = lord_houses(SIGNS)
+    for signs, lord_row, placed_row in zip(SIGNS, lords, placed):
+        for house in range(12):
+            lord = SIGN_LORDS[(signs[ASC] + house) % 12]
+            assert lord_row[house] == lord
+            assert placed_row[house] == (signs[lord] - signs[ASC]) % 12
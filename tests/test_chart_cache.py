@@ -0,0 +1,64 @@
+"""Tests for the chart cache."""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+from services.chart_cache import ChartCache, chart_key
+
+
+def _files(directory):
+    return [name for _, _, names in os.walk(directory) for name in names]
+
+
+def test_chart_key_normalises_equivalent_inputs():
+    utc = datetime(1991, 5, 17, 5, 0, 0, 400000, tzinfo=timezone.utc)
+    local = datetime(1991, 5, 17, 10, 30, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+    assert chart_key(utc, 28.61391, 77.20902, "lahiri", "w") == chart_key(local, 28.6139, 77.2090, "LAHIRI", "W")
+    assert chart_key(utc, 28.6139, 77.209, "LAHIRI", "W") != chart_key(utc, 28.6139, 77.209, "LAHIRI", "W", "TRUE")
+    assert chart_key(utc, 28.6139, 77.209, None, "W") != chart_key(utc, 28.6139, 77.209, "LAHIRI", "W")
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ChartCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    stats = cache.stats()
+    assert (stats["size"], stats["evictions"], stats["hits"], stats["misses"]) == (2, 1, 3, 1)
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    import services.chart_cache as module
+
+    now = [1000.0]
+    monkeypatch.setattr(module.time, "time", lambda: now[0])
+    cache = ChartCache(ttl=10.0)
+    cache.put("a", 1)
+    now[0] += 11.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_disk_tier_warms_a_new_cache(tmp_path):
+    ChartCache(directory=str(tmp_path)).put("ab12", {"chart": 1})
+    cache = ChartCache(directory=str(tmp_path))
+    assert cache.get("ab12") == {"chart": 1}
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.get("ab12") == {"chart": 1}
+    assert cache.stats()["hits"] == 1
+
+
+def test_disabled_cache_skips_the_disk_tier(tmp_path):
+    ChartCache(directory=str(tmp_path)).put("ab12", 1)
+    before = _files(tmp_path)
+    cache = ChartCache(maxsize=0, directory=str(tmp_path))
+    assert cache.get("ab12") is None
+    calls = []
+    assert cache.get_or_compute("cd34", lambda: calls.append(1) or 2) == 2
+    assert cache.get_or_compute("cd34", lambda: calls.append(1) or 2) == 2
+    assert calls == [1, 1]
+    assert _files(tmp_path) == before
+    assert cache.stats()["disk_tier"] is False
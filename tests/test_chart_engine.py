@@ -0,0 +1,51 @@
+"""Tests for the lazily computed chart engine."""
+
+import pytest
+
+from models.schemas import ChartRequest
+from services.chart_engine import SIGN_ATTRIBUTES, VedicAstrologyEngine
+from services.ephemeris import BODIES, BODY_INDEX, SIGNS
+
+
+def _engine(node="MEAN"):
+    return VedicAstrologyEngine("A", "1991-05-17", "10:30", "Delhi", 5.5, 28.61, 77.21, node=node)
+
+
+def test_sign_attributes_come_from_the_snapshot():
+    engine = _engine()
+    assert set(SIGN_ATTRIBUTES.values()) == set(BODIES)
+    for name, body in SIGN_ATTRIBUTES.items():
+        assert getattr(engine, name) == engine.snapshot.sign(body)
+        # Memoised on the instance after the first access.
+        assert vars(engine)[name] == engine.snapshot.sign(body)
+    with pytest.raises(AttributeError, match="pluto_sign"):
+        engine.pluto_sign
+
+
+def test_mc_sign_is_set():
+    engine = _engine()
+    assert engine.mc_sign in SIGNS
+    assert engine.mc_sign == SIGNS[int(engine.snapshot.longitude_of("MC") // 30.0)]
+    assert engine.placements["MC"] == engine.mc_sign
+
+
+def test_node_choice_changes_only_rahu_and_ketu():
+    mean, true = _engine("MEAN").snapshot, _engine("TRUE").snapshot
+    assert (mean.node, true.node) == ("MEAN", "TRUE")
+    for body in BODIES:
+        if body in ("RAHU", "KETU"):
+            assert mean.longitude_of(body) != pytest.approx(true.longitude_of(body), abs=1e-3)
+        else:
+            assert mean.longitude_of(body) == true.longitude_of(body)
+    assert true.longitude_of("KETU") == pytest.approx((true.longitude_of("RAHU") + 180.0) % 360.0)
+    assert _engine("MEAN").cache_key != _engine("TRUE").cache_key
+
+
+def test_request_node_reaches_the_engine():
+    request = ChartRequest(
+        name="A", birth_date="1991-05-17", birth_time="10:30", location="Delhi, India", utc_offset=5.5, node="TRUE"
+    )
+    engine = VedicAstrologyEngine.from_request(request)
+    assert engine.node == "TRUE"
+    index = BODY_INDEX["RAHU"]
+    assert engine.snapshot.longitudes[index] == pytest.approx(_engine("TRUE").snapshot.longitudes[index], abs=0.05)
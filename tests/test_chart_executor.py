@@ -0,0 +1,86 @@
+"""Tests for the process-pool chart executor."""
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services import chart_engine
+from services.chart_cache import chart_cache
+from services.chart_executor import ChartExecutor, ChartExecutorBusy, compute_snapshot
+
+BIRTHS = [
+    (datetime(1984, 2, 29, 3, 15, tzinfo=timezone.utc), 28.61, 77.21),
+    (datetime(2003, 9, 11, 22, 40, tzinfo=timezone.utc), -33.87, 151.21),
+]
+
+
+@pytest.fixture
+def pooled():
+    executor = ChartExecutor(workers=1, max_pending=4)
+    executor.start()
+    yield executor
+    executor.shutdown()
+
+
+def _same(a, b):
+    for name in type(a).__slots__:
+        assert getattr(a, name) == getattr(b, name), name
+
+
+def test_pooled_snapshots_match_in_process(pooled):
+    async def run():
+        single = await pooled.compute(*BIRTHS[0])
+        many = await pooled.compute_many(BIRTHS)
+        return single, many
+
+    single, many = asyncio.run(run())
+    _same(single, compute_snapshot(*BIRTHS[0]))
+    for snapshot, birth in zip(many, BIRTHS):
+        _same(snapshot, compute_snapshot(*birth))
+    assert pooled.stats()["completed"] == 2
+
+
+def test_broken_pool_is_replaced(pooled):
+    async def run():
+        with pytest.raises(BrokenProcessPool):
+            await pooled._run(functools.partial(os._exit, 1))
+        return await pooled.compute(*BIRTHS[0])
+
+    _same(asyncio.run(run()), compute_snapshot(*BIRTHS[0]))
+    assert pooled.stats()["failed"] == 1
+
+
+def test_full_queue_raises_busy():
+    executor = ChartExecutor(workers=0, max_pending=1, queue_timeout=0.05)
+
+    async def run():
+        slow = asyncio.ensure_future(executor._run(functools.partial(time.sleep, 0.3)))
+        await asyncio.sleep(0.01)
+        with pytest.raises(ChartExecutorBusy):
+            await executor._run(functools.partial(time.sleep, 0.0))
+        await slow
+
+    asyncio.run(run())
+    assert executor.stats()["rejected"] == 1
+
+
+def test_busy_executor_is_503(monkeypatch):
+    async def busy(*args):
+        raise ChartExecutorBusy("1 chart computations already pending")
+
+    monkeypatch.setattr(chart_engine.chart_executor, "compute", busy)
+    chart_cache.clear()
+    with TestClient(main.app) as client:
+        response = client.post(
+            "/modules/career",
+            json={"name": "A", "birth_date": "1977-07-07", "birth_time": "07:07", "location": "Delhi, India"},
+        )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,39 @@
+"""Tests for the feature-keyed analysis memo."""
+
+from types import SimpleNamespace
+
+from services.chart_features import reads
+
+
+def _memoised(maxsize):
+    calls = []
+
+    @reads("asc_sign")
+    def analyze(chart):
+        calls.append(chart.asc_sign)
+        return f"rising {chart.asc_sign}"
+
+    analyze.memo.maxsize = maxsize
+    return analyze, calls
+
+
+def test_hits_and_misses_are_counted():
+    analyze, calls = _memoised(8)
+    for sign in (1, 2, 1, 1, 2):
+        assert analyze(SimpleNamespace(asc_sign=sign)) == f"rising {sign}"
+    assert calls == [1, 2]
+    stats = analyze.memo.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (3, 2, 2)
+    assert stats["hit_ratio"] == 0.6
+
+
+def test_least_recently_used_text_is_evicted():
+    analyze, calls = _memoised(2)
+    for sign in (1, 2, 1, 3):
+        analyze(SimpleNamespace(asc_sign=sign))
+    # 2 was the least recently used when 3 arrived; 1 is still cached.
+    analyze(SimpleNamespace(asc_sign=1))
+    analyze(SimpleNamespace(asc_sign=2))
+    assert calls == [1, 2, 3, 2]
+    assert analyze.memo.stats()["evictions"] == 2
+    assert len(analyze.memo.texts) == 2
@@ -0,0 +1,95 @@
+"""Tests for the slotted chart snapshot."""
+
+import pickle
+
+import pytest
+import swisseph as swe
+from flatlib import const
+from flatlib.chart import Chart
+from flatlib.datetime import Datetime
+from flatlib.geopos import GeoPos
+
+from services.chart_engine import VedicAstrologyEngine
+from services.ephemeris import NAKSHATRA_SPAN, SIGNS
+from services.chart_snapshot import ChartSnapshot
+
+BIRTHS = [
+    ("1947-08-15", "00:05", 5.5, 28.61, 77.21),
+    ("1969-07-20", "20:17", 0.0, 51.51, -0.13),
+    ("1984-02-29", "03:15", -5.0, 40.71, -74.01),
+    ("2003-09-11", "22:40", 10.0, -33.87, 151.21),
+    ("2020-12-21", "18:20", 5.0, 24.86, 67.0),
+]
+FLATLIB_IDS = {
+    "SUN": const.SUN,
+    "MOON": const.MOON,
+    "MARS": const.MARS,
+    "MERCURY": const.MERCURY,
+    "JUPITER": const.JUPITER,
+    "VENUS": const.VENUS,
+    "SATURN": const.SATURN,
+    "RAHU": const.NORTH_NODE,
+    "ASC": const.ASC,
+}
+
+
+def _snapshot(date, time, offset, lat, lon):
+    return VedicAstrologyEngine("A", date, time, "", offset, lat, lon).snapshot
+
+
+def _old_chart(date, time, offset, lat, lon):
+    """The flatlib chart the engine used to build, shifted to Lahiri sidereal."""
+    hours, minutes = divmod(round(abs(offset) * 60), 60)
+    chart = Chart(
+        Datetime(date.replace("-", "/"), time, f"{'-' if offset < 0 else '+'}{hours:02d}:{minutes:02d}"),
+        GeoPos(lat, lon),
+    )
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    # Sidereal positions drop the nutation along with the ayanamsa.
+    ayanamsa = swe.get_ayanamsa_ut(chart.date.jd) + swe.calc_ut(chart.date.jd, swe.ECL_NUT)[0][2]
+    return {
+        body: ((chart.get(obj).lon - ayanamsa) % 360.0, getattr(chart.get(obj), "lonspeed", 0.0))
+        for body, obj in FLATLIB_IDS.items()
+    }
+
+
+@pytest.mark.parametrize("birth", BIRTHS)
+def test_accessors_match_the_flatlib_chart(birth):
+    snapshot = _snapshot(*birth)
+    old = _old_chart(*birth)
+    asc_sign = int(old["ASC"][0] // 30.0)
+    for body, (longitude, speed) in old.items():
+        assert snapshot.longitude_of(body) == pytest.approx(longitude, abs=1.0 / 3600.0)
+        assert snapshot.sign(body) == SIGNS[int(longitude // 30.0)]
+        assert snapshot.sign_index(body) == int(longitude // 30.0)
+        assert snapshot.house(body) == (int(longitude // 30.0) - asc_sign) % 12 + 1
+        assert snapshot.nakshatra_index(body) == int(longitude // NAKSHATRA_SPAN)
+        if body != "ASC":
+            assert snapshot.is_retrograde(body) == (speed < 0)
+            assert snapshot.speed_of(body) == pytest.approx(speed, abs=1e-3)
+    assert snapshot.sign("KETU") == SIGNS[(int(old["RAHU"][0] // 30.0) + 6) % 12]
+    assert snapshot.placements()["ASC"] == SIGNS[asc_sign]
+
+
+def test_snapshot_is_immutable():
+    snapshot = _snapshot(*BIRTHS[0])
+    with pytest.raises(AttributeError):
+        snapshot.jd = 0.0
+    with pytest.raises(AttributeError):
+        del snapshot.signs
+    with pytest.raises(TypeError):
+        snapshot.longitudes[0] = 0.0
+    with pytest.raises(TypeError):
+        snapshot.signs[0] = 0
+    assert not hasattr(snapshot, "__dict__")
+
+
+def test_snapshot_pickles_by_value():
+    snapshot = _snapshot(*BIRTHS[1])
+    copy = pickle.loads(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+    assert isinstance(copy, ChartSnapshot)
+    assert copy.__getstate__() == snapshot.__getstate__()
+    assert copy.longitudes.tolist() == snapshot.longitudes.tolist()
+    assert copy.placements() == snapshot.placements()
+    with pytest.raises(AttributeError):
+        copy.node = "TRUE"
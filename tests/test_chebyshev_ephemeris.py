@@ -0,0 +1,79 @@
+"""Tests for the Chebyshev-compressed ephemeris."""
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from services import chebyshev_ephemeris
+from services.chebyshev_ephemeris import ChebyshevEphemeris
+from services.ephemeris import BODY_INDEX, compute_chart_arrays, graha_longitudes, sidereal_flags
+
+START_JD = 2451545.0  # 2000-01-01 12:00
+END_JD = START_JD + 128.0
+SWE_SERIES = ("SUN", "MOON", "MERCURY", "VENUS", "MARS", "JUPITER", "SATURN", "MEAN_NODE", "TRUE_NODE")
+
+
+@pytest.fixture(scope="module")
+def ephemeris(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("eph") / "small.eph")
+    return ChebyshevEphemeris(chebyshev_ephemeris.build(path, 4000, START_JD, END_JD))
+
+
+@pytest.fixture
+def installed(ephemeris, monkeypatch):
+    monkeypatch.setattr(chebyshev_ephemeris, "get_chebyshev_ephemeris", lambda: ephemeris)
+    return ephemeris
+
+
+def _samples(n=500, seed=7):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(START_JD, END_JD, n), rng.uniform(-60.0, 60.0, n), rng.uniform(-180.0, 180.0, n)
+
+
+def _arcsec(a, b):
+    return np.abs((a - b + 180.0) % 360.0 - 180.0) * 3600.0
+
+
+@pytest.mark.parametrize("name", SWE_SERIES)
+def test_series_match_swisseph_within_the_stated_bound(ephemeris, name):
+    jd = _samples()[0]
+    flags = sidereal_flags("LAHIRI")
+    expected = np.array([swe.calc_ut(t, getattr(swe, name), flags)[0] for t in jd.tolist()])
+    longitude, speed = ephemeris.evaluate(name, jd)
+    assert _arcsec(longitude, expected[:, 0]).max() <= ephemeris.error_bounds[name]
+    # Speeds come from the derivative of the same series.
+    np.testing.assert_allclose(speed, expected[:, 3], atol=1e-3)
+
+
+def test_angles_match_swisseph_houses(ephemeris):
+    jd, lat, lon = _samples()
+    asc, mc = ephemeris.angles(jd, lat, lon)
+    sidereal_flags("LAHIRI")
+    expected = np.array(
+        [swe.houses_ex(t, a, b, b"W", swe.FLG_SIDEREAL)[1][:2] for t, a, b in zip(jd.tolist(), lat, lon)]
+    )
+    assert _arcsec(asc, expected[:, 0]).max() < 0.1
+    assert _arcsec(mc, expected[:, 1]).max() < 0.1
+
+
+def test_dates_outside_the_file_are_rejected(ephemeris):
+    assert not ephemeris.covers(np.array([START_JD - 1.0, START_JD + 1.0]))
+    assert not ephemeris.covers(np.array([END_JD]))
+    with pytest.raises(ValueError):
+        ephemeris.evaluate("SUN", np.array([END_JD + 1.0]))
+
+
+@pytest.mark.parametrize(
+    "jd, ayanamsa",
+    [
+        (np.array([START_JD + 3.0, END_JD + 30.0]), "LAHIRI"),  # partly outside the file
+        (np.array([START_JD + 3.0, START_JD + 40.0]), "RAMAN"),  # fitted for Lahiri only
+    ],
+)
+def test_uncovered_requests_use_swisseph(installed, jd, ayanamsa):
+    lat, lon = np.array([28.61, -33.87]), np.array([77.21, 151.21])
+    got = compute_chart_arrays(jd, lat, lon, ayanamsa)
+    expected = compute_chart_arrays(jd, lat, lon, ayanamsa, use_chebyshev=False)
+    np.testing.assert_array_equal(got.longitudes, expected.longitudes)
+    moon = graha_longitudes("MOON", jd, ayanamsa)[0]
+    np.testing.assert_array_equal(moon, expected.longitudes[:, BODY_INDEX["MOON"]])
@@ -0,0 +1,59 @@
+"""Tests for the Vimshottari dasha engine."""
+
+import pickle
+
+import pytest
+
+from services.dasha import CYCLE_YEARS, DASHA_LORDS, DASHA_YEARS, YEAR_DAYS, build_timeline
+from services.ephemeris import NAKSHATRA_SPAN
+
+BIRTH_JD = 2448394.0  # 1991-05-17
+
+
+def test_moon_at_the_start_of_ashwini_begins_a_full_ketu_dasha():
+    timeline = build_timeline(BIRTH_JD, 0.0)
+    first = timeline.running(BIRTH_JD, level=1)[0]
+    assert first.lord == "KETU"
+    assert first.start_jd == pytest.approx(BIRTH_JD)
+    assert first.end_jd - first.start_jd == pytest.approx(7 * YEAR_DAYS)
+
+
+def test_balance_of_the_birth_dasha():
+    # Halfway through Bharani: half of Venus' 20 years remain.
+    timeline = build_timeline(BIRTH_JD, 1.5 * NAKSHATRA_SPAN)
+    assert timeline.running(BIRTH_JD, level=1)[0].lord == "VENUS"
+    change = timeline.next_change(BIRTH_JD)
+    assert change.lord == "SUN"
+    assert change.start_jd - BIRTH_JD == pytest.approx(10 * YEAR_DAYS)
+    assert timeline.end_jd - timeline.start_jd == pytest.approx(CYCLE_YEARS * YEAR_DAYS)
+
+
+def test_sub_periods_divide_their_parent_in_proportion():
+    timeline = build_timeline(BIRTH_JD, 123.4)
+    for mahadasha in timeline.overlapping(timeline.start_jd, timeline.end_jd, level=1):
+        subs = timeline.overlapping(mahadasha.start_jd + 1e-6, mahadasha.end_jd - 1e-6, level=2)
+        assert [s.lords[0] for s in subs] == [mahadasha.lord] * 9
+        assert subs[0].lord == mahadasha.lord
+        assert subs[0].start_jd == pytest.approx(mahadasha.start_jd)
+        assert subs[-1].end_jd == pytest.approx(mahadasha.end_jd)
+        years = DASHA_YEARS[DASHA_LORDS.index(mahadasha.lord)]
+        for sub in subs:
+            expected = years * DASHA_YEARS[DASHA_LORDS.index(sub.lord)] / CYCLE_YEARS * YEAR_DAYS
+            assert sub.end_jd - sub.start_jd == pytest.approx(expected)
+
+
+def test_running_agrees_with_a_linear_scan():
+    timeline = build_timeline(BIRTH_JD, 250.0)
+    for jd in (BIRTH_JD, BIRTH_JD + 1234.5, BIRTH_JD + 20000.0, timeline.end_jd - 1.0):
+        running = timeline.running(jd, level=3)
+        for level, period in enumerate(running, start=1):
+            scan = [p for p in timeline.overlapping(timeline.start_jd, timeline.end_jd, level) if p.start_jd <= jd < p.end_jd]
+            assert scan == [period]
+        assert running[2].lords[:2] == running[1].lords == (running[0].lord, running[1].lord)
+    assert timeline.running(timeline.end_jd) == []
+
+
+def test_timeline_survives_pickling():
+    timeline = build_timeline(BIRTH_JD, 77.7)
+    restored = pickle.loads(pickle.dumps(timeline))
+    assert restored.running(BIRTH_JD + 500.0) == timeline.running(BIRTH_JD + 500.0)
@@ -0,0 +1,92 @@
+"""Tests for the batch ephemeris engine against a per-chart pyswisseph loop."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from services import chebyshev_ephemeris
+from services.chart_snapshot import ChartSnapshot
+from services.ephemeris import BODIES, BODY_INDEX, GRAHAS, Birth, compute_charts, graha_longitudes, sidereal_flags
+
+START = datetime(2000, 1, 1, tzinfo=timezone.utc)
+START_JD = 2451544.5
+# Births every 3 days and 7 hours over 120 days; Mercury, Mars and the
+# nodes are retrograde in some of them.
+BIRTHS = [
+    Birth(START + timedelta(days=3 * i, hours=7 * i), lat, lon)
+    for i, (lat, lon) in enumerate([(28.61, 77.21), (-33.87, 151.21), (59.91, 10.75), (-12.05, -77.04)] * 10)
+]
+SWE_IDS = {
+    "SUN": swe.SUN,
+    "MOON": swe.MOON,
+    "MARS": swe.MARS,
+    "MERCURY": swe.MERCURY,
+    "JUPITER": swe.JUPITER,
+    "VENUS": swe.VENUS,
+    "SATURN": swe.SATURN,
+}
+
+
+def _reference(birth, node):
+    """One chart the slow way: a pyswisseph call per body."""
+    utc = birth.utc
+    jd = swe.julday(utc.year, utc.month, utc.day, utc.hour + utc.minute / 60.0)
+    flags = sidereal_flags("LAHIRI")
+    ids = dict(SWE_IDS, RAHU=swe.MEAN_NODE if node == "MEAN" else swe.TRUE_NODE)
+    longitudes, speeds = {}, {}
+    for body, swe_id in ids.items():
+        xx = swe.calc_ut(jd, swe_id, flags)[0]
+        longitudes[body], speeds[body] = xx[0], xx[3]
+    longitudes["KETU"], speeds["KETU"] = (longitudes["RAHU"] + 180.0) % 360.0, speeds["RAHU"]
+    ascmc = swe.houses_ex(jd, birth.latitude, birth.longitude, b"W", swe.FLG_SIDEREAL)[1]
+    longitudes["ASC"], longitudes["MC"] = ascmc[0], ascmc[1]
+    speeds["ASC"] = speeds["MC"] = 0.0
+    return np.array([longitudes[b] for b in BODIES]), np.array([speeds[b] for b in BODIES])
+
+
+@pytest.fixture(scope="module")
+def small_file(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("eph") / "small.eph")
+    return chebyshev_ephemeris.ChebyshevEphemeris(chebyshev_ephemeris.build(path, 0, START_JD, START_JD + 128.0))
+
+
+@pytest.fixture(params=["swisseph", "chebyshev"])
+def branch(request, monkeypatch, small_file):
+    ephemeris = small_file if request.param == "chebyshev" else None
+    monkeypatch.setattr(chebyshev_ephemeris, "get_chebyshev_ephemeris", lambda: ephemeris)
+    # (position, speed) tolerances in degrees: pyswisseph agrees with itself,
+    # the fit to a fraction of an arc-second.
+    return (1e-7, 1e-9) if ephemeris is None else (0.1 / 3600.0, 1e-3)
+
+
+@pytest.mark.parametrize("node", ["MEAN", "TRUE"])
+def test_batch_matches_per_chart_loop(branch, node):
+    position_tolerance, speed_tolerance = branch
+    arrays = compute_charts(BIRTHS, node=node)
+    assert (arrays.ayanamsa, arrays.node) == ("LAHIRI", node)
+    retrograde = set()
+    for i, birth in enumerate(BIRTHS):
+        longitudes, speeds = _reference(birth, node)
+        diff = (arrays.longitudes[i] - longitudes + 180.0) % 360.0 - 180.0
+        np.testing.assert_allclose(diff, 0.0, atol=position_tolerance)
+        np.testing.assert_allclose(arrays.speeds[i], speeds, atol=speed_tolerance)
+        np.testing.assert_array_equal(arrays.signs[i], (longitudes // 30.0).astype(np.int8) % 12)
+        snapshot = ChartSnapshot.from_arrays(arrays, i)
+        for body in GRAHAS:
+            assert snapshot.is_retrograde(body) == (speeds[BODY_INDEX[body]] < 0)
+            if snapshot.is_retrograde(body):
+                retrograde.add(body)
+    assert {"MERCURY", "RAHU"} <= retrograde
+
+
+def test_node_choice_moves_rahu_and_ketu(branch):
+    mean = compute_charts(BIRTHS[:4], node="MEAN").longitudes
+    true = compute_charts(BIRTHS[:4], node="TRUE").longitudes
+    others = [BODY_INDEX[b] for b in BODIES if b not in ("RAHU", "KETU")]
+    np.testing.assert_array_equal(mean[:, others], true[:, others])
+    for body in ("RAHU", "KETU"):
+        assert (np.abs(mean[:, BODY_INDEX[body]] - true[:, BODY_INDEX[body]]) > 1e-3).all()
+    jd = compute_charts(BIRTHS[:4]).jd
+    np.testing.assert_allclose(graha_longitudes("RAHU", jd, node="TRUE")[0], true[:, BODY_INDEX["RAHU"]], atol=1e-9)
@@ -0,0 +1,70 @@
+"""Tests for the offline geocoder."""
+
+import pytest
+
+from services import geocoder
+from services.astrology_agent import BirthData
+from services.geocoder import UnknownLocation, get_geocoder, require_location, resolve_location
+from services.matchmaking import profile_births
+
+
+@pytest.mark.parametrize(
+    "query, name, country, zone",
+    [
+        ("Delhi, India", "Delhi", "IN", "Asia/Kolkata"),
+        ("Karachi", "Karachi", "PK", "Asia/Karachi"),
+        ("Pindi", "Rawalpindi", "PK", "Asia/Karachi"),
+        ("Islamabad", "Islamabad", "PK", "Asia/Karachi"),
+        ("Hyderabad, Pakistan", "Hyderabad", "PK", "Asia/Karachi"),
+        ("Hyderabad India", "Hyderabad", "IN", "Asia/Kolkata"),
+        ("Bombay", "Mumbai", "IN", "Asia/Kolkata"),
+        ("São Paulo", "São Paulo", "BR", "America/Sao_Paulo"),
+        ("Springfield, USA", "Springfield", "US", None),
+        ("Tromsø", "Tromsø", "NO", "Europe/Oslo"),
+    ],
+)
+def test_resolves_gazetteer_cities(query, name, country, zone):
+    place = resolve_location(query)
+    assert (place.name, place.country) == (name, country)
+    if zone:
+        assert place.timezone == zone
+
+
+def test_gazetteer_covers_the_world():
+    geocoder = get_geocoder()
+    assert len(geocoder) > 30000
+    assert len(geocoder.timezones()) > 300
+
+
+def test_coordinates_take_the_nearest_city_zone():
+    place = resolve_location("24.86N 67.00E")
+    assert (place.latitude, place.longitude, place.timezone) == (24.86, 67.0, "Asia/Karachi")
+
+
+def test_unknown_location_is_an_error():
+    assert resolve_location("Nowhereville") is None
+    with pytest.raises(UnknownLocation):
+        require_location("Nowhereville")
+    profiles = [{"id": "a", "birth_date": "1990-01-01", "birth_time": "12:00", "location": "Nowhereville"}]
+    with pytest.raises(UnknownLocation):
+        profile_births(profiles)
+    with pytest.raises(UnknownLocation):
+        BirthData("A", "1990-01-01", "12:00", "Nowhereville")
+
+
+def test_unreadable_gazetteer_is_not_cached_as_unknown(monkeypatch):
+    def broken():
+        raise OSError("index missing")
+
+    query = "Delhi, India (unreadable test)"
+    monkeypatch.setattr(geocoder, "get_geocoder", broken)
+    with pytest.raises(geocoder.GazetteerUnavailable):
+        require_location(query)
+    from fastapi.testclient import TestClient
+
+    import main
+
+    response = TestClient(main.app).get("/api/panchang", params={"location": query, "year": 2024, "month": 1})
+    assert response.status_code == 503
+    monkeypatch.undo()
+    assert resolve_location(query).name == "Delhi"
@@ -0,0 +1,84 @@
+"""Tests for the sign and nakshatra ingress index."""
+
+import numpy as np
+import pytest
+
+from services import ingress_index
+from services.ephemeris import GRAHAS, graha_longitudes
+from services.ingress_index import DIVISIONS, IngressIndex
+
+START_JD = 2460676.5  # 2025-01-01
+END_JD = START_JD + 60.0
+SCAN_STEP = 0.01
+
+
+@pytest.fixture(scope="module")
+def index():
+    return IngressIndex.build(START_JD, END_JD)
+
+
+def _scan(body, division):
+    """Divisions on a fine grid, found straight from the ephemeris."""
+    grid = np.arange(START_JD, END_JD, SCAN_STEP)
+    width = DIVISIONS[division][0]
+    return grid, (graha_longitudes(body, grid)[0] // width).astype(np.int64)
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = str(tmp_path / "ingress.npz")
+    index.save(path)
+    loaded = IngressIndex.load(path)
+    assert (loaded.start_jd, loaded.end_jd, loaded.ayanamsa, loaded.node) == (
+        index.start_jd,
+        index.end_jd,
+        index.ayanamsa,
+        index.node,
+    )
+    assert loaded.tables.keys() == index.tables.keys()
+    for key, (times, entered, initial) in index.tables.items():
+        np.testing.assert_array_equal(loaded.tables[key][0], times)
+        np.testing.assert_array_equal(loaded.tables[key][1], entered)
+        assert loaded.tables[key][2] == initial
+
+
+@pytest.mark.parametrize("division", list(DIVISIONS))
+@pytest.mark.parametrize("body", GRAHAS)
+def test_lookups_match_a_longitude_scan(index, body, division):
+    grid, scanned = _scan(body, division)
+    np.testing.assert_array_equal(index.divisions_at(body, grid, division), scanned)
+
+    # Every change between two scan samples holds exactly one ingress.
+    changes = np.flatnonzero(scanned[1:] != scanned[:-1])
+    times = index.tables[(body, division)][0]
+    assert len(times) == len(changes)
+    np.testing.assert_array_less(grid[changes], times)
+    np.testing.assert_array_less(times, grid[changes + 1])
+
+    for i in range(0, len(grid), 97):
+        jd = grid[i]
+        after = changes[changes >= i]
+        before = changes[changes < i]
+        following = index.next_ingress(body, jd, division)
+        preceding = index.previous_ingress(body, jd, division)
+        if len(after):
+            assert grid[after[0]] < following.jd <= grid[after[0] + 1]
+            assert (following.previous, following.entered) == tuple(scanned[after[0] : after[0] + 2])
+        else:
+            assert following is None
+        if len(before):
+            assert grid[before[-1]] < preceding.jd <= jd
+            assert preceding.entered == scanned[i]
+        else:
+            assert preceding is None
+
+
+def test_missing_or_mismatched_file_is_not_built(index, tmp_path, monkeypatch):
+    path = str(tmp_path / "ingress.npz")
+    assert ingress_index._load_default(path) is None
+    assert not (tmp_path / "ingress.npz").exists()
+    index.save(path)
+    # Built for a shorter range than the default, so it is not used.
+    assert ingress_index._load_default(path) is None
+    monkeypatch.setattr(ingress_index, "START_JD", START_JD)
+    monkeypatch.setattr(ingress_index, "END_JD", END_JD)
+    assert ingress_index._load_default(path) is not None
@@ -0,0 +1,54 @@
+"""Tests for the matchmaking index."""
+
+import numpy as np
+import pytest
+
+from services.ashtakoota import koota_scores
+from services.matchmaking import MatchIndex, groom_flags
+
+rng = np.random.default_rng(7)
+N = 500
+IDS = [f"p{i}" for i in range(N)]
+ROLES = rng.choice(["groom", "bride"], N)
+NAKSHATRAS = rng.integers(0, 27, N)
+SIGNS = rng.integers(0, 12, N)
+MANGLIK = rng.random(N) < 0.4
+
+
+@pytest.fixture
+def index():
+    return MatchIndex(IDS, groom_flags(ROLES), NAKSHATRAS, SIGNS, MANGLIK)
+
+
+@pytest.mark.parametrize("as_groom", [True, False])
+def test_search_only_returns_the_opposite_role(index, as_groom):
+    matches = index.search(5, 3, as_groom=as_groom, k=N)
+    wanted = "bride" if as_groom else "groom"
+    assert {ROLES[int(m.id[1:])] for m in matches} == {wanted}
+    assert len(matches) == index.pool_size(as_groom) == int(np.sum(ROLES == wanted))
+
+
+def test_search_matches_pairwise_scores(index):
+    matches = index.search(5, 3, as_groom=True, k=20, min_score=10.0, exclude_manglik=True)
+    totals = [m.total for m in matches]
+    assert totals == sorted(totals, reverse=True)
+    for m in matches:
+        i = int(m.id[1:])
+        assert not MANGLIK[i]
+        assert m.total == pytest.approx(float(koota_scores(5, 3, NAKSHATRAS[i], SIGNS[i]).sum()))
+    brides = [i for i in range(N) if ROLES[i] == "bride" and not MANGLIK[i]]
+    best = sorted((float(koota_scores(5, 3, NAKSHATRAS[i], SIGNS[i]).sum()) for i in brides), reverse=True)
+    assert totals == pytest.approx([t for t in best if t >= 10.0][:20])
+
+
+def test_round_trip_keeps_roles(index, tmp_path):
+    path = str(tmp_path / "matches.npz")
+    index.save(path)
+    loaded = MatchIndex.load(path)
+    assert np.array_equal(loaded.grooms, index.grooms)
+    assert [m.id for m in loaded.search(1, 1, as_groom=False)] == [m.id for m in index.search(1, 1, as_groom=False)]
+
+
+def test_unknown_role_is_rejected():
+    with pytest.raises(ValueError):
+        groom_flags(["groom", "partner"])
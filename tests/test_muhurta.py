@@ -0,0 +1,30 @@
+"""Tests for the muhurta search endpoint."""
+
+from fastapi.testclient import TestClient
+
+import main
+from services import muhurta
+
+
+def test_unknown_location_is_404():
+    with TestClient(main.app) as client:
+        response = client.post(
+            "/api/muhurta",
+            json={"location": "Nowhereville", "start_date": "2025-01-01", "end_date": "2025-01-07"},
+        )
+    assert response.status_code == 404
+    assert "Nowhereville" in response.json()["detail"]
+
+
+def test_search_streams_ranked_windows():
+    muhurta.shutdown_executor()
+    with TestClient(main.app) as client:
+        # Start-up leaves the search pool to the first search.
+        assert muhurta._pool is None
+        response = client.post(
+            "/api/muhurta",
+            json={"location": "Delhi, India", "start_date": "2025-01-01", "end_date": "2025-01-07", "top": 3},
+        )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[-1].startswith('{"ranked": ')
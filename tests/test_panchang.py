@@ -0,0 +1,73 @@
+"""Tests for the panchang elements."""
+
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pytest
+
+from services.ephemeris import julian_days
+from services.panchang import (
+    ELEMENTS,
+    RAHU_KAAL_SEGMENT,
+    VARAS,
+    PanchangYear,
+    element_end_times,
+    panchang_indices,
+    vedic_days,
+)
+
+DELHI = (28.6139, 77.2090)
+MINUTE = 1.0 / 1440.0
+
+
+def _jd(*args):
+    return float(julian_days([datetime(*args, tzinfo=timezone.utc)])[0])
+
+
+def test_new_moon_ends_the_lunar_month():
+    # New moon of 11 January 2024 at 11:57 UT.
+    assert panchang_indices(_jd(2024, 1, 11, 11, 30))["tithi"][0] == 29
+    assert panchang_indices(_jd(2024, 1, 11, 12, 30))["tithi"][0] == 0
+
+
+@pytest.mark.parametrize("element", ELEMENTS)
+def test_end_times_are_the_next_boundary(element):
+    start = _jd(2024, 3, 1) + np.arange(0.0, 30.0, 0.37)
+    index = panchang_indices(start)[element]
+    ends = element_end_times(element, start, index)
+    assert (ends > start).all()
+    assert np.array_equal(panchang_indices(ends - MINUTE)[element], index)
+    assert not np.array_equal(panchang_indices(ends + MINUTE)[element], index)
+    # Nothing changes in between: sample every element's span finely.
+    for t0, t1, i in zip(start[:5], ends[:5], index[:5]):
+        grid = np.linspace(t0, t1 - MINUTE, 200)
+        assert (panchang_indices(grid)[element] == i).all()
+
+
+def test_vedic_days_run_sunrise_to_sunrise():
+    start = _jd(2024, 1, 1) - DELHI[1] / 360.0
+    days = vedic_days(start, start + 10.0, *DELHI)
+    for day, following in zip(days, days[1:]):
+        assert day.next_sunrise == following.sunrise
+        assert day.sunrise < day.sunset < day.next_sunrise
+        assert (following.vara - day.vara) % 7 == 1
+    first = next(d for d in days if d.sunrise > start)
+    # 1 January 2024 was a Monday; the Sun rose in Delhi at about 07:14 IST.
+    assert VARAS[first.vara] == "MONDAY"
+    assert abs(first.sunrise - _jd(2024, 1, 1, 1, 44)) < 10 * MINUTE
+    rahu_start, rahu_end = first.rahu_kaal
+    eighth = (first.sunset - first.sunrise) / 8.0
+    assert rahu_start == pytest.approx(first.sunrise + RAHU_KAAL_SEGMENT[first.vara] * eighth)
+    assert rahu_end - rahu_start == pytest.approx(eighth)
+
+
+def test_year_round_trips_through_its_file(tmp_path):
+    calendar = PanchangYear.compute(2024, *DELHI)
+    assert len(calendar) == 366
+    row = calendar.row(date(2024, 1, 1))
+    assert row == 0 and calendar.row(date(2025, 1, 1)) is None
+    path = str(tmp_path / "2024.npz")
+    calendar.save(path)
+    loaded = PanchangYear.load(path)
+    assert loaded.day(200) == calendar.day(200)
+    assert calendar.day(0)["vara"] == "MONDAY"
@@ -0,0 +1,50 @@
+"""Tests for the lazily imported module registry and its routes."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import main
+from api.registry import MODULES, LazyModuleRoutes, ModuleRegistry
+from models.schemas import ModuleName
+
+BIRTH = {"name": "A", "birth_date": "1991-05-17", "birth_time": "10:30", "location": "Delhi, India"}
+
+
+@pytest.fixture
+def lazy():
+    registry = ModuleRegistry(MODULES)
+    app = FastAPI()
+    app.mount("/modules", LazyModuleRoutes(registry, MODULES))
+    return registry, TestClient(app)
+
+
+def test_every_module_name_needs_a_spec():
+    with pytest.raises(RuntimeError, match="Career"):
+        ModuleRegistry([spec for spec in MODULES if spec.name != ModuleName.CAREER])
+
+
+def test_first_request_imports_only_its_module(lazy):
+    registry, client = lazy
+    assert not any(entry["loaded"] for entry in registry.stats().values())
+    response = client.post("/modules/career", json=BIRTH)
+    assert response.status_code == 200
+    assert response.json()["module"] == "Career"
+    loaded = {name for name, entry in registry.stats().items() if entry["loaded"]}
+    assert loaded == {"Career"}
+    assert registry.stats()["Career"]["import_ms"] is not None
+
+
+def test_unknown_paths_are_404(lazy):
+    registry, client = lazy
+    assert client.post("/modules/astronomy", json=BIRTH).status_code == 404
+    assert client.post("/modules/", json=BIRTH).status_code == 404
+    assert not any(entry["loaded"] for entry in registry.stats().values())
+
+
+def test_lazy_routes_are_in_the_openapi_schema():
+    paths = TestClient(main.app).get("/openapi.json").json()["paths"]
+    for spec in MODULES:
+        assert "/modules" + spec.prefix in paths
+    assert "/modules/dasha_transit/transits" in paths
+    assert "/analyze" in paths
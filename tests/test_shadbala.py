@@ -0,0 +1,122 @@
+"""Tests for Shadbala and Bhava Bala."""
+
+import numpy as np
+import pytest
+
+from services import shadbala
+from services.chart_cache import chart_cache, strength_cache
+from services.chart_engine import VedicAstrologyEngine, prepare_strengths
+
+
+def _engine(day, place=("Delhi", 28.61, 77.21), time="06:00"):
+    name, lat, lon = place
+    return VedicAstrologyEngine("A", day, time, name, 5.5, lat, lon)
+
+
+def _kala(engine):
+    snapshot = engine.snapshot
+    return shadbala.shadbala(
+        snapshot.longitudes,
+        snapshot.speeds,
+        snapshot.jd,
+        snapshot.latitude,
+        snapshot.longitude,
+        snapshot.ayanamsa,
+    )[2]
+
+
+def test_cached_strengths_are_read_only():
+    engine = _engine("1980-03-02")
+    for array in engine.strengths:
+        with pytest.raises(ValueError):
+            array[0] = 0.0
+    prepared = _engine("1980-03-03")
+    prepared.snapshot
+    prepare_strengths([prepared])
+    assert not prepared.shadbala.flags.writeable
+    assert not prepared.bhava_bala.flags.writeable
+
+
+def test_strengths_do_not_evict_snapshots(monkeypatch):
+    monkeypatch.setattr(chart_cache, "maxsize", 2)
+    chart_cache.clear()
+    engine = _engine("1980-04-01")
+    engine.strengths
+    assert chart_cache.get(engine.cache_key) is not None
+    assert strength_cache.get(engine.cache_key + ":shadbala") is not None
+    assert chart_cache.get(engine.cache_key + ":shadbala") is None
+
+
+def test_batch_strengths_match_single_charts():
+    days = ["1975-06-15", "1988-11-30", "2001-02-14", "2019-08-08"]
+    places = [("Delhi", 28.61, 77.21), ("Oslo", 59.91, 10.75), ("Lima", -12.05, -77.04), ("Sydney", -33.87, 151.21)]
+    strength_cache.clear()
+    engines = [_engine(day, place, "14:30") for day, place in zip(days, places)]
+    for engine in engines:
+        engine.snapshot
+    prepare_strengths(engines)
+    for engine in engines:
+        balas, bhavas = engine._compute_strengths()
+        np.testing.assert_allclose(engine.shadbala, balas)
+        np.testing.assert_allclose(engine.bhava_bala, bhavas)
+
+
+def test_component_ranges():
+    for day in ["1950-01-01", "1969-07-20", "1999-12-31", "2024-05-05"]:
+        engine = _engine(day, time="21:15")
+        balas, bhavas = engine.shadbala, engine.bhava_bala
+        assert balas.shape == (len(shadbala.COMPONENTS), len(shadbala.PLANETS))
+        assert bhavas.shape == (len(shadbala.BHAVA_COMPONENTS), 12)
+        dig = balas[shadbala.COMPONENTS.index("dig")]
+        assert ((dig >= 0.0) & (dig <= 60.0)).all()
+        naisargika = balas[shadbala.COMPONENTS.index("naisargika")]
+        np.testing.assert_allclose(naisargika, np.array([7, 6, 2, 3, 4, 5, 1]) * 60.0 / 7.0)
+        bhava_dig = bhavas[shadbala.BHAVA_COMPONENTS.index("dig")]
+        assert set(bhava_dig.tolist()) <= {0.0, 10.0, 20.0, 30.0, 40.0, 50.0, 60.0}
+        assert bhava_dig.max() == 60.0
+
+
+@pytest.mark.parametrize(
+    "time, vara_lord, hora_lord",
+    [
+        ("10:00", "MOON", "JUPITER"),  # Monday, third hora after sunrise
+        ("05:00", "SUN", "SUN"),  # still Sunday before sunrise, its 22nd hora
+    ],
+)
+def test_vara_and_hora_lords(monkeypatch, time, vara_lord, hora_lord):
+    engine = _engine("2024-01-01", time=time)
+    kala = _kala(engine)
+    monkeypatch.setattr(shadbala, "_VARA_VIRUPAS", 0.0)
+    without_vara = _kala(engine)
+    monkeypatch.setattr(shadbala, "_HORA_VIRUPAS", 0.0)
+    without_hora = without_vara - _kala(engine)
+
+    expected = np.zeros(len(shadbala.PLANETS))
+    expected[shadbala.PLANETS.index(vara_lord)] = 45.0
+    np.testing.assert_allclose(kala - without_vara, expected)
+    expected = np.zeros(len(shadbala.PLANETS))
+    expected[shadbala.PLANETS.index(hora_lord)] = 60.0
+    np.testing.assert_allclose(without_hora, expected)
+
+
+def test_ayanamsa_is_safe_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from services.ephemeris import compute_chart_arrays
+
+    jd = np.linspace(2440000.5, 2470000.5, 200)
+    lahiri = shadbala.ayanamsa_degrees(jd, "LAHIRI")
+    lat, lon = np.full(20, 28.61), np.full(20, 77.21)
+    raman = compute_chart_arrays(jd[:20], lat, lon, "RAMAN", use_chebyshev=False).longitudes
+
+    # Pool threads must use the ephemeris files too, and other threads
+    # keep selecting a different sidereal mode meanwhile.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        ayanamsas = [pool.submit(shadbala.ayanamsa_degrees, jd, "LAHIRI") for _ in range(20)]
+        charts = [
+            pool.submit(compute_chart_arrays, jd[:20], lat, lon, "RAMAN", use_chebyshev=False) for _ in range(20)
+        ]
+        for future in ayanamsas:
+            np.testing.assert_array_equal(future.result(), lahiri)
+        for future in charts:
+            np.testing.assert_array_equal(future.result().longitudes, raman)
@@ -0,0 +1,107 @@
+"""Tests for request coalescing."""
+
+import asyncio
+
+import pytest
+
+from services.singleflight import SingleFlight
+
+
+class Computation:
+    """Counts executions and finishes when released."""
+
+    def __init__(self, result="chart", error=None):
+        self.result, self.error = result, error
+        self.runs = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.runs += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def _started(*tasks):
+    # Let every caller reach the shared flight.
+    for _ in range(3):
+        await asyncio.sleep(0)
+    return tasks
+
+
+def test_concurrent_callers_share_one_execution():
+    async def run():
+        flights = SingleFlight()
+        compute = Computation()
+        callers = await _started(*(asyncio.ensure_future(flights.do("k", compute)) for _ in range(5)))
+        other = Computation("other")
+        (separate,) = await _started(asyncio.ensure_future(flights.do("other", other)))
+        assert flights.stats()["in_flight"] == 2
+        compute.release.set()
+        other.release.set()
+        assert await asyncio.gather(*callers) == ["chart"] * 5
+        assert await separate == "other"
+        return flights, compute
+
+    flights, compute = asyncio.run(run())
+    assert compute.runs == 1
+
+
+def test_cancelled_waiter_does_not_cancel_the_flight():
+    async def run():
+        flights = SingleFlight()
+        compute = Computation()
+        first, second = await _started(
+            asyncio.ensure_future(flights.do("k", compute)), asyncio.ensure_future(flights.do("k", compute))
+        )
+        first.cancel()
+        await asyncio.sleep(0)
+        compute.release.set()
+        assert await second == "chart"
+        assert first.cancelled()
+        return flights
+
+    flights = asyncio.run(run())
+    assert flights.stats()["failures"] == 0
+
+
+def test_exception_reaches_every_waiter_and_clears_the_key():
+    async def run():
+        flights = SingleFlight()
+        failing = Computation(error=RuntimeError("ephemeris down"))
+        callers = await _started(*(asyncio.ensure_future(flights.do("k", failing)) for _ in range(3)))
+        failing.release.set()
+        for caller in callers:
+            with pytest.raises(RuntimeError, match="ephemeris down"):
+                await caller
+        assert flights.stats()["in_flight"] == 0
+        retry = Computation("retried")
+        retry.release.set()
+        assert await flights.do("k", retry) == "retried"
+        return flights, failing, retry
+
+    flights, failing, retry = asyncio.run(run())
+    assert (failing.runs, retry.runs) == (1, 1)
+
+
+def test_stats_count_calls_executions_and_failures():
+    async def run():
+        flights = SingleFlight()
+        shared, failing = Computation(), Computation(error=ValueError("bad"))
+        callers = await _started(
+            *(asyncio.ensure_future(flights.do("a", shared)) for _ in range(4)),
+            *(asyncio.ensure_future(flights.do("b", failing)) for _ in range(2)),
+        )
+        shared.release.set()
+        failing.release.set()
+        await asyncio.gather(*callers, return_exceptions=True)
+        return flights
+
+    assert asyncio.run(run()).stats() == {
+        "calls": 6,
+        "executed": 2,
+        "coalesced": 4,
+        "failures": 1,
+        "in_flight": 0,
+    }
@@ -0,0 +1,93 @@
+"""Tests for the historical UTC offset tables."""
+
+import zoneinfo
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from services import timezones
+
+ZONES = ["Asia/Kolkata", "Asia/Karachi", "Europe/London", "America/New_York", "Australia/Sydney"]
+
+
+def _zoneinfo_offset(name, local):
+    return local.replace(tzinfo=ZoneInfo(name)).utcoffset().total_seconds() / 3600.0
+
+
+@pytest.mark.parametrize("name", ZONES)
+def test_offsets_match_zoneinfo(name):
+    start = datetime(1900, 1, 1, 12, 0)
+    for days in range(0, 200 * 365, 97):
+        local = start + timedelta(days=days, hours=days % 24)
+        expected = _zoneinfo_offset(name, local)
+        got = timezones.resolve_utc_offset(name, local.strftime("%Y-%m-%d"), local.strftime("%H:%M"))
+        assert got == expected, local
+
+
+def test_every_zone_matches_zoneinfo_at_each_transition():
+    for name in sorted(zoneinfo.available_timezones()):
+        table = timezones._build_table(name)
+        zone = ZoneInfo(name)
+        for t, before, after in zip(table.transitions, table.offsets, table.offsets[1:]):
+            assert before != after, (name, t)
+            assert timezones._offset(zone, t - 1) == before, (name, t)
+            assert timezones._offset(zone, t) == after, (name, t)
+
+
+def test_posix_rule_days():
+    # 2024 is a leap year: Jn skips 29 February, zero-based days count it.
+    assert timezones._rule_day("J60", 2024) == date(2024, 3, 1)
+    assert timezones._rule_day("59", 2024) == date(2024, 2, 29)
+    assert timezones._rule_day("M3.2.0", 2021) == date(2021, 3, 14)
+    assert timezones._rule_day("M10.5.0", 2021) == date(2021, 10, 31)
+
+
+def test_tzif_data_falls_back_to_the_tzdata_package(monkeypatch):
+    pytest.importorskip("tzdata")
+    monkeypatch.setattr(zoneinfo, "TZPATH", ())
+    assert timezones._tzif_data("Asia/Kolkata").startswith(b"TZif")
+    with pytest.raises(zoneinfo.ZoneInfoNotFoundError):
+        timezones._tzif_data("Mars/Olympus_Mons")
+
+
+def test_ambiguous_and_skipped_times_resolve_like_fold_0():
+    # 2021-11-07 01:30 happens twice in New York; 2021-03-14 02:30 never happens.
+    assert timezones.resolve_utc_offset("America/New_York", "2021-11-07", "01:30") == -4.0
+    assert timezones.resolve_utc_offset("America/New_York", "2021-03-14", "02:30") == -5.0
+
+
+def test_saved_tables_round_trip(tmp_path):
+    path = str(tmp_path / "zones.npz")
+    tables = [timezones.zone_table(name) for name in ZONES]
+    timezones.save_tables(tables, path)
+    loaded = timezones.load_tables(path)
+    assert sorted(loaded) == sorted(ZONES)
+    for table in tables:
+        assert loaded[table.name].transitions == table.transitions
+        assert loaded[table.name].offsets == table.offsets
+
+
+def test_warm_writes_and_reuses_the_table_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "zones.npz")
+    monkeypatch.setattr(timezones, "_tables", {})
+    timezones.warm(["Asia/Kolkata"], path)
+    monkeypatch.setattr(timezones, "_tables", {})
+    monkeypatch.setattr(timezones, "_build_table", lambda name: pytest.fail(f"{name} was rebuilt"))
+    timezones.warm(["Asia/Kolkata"], path)
+    assert timezones.resolve_utc_offset("Asia/Kolkata", "1991-05-17", "10:30") == 5.5
+
+
+def test_stale_table_file_is_ignored(tmp_path, monkeypatch):
+    path = str(tmp_path / "zones.npz")
+    timezones.save_tables([timezones.zone_table("Asia/Kolkata")], path)
+    monkeypatch.setattr(timezones, "tzdata_version", lambda: "1970a")
+    assert timezones.load_tables(path) == {}
+
+
+def test_parse_utc_offset():
+    assert timezones.parse_utc_offset("+05:30") == 5.5
+    assert timezones.parse_utc_offset("UTC-4") == -4.0
+    assert timezones.parse_utc_offset(None) is None
+    with pytest.raises(ValueError):
+        timezones.parse_utc_offset("five")
@@ -0,0 +1,75 @@
+"""Tests for the transit event generator and the ingress index."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from api.endpoints import module_dasha_transit
+from services import transits
+from services.chart_engine import VedicAstrologyEngine
+from services.ingress_index import IngressIndex
+
+START_JD = 2460676.5  # 2025-01-01
+END_JD = START_JD + 400.0
+
+
+@pytest.fixture(scope="module")
+def natal():
+    return VedicAstrologyEngine("A", "1991-05-17", "10:30", "Delhi", 5.5, 28.61, 77.21).snapshot
+
+
+@pytest.fixture(scope="module")
+def index():
+    return IngressIndex.build(START_JD - 10.0, END_JD + 10.0)
+
+
+def _events(monkeypatch, natal, index):
+    monkeypatch.setattr(transits, "get_ingress_index", lambda: index)
+    return list(transits.transit_events(natal, START_JD, END_JD, chunk_days=100.0))
+
+
+def test_indexed_ingresses_match_sampled_ones(monkeypatch, natal, index):
+    sampled = _events(monkeypatch, natal, None)
+    indexed = _events(monkeypatch, natal, index)
+    assert [(e.kind, e.body, e.house, e.target) for e in indexed] == [
+        (e.kind, e.body, e.house, e.target) for e in sampled
+    ]
+    for a, b in zip(indexed, sampled):
+        assert a.jd == pytest.approx(b.jd, abs=1e-3)
+    assert any(e.kind == transits.HOUSE_INGRESS for e in indexed)
+
+
+def test_index_outside_its_range_falls_back_to_sampling(monkeypatch, natal):
+    narrow = IngressIndex.build(START_JD, START_JD + 50.0)
+    sampled = _events(monkeypatch, natal, None)
+    assert [e.kind for e in _events(monkeypatch, natal, narrow)] == [e.kind for e in sampled]
+
+
+def test_index_queries(index):
+    jupiter = index.ingresses("JUPITER", START_JD, END_JD)
+    assert jupiter
+    first = jupiter[0]
+    assert index.division_at("JUPITER", first.jd - 1e-3) == first.previous
+    assert index.division_at("JUPITER", first.jd + 1e-3) == first.entered
+    assert index.next_ingress("JUPITER", first.jd - 1.0) == first
+    with pytest.raises(ValueError):
+        index.division_at("JUPITER", END_JD + 100.0)
+
+
+def test_stream_rejects_ranges_longer_than_the_cap():
+    body = {"name": "A", "birth_date": "1991-05-17", "birth_time": "10:30", "location": "Delhi, India"}
+    years = module_dasha_transit.TRANSIT_MAX_YEARS
+    with TestClient(main.app) as client:
+        response = client.post(
+            "/modules/dasha_transit/transits",
+            params={"start": "2025-01-01", "end": f"{2025 + years + 1}-01-01"},
+            json=body,
+        )
+        assert response.status_code == 400
+        assert f"{years} years" in response.json()["detail"]
+        response = client.post(
+            "/modules/dasha_transit/transits",
+            params={"start": "2025-01-01", "end": "2025-02-01", "bodies": ["SATURN"]},
+            json=body,
+        )
+        assert response.status_code == 200
@@ -0,0 +1,66 @@
+"""Tests for the divisional chart engine."""
+
+import numpy as np
+import pytest
+
+from services.vargas import VARGA_INDEX, VARGAS, varga_signs
+
+_D30_ODD = ((5, 0), (10, 10), (18, 8), (25, 2), (30, 6))
+_D30_EVEN = ((5, 1), (12, 5), (20, 11), (25, 9), (30, 7))
+
+
+def _reference(longitude):
+    """The textbook rules, one longitude and one varga at a time."""
+    sign, within = divmod(longitude, 30.0)
+    sign = int(sign)
+    odd = sign % 2 == 0
+
+    def part(n):
+        return int(within * n // 30.0)
+
+    d30 = _D30_ODD if odd else _D30_EVEN
+    return {
+        "D1": sign,
+        "D2": (4 if part(2) == 0 else 3) if odd else (3 if part(2) == 0 else 4),
+        "D3": (sign + 4 * part(3)) % 12,
+        "D7": ((sign if odd else sign + 6) + part(7)) % 12,
+        "D9": ((0, 9, 6, 3)[sign % 4] + part(9)) % 12,
+        "D10": ((sign if odd else sign + 8) + part(10)) % 12,
+        "D12": (sign + part(12)) % 12,
+        "D30": next(target for bound, target in d30 if within < bound),
+        "D60": (sign + part(60)) % 12,
+    }
+
+
+def test_matches_the_textbook_rules():
+    rng = np.random.default_rng(3)
+    # Whole arc-seconds, so rounding in the engine never moves a boundary.
+    longitudes = rng.integers(0, 360 * 3600, 2000) / 3600.0
+    signs = varga_signs(longitudes)
+    for longitude, row in zip(longitudes.tolist(), signs.tolist()):
+        for varga, expected in _reference(longitude).items():
+            assert row[VARGA_INDEX[varga]] == expected, (longitude, varga)
+
+
+@pytest.mark.parametrize(
+    "longitude, varga, sign",
+    [
+        (0.0, "D9", 0),  # Aries begins the Navamsa of Aries
+        (3.0 + 20.0 / 60.0, "D9", 1),  # ... and its second ninth is Taurus
+        (30.0, "D9", 9),  # Taurus starts from Capricorn
+        (135.0, "D9", 4),  # 15 Leo is Vargottama
+        (29.999, "D1", 0),
+        (359.9999, "D1", 0),  # rounds to 360, which wraps to Aries
+        (45.0, "D2", 4),  # second half of an even sign is the Sun's hora
+    ],
+)
+def test_known_placements(longitude, varga, sign):
+    assert varga_signs(np.array([longitude]))[0, VARGA_INDEX[varga]] == sign
+
+
+def test_shape_and_range():
+    longitudes = np.linspace(0.0, 359.0, 24).reshape(2, 12)
+    signs = varga_signs(longitudes)
+    assert signs.shape == (2, 12, len(VARGAS))
+    assert signs.dtype == np.int8
+    assert signs.min() >= 0 and signs.max() <= 11
@@ -0,0 +1,135 @@
+"""Tests for the yoga rule compiler."""
+
+import numpy as np
+import pytest
+
+from services.dignities import DEBILITATION_MASKS, EXALTATION_MASKS, OWN_SIGN_MASKS, SIGN_LORDS
+from services.ephemeris import BODY_INDEX
+from services.yogas import GROUPS, HOUSE_SETS, YOGA_RULES, YogaEngine, compile_rule, yoga_engine
+
+rng = np.random.default_rng(23)
+SIGNS = rng.integers(0, 12, (3000, len(BODY_INDEX)))
+
+
+class Chart:
+    """Plain-Python reading of one chart, independent of the compiler."""
+
+    def __init__(self, signs):
+        self.signs = [int(s) for s in signs]
+
+    def sign(self, body):
+        return self.signs[body if isinstance(body, int) else BODY_INDEX[body]]
+
+    def house(self, body, ref="ASC"):
+        return (self.sign(body) - self.sign(ref)) % 12 + 1
+
+    def lord(self, house):
+        return int(SIGN_LORDS[(self.sign("ASC") + house - 1) % 12])
+
+    def in_houses(self, bodies, houses, ref="ASC"):
+        return any(self.house(b, ref) in houses for b in bodies)
+
+    def dignity(self, body, masks):
+        return bool(masks[BODY_INDEX[body]] >> self.sign(body) & 1)
+
+    def with_(self, a, b):
+        return self.sign(a) == self.sign(b)
+
+    def lords_with(self, *pairs):
+        return any(self.with_(self.lord(a), self.lord(b)) for a, b in pairs)
+
+
+def _mahapurusha(body):
+    return lambda c: c.in_houses([body], HOUSE_SETS["kendra"]) and (
+        c.dignity(body, OWN_SIGN_MASKS) or c.dignity(body, EXALTATION_MASKS)
+    )
+
+
+TARA, BENEFICS = GROUPS["taragrahas"], GROUPS["benefics"]
+REFERENCE = {
+    "GAJAKESARI": lambda c: c.in_houses(["JUPITER"], HOUSE_SETS["kendra"], "MOON"),
+    "RUCHAKA": _mahapurusha("MARS"),
+    "BHADRA": _mahapurusha("MERCURY"),
+    "HAMSA": _mahapurusha("JUPITER"),
+    "MALAVYA": _mahapurusha("VENUS"),
+    "SASA": _mahapurusha("SATURN"),
+    "SUNAPHA": lambda c: c.in_houses(TARA, [2], "MOON"),
+    "ANAPHA": lambda c: c.in_houses(TARA, [12], "MOON"),
+    "DURUDHARA": lambda c: c.in_houses(TARA, [2], "MOON") and c.in_houses(TARA, [12], "MOON"),
+    "KEMADRUMA": lambda c: not c.in_houses(TARA, [2, 12], "MOON")
+    and not c.in_houses(TARA, HOUSE_SETS["kendra"], "MOON"),
+    "VESI": lambda c: c.in_houses(TARA, [2], "SUN"),
+    "VASI": lambda c: c.in_houses(TARA, [12], "SUN"),
+    "UBHAYACHARI": lambda c: c.in_houses(TARA, [2], "SUN") and c.in_houses(TARA, [12], "SUN"),
+    "ADHI": lambda c: c.in_houses(BENEFICS, [6, 7, 8], "MOON"),
+    "AMALA": lambda c: c.in_houses(BENEFICS, [10]) or c.in_houses(BENEFICS, [10], "MOON"),
+    "BUDHADITYA": lambda c: c.with_("MERCURY", "SUN"),
+    "CHANDRA_MANGALA": lambda c: c.with_("MOON", "MARS"),
+    "GURU_CHANDALA": lambda c: c.with_("JUPITER", "RAHU"),
+    "SHAKATA": lambda c: c.in_houses(["JUPITER"], [6, 8, 12], "MOON"),
+    "DHARMA_KARMADHIPATI": lambda c: c.lords_with((9, 10)),
+    "RAJA": lambda c: c.lords_with((1, 5), (1, 9), (4, 5), (4, 9), (7, 5), (7, 9), (10, 5)),
+    "DHANA": lambda c: c.lords_with((2, 11), (5, 11), (9, 11)),
+    "HARSHA": lambda c: c.in_houses([c.lord(6)], HOUSE_SETS["dusthana"]),
+    "SARALA": lambda c: c.in_houses([c.lord(8)], HOUSE_SETS["dusthana"]),
+    "VIMALA": lambda c: c.in_houses([c.lord(12)], HOUSE_SETS["dusthana"]),
+    "NEECHA_SUN": lambda c: c.dignity("SUN", DEBILITATION_MASKS),
+    "NEECHA_MOON": lambda c: c.dignity("MOON", DEBILITATION_MASKS),
+    "MANGLIK": lambda c: c.in_houses(["MARS"], [1, 2, 4, 7, 8, 12]),
+}
+
+
+def test_every_rule_has_a_reference():
+    assert set(REFERENCE) == set(YOGA_RULES)
+
+
+def test_engine_agrees_with_brute_force():
+    matrix = yoga_engine.evaluate(SIGNS)
+    for signs, row in zip(SIGNS, matrix):
+        chart = Chart(signs)
+        expected = [REFERENCE[name](chart) for name in yoga_engine.names]
+        assert row.tolist() == expected, [n for n, a, b in zip(yoga_engine.names, row, expected) if a != b]
+        assert yoga_engine.detect(chart.signs) == [n for n, present in zip(yoga_engine.names, expected) if present]
+    # Random charts exercise both outcomes of nearly every rule.
+    assert matrix.any(axis=0).all()
+
+
+def test_single_rules_agree_with_their_batch_form():
+    rules = [
+        "lord of 5 from MOON in kendra from JUPITER",
+        "not (SATURN in aries or SATURN in libra) and lagna with RAHU",
+        "malefics in houses 3,6,11 or benefics with lord of 1",
+    ]
+    for text in rules:
+        single, batch = compile_rule(text)
+        assert batch(SIGNS).tolist() == [single(s.tolist()) for s in SIGNS]
+
+
+def test_keywords_are_case_insensitive():
+    assert YogaEngine({"A": "jupiter IN Kendra FROM moon"}).evaluate(SIGNS).tolist() == (
+        yoga_engine.evaluate(SIGNS)[:, [yoga_engine.names.index("GAJAKESARI")]].tolist()
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "MARS with MARS",
+        "MARS in house 13",
+        "MARS in house 0",
+        "PLUTO in kendra",
+        "MARS in",
+        "MARS near SUN",
+        "(MARS in kendra",
+        "MARS in kendra SUN",
+        "lord 9 with SUN",
+        "MARS in kendra from",
+        "MARS in own",
+        "",
+    ],
+)
+def test_invalid_rules_raise_value_error(text):
+    with pytest.raises(ValueError):
+        compile_rule(text)
+    with pytest.raises(ValueError):
+        YogaEngine({"BROKEN": text})